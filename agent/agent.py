@@ -5,10 +5,30 @@ Continuously monitors, detects misinformation, and verifies claims
 
 import asyncio
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import requests
 import json
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import List, Dict, Optional, Set, Tuple
+
+import aiohttp
+
+from backend_client import BackendClient
+from patterns import screen, screen_batch
+from processed import CHECKPOINT_SECONDS, ProcessedIds
+from similarity import ClaimClusterer
+from watermark import STATE_DIR, Watermark
+
+# Verification throughput: LLM calls in flight at once, the time one claim
+# may take, and the most claims verified per cycle
+VERIFY_CONCURRENCY = 8
+VERIFY_TIMEOUT = 60.0
+VERIFY_BATCH_SIZE = 500
+# Verification attempts before a claim is set aside in the dead-letter file
+MAX_VERIFY_ATTEMPTS = 3
+# Claims requested per page when catching up with new claims
+FETCH_PAGE_SIZE = 200
 
 # Mock LLM responses (simulates LangChain integration)
 class MockLLM:
@@ -23,57 +43,47 @@ class MockLLM:
             "This appears to be a misinterpretation of scientific data.",
             "Fact-checkers have debunked this claim multiple times.",
         ]
+        # Kept across calls, so reposts join the clusters of earlier claims
+        self.clusterer = ClaimClusterer()
     
-    def detect_misinformation(self, claim: str) -> Dict:
+    def detect_misinformation(self, claim: str, screening: Optional[Dict] = None) -> Dict:
         """
         Detect if a claim is misinformation
         
         Args:
             claim: Claim text to analyze
+            screening: Result of patterns.screen() for the claim, if already known
         
         Returns:
-            Detection result with confidence score
+            Detection result with confidence score and the suspicious
+            keywords found
         """
-        keywords_misinformation = ["causes", "cancer", "vaccine", "5G", "microchip", "hoax"]
-        confidence = 0
-        
-        for keyword in keywords_misinformation:
-            if keyword.lower() in claim.lower():
-                confidence = random.randint(60, 95)
-                break
+        screening = screening or screen(claim)
         
-        if confidence == 0:
+        if screening["keywords"]:
+            confidence = random.randint(60, 95)
+        else:
             confidence = random.randint(20, 70)
         
         return {
             "is_misinformation": confidence > 50,
             "confidence": confidence,
+            "keywords": screening["keywords"],
             "reasoning": self.responses[random.randint(0, len(self.responses) - 1)]
         }
     
     def cluster_claims(self, claims: List[str]) -> Dict:
         """
-        Cluster similar claims together
+        Cluster near-duplicate claims together
         
         Args:
             claims: List of claim texts
         
         Returns:
-            Clustered claims with relationships
+            First claim of each cluster -> the given claims in it, largest
+            cluster first
         """
-        clusters = {}
-        for i, claim in enumerate(claims):
-            topic = "health" if "vaccine" in claim.lower() or "health" in claim.lower() else \
-                   "technology" if "5G" in claim.lower() or "AI" in claim.lower() else \
-                   "politics" if "election" in claim.lower() else \
-                   "environment" if "climate" in claim.lower() or "renewable" in claim.lower() else \
-                   "other"
-            
-            if topic not in clusters:
-                clusters[topic] = []
-            clusters[topic].append(claim)
-        
-        return clusters
+        return self.clusterer.cluster(claims)
     
     def verify_claim(self, claim: str, sources: List[str]) -> Dict:
         """
@@ -134,19 +144,49 @@ class MisinformationAgent:
     Continuously monitors, analyzes, and responds to false claims
     """
     
-    def __init__(self, backend_url: str = "http://localhost:8000", update_interval: int = 60):
+    def __init__(self, backend_url: str = "http://localhost:8000", update_interval: int = 60,
+                 verify_concurrency: int = VERIFY_CONCURRENCY, verify_timeout: float = VERIFY_TIMEOUT,
+                 verify_batch_size: int = VERIFY_BATCH_SIZE, state_dir: str = STATE_DIR,
+                 checkpoint_interval: float = CHECKPOINT_SECONDS, max_attempts: int = MAX_VERIFY_ATTEMPTS):
         """
         Initialize the agent
         
         Args:
             backend_url: URL of the backend API
             update_interval: Seconds between update cycles
+            verify_concurrency: Claims verified at once; keeps LLM calls
+                within the provider's rate limits
+            verify_timeout: Seconds allowed to verify and summarize one claim
+            verify_batch_size: Most claims fetched and verified per cycle
+            state_dir: Directory keeping the agent's progress across restarts
+            checkpoint_interval: Seconds between saves of the processed claims
+            max_attempts: Verification attempts before a claim is written
+                to the dead-letter file and passed over
         """
         self.backend_url = backend_url
         self.update_interval = update_interval
+        self.http = BackendClient(backend_url)
+        self.verify_timeout = verify_timeout
+        self.verify_batch_size = verify_batch_size
+        self.verify_slots = asyncio.Semaphore(verify_concurrency)
+        self.verify_executor = ThreadPoolExecutor(max_workers=verify_concurrency, thread_name_prefix="verify")
+        self.inflight: Set[asyncio.Task] = set()
+        self.watermark = Watermark(Path(state_dir) / "watermark.json")
+        # Highest claim ID fetched; paging continues from here while claims
+        # behind the watermark are retried
+        self.fetch_after = self.watermark.last_id
+        self.caught_up = True
+        self.max_attempts = max_attempts
+        # Claims that failed verification -> (claim, attempts so far)
+        self.retries: Dict[int, Tuple[Dict, int]] = {}
+        self.dead_letter_path = Path(state_dir) / "dead_letter.jsonl"
         self.llm = MockLLM()
         self.is_running = False
-        self.processed_claims = set()
+        # Claims up to the watermark are all processed; only those verified
+        # ahead of it take space
+        self.processed_claims = ProcessedIds(Path(state_dir) / "processed.bin", floor=self.watermark.last_id)
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint = time.monotonic()
         self.trusted_sources = [
             "World Health Organization (WHO)",
             "Centers for Disease Control (CDC)",
@@ -157,19 +197,55 @@ class MisinformationAgent:
             "FactCheck.org",
         ]
     
-    def fetch_claims(self) -> List[Dict]:
+    async def fetch_claims(self) -> List[Dict]:
         """
-        Fetch unverified claims from the backend
+        Fetch claims not fetched before, paging until caught up
+        
+        Claims waiting for a retry count against verify_batch_size, so a
+        cycle never holds more; caught_up tells whether more remain.
         
         Returns:
-            List of claims
+            List of new claims in ID order
         """
+        claims = []
+        budget = self.verify_batch_size - len(self.retries)
+        self.caught_up = False
         try:
-            response = requests.get(f"{self.backend_url}/claims")
-            return response.json()
-        except Exception as e:
+            while len(claims) < budget:
+                limit = min(FETCH_PAGE_SIZE, budget - len(claims))
+                page = await self.http.get_json("/claims", params={"since_id": self.fetch_after, "limit": limit})
+                claims.extend(page)
+                if page:
+                    self.fetch_after = page[-1]["id"]
+                if len(page) < limit:
+                    self.caught_up = True
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             print(f"❌ Error fetching claims: {e}")
-            return []
+            # Wait for the next cycle before trying again
+            self.caught_up = True
+        return claims
+    
+    def advance_watermark(self, claims: List[Dict]):
+        """
+        Move the watermark past the leading run of processed claims
+        
+        A claim waiting for a retry holds the mark until it is verified or
+        dead-lettered; claims after it are kept as processed. The
+        processed claims are checkpointed every checkpoint_interval.
+        
+        Args:
+            claims: Claims retried or fetched this cycle, in ID order
+        """
+        for claim in claims:
+            if claim.get("id") not in self.processed_claims:
+                break
+            self.watermark.advance(claim)
+        self.watermark.save()
+        self.processed_claims.raise_floor(self.watermark.last_id)
+        if time.monotonic() - self.last_checkpoint >= self.checkpoint_interval:
+            self.processed_claims.checkpoint()
+            self.last_checkpoint = time.monotonic()
     
     def detect_misinformation_trends(self, claims: List[Dict]) -> Dict:
         """
@@ -188,11 +264,16 @@ class MisinformationAgent:
             "detected_misinformation": 0,
             "high_engagement_false": [],
             "emerging_topics": [],
+            "claim_clusters": [],
             "timestamp": datetime.now().isoformat()
         }
         
-        for claim in claims:
-            detection = self.llm.detect_misinformation(claim.get("claim", ""))
+        # One keyword pass per claim serves detection and topics
+        claim_texts = [c.get("claim") for c in claims]
+        screenings = screen_batch(claim_texts)
+        
+        for claim, screening in zip(claims, screenings):
+            detection = self.llm.detect_misinformation(claim.get("claim", ""), screening)
             
             if detection["is_misinformation"]:
                 trends["detected_misinformation"] += 1
@@ -204,50 +285,139 @@ class MisinformationAgent:
                         "confidence": detection["confidence"]
                     })
         
-        # Cluster similar claims
-        claim_texts = [c.get("claim") for c in claims]
+        trends["emerging_topics"] = list(dict.fromkeys(
+            screening["topics"][0] if screening["topics"] else "other"
+            for screening in screenings
+        ))
+        
+        # Cluster reworded copies of the same claim
         clusters = self.llm.cluster_claims(claim_texts)
-        trends["emerging_topics"] = list(clusters.keys())
+        trends["claim_clusters"] = [
+            {"representative": label, "claims": len(members)}
+            for label, members in clusters.items()
+            if len(members) > 1
+        ]
         
         return trends
     
-    def verify_claims_batch(self, claims: List[Dict]) -> List[Dict]:
+    async def verify_claim(self, claim: Dict) -> Optional[Dict]:
         """
-        Verify multiple claims in batch
+        Verify and summarize one claim, holding a concurrency slot
+        
+        Args:
+            claim: Claim to verify
+        
+        Returns:
+            Verification result, or None if it timed out
+        """
+        async with self.verify_slots:
+            try:
+                return await asyncio.wait_for(self._verify_claim(claim), self.verify_timeout)
+            except asyncio.TimeoutError:
+                print(f"   ⚠️ Verification of claim {claim.get('id')} timed out after {self.verify_timeout}s")
+                return None
+    
+    async def _verify_claim(self, claim: Dict) -> Dict:
+        # The LLM client is synchronous, so calls run on worker threads
+        loop = asyncio.get_running_loop()
+        verification = await loop.run_in_executor(
+            self.verify_executor,
+            self.llm.verify_claim,
+            claim.get("claim"),
+            self.trusted_sources
+        )
+        
+        # Generate summary
+        summary = await loop.run_in_executor(
+            self.verify_executor,
+            self.llm.generate_summary,
+            claim.get("claim"),
+            verification
+        )
+        
+        return {
+            "claim_id": claim.get("id"),
+            "claim_text": claim.get("claim"),
+            "verification": verification,
+            "summary": summary
+        }
+    
+    async def verify_claims_batch(self, claims: List[Dict]) -> List[Dict]:
+        """
+        Verify multiple claims concurrently
+        
+        Claims that fail or time out are retried in later cycles, up to
+        max_attempts in all; then they are written to the dead-letter
+        file and count as processed, so the watermark can pass them.
         
         Args:
             claims: List of claims to verify
         
         Returns:
-            List of verification results
+            List of verification results, in the order of the claims
         """
         print("\n✅ Verifying claims batch...")
         
+        pending = []
+        queued = set()
+        for claim in claims:
+            claim_id = claim.get("id")
+            if claim_id in self.processed_claims or claim_id in queued:
+                continue
+            queued.add(claim_id)
+            pending.append(claim)
+            if len(pending) >= self.verify_batch_size:
+                break
+        
+        tasks = [asyncio.ensure_future(self.verify_claim(claim)) for claim in pending]
+        self.inflight.update(tasks)
+        try:
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.inflight.difference_update(tasks)
+        
         verified_results = []
-        for claim in claims[:3]:  # Verify top 3 for demo
-            if claim.get("id") not in self.processed_claims:
-                verification = self.llm.verify_claim(
-                    claim.get("claim"),
-                    self.trusted_sources
-                )
-                
-                # Generate summary
-                summary = self.llm.generate_summary(
-                    claim.get("claim"),
-                    verification
-                )
-                
-                verified_results.append({
-                    "claim_id": claim.get("id"),
-                    "claim_text": claim.get("claim"),
-                    "verification": verification,
-                    "summary": summary
-                })
-                
+        for claim, outcome in zip(pending, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                continue
+            if isinstance(outcome, Exception):
+                print(f"   ⚠️ Could not verify claim {claim.get('id')}: {outcome!r}")
+                self.record_failure(claim, outcome)
+            elif outcome is None:
+                self.record_failure(claim, asyncio.TimeoutError(f"timed out after {self.verify_timeout}s"))
+            else:
+                self.retries.pop(claim.get("id"), None)
+                verified_results.append(outcome)
                 self.processed_claims.add(claim.get("id"))
         
         return verified_results
     
+    def record_failure(self, claim: Dict, error: Exception):
+        """
+        Count a failed verification, dead-lettering the claim at max_attempts
+        
+        Args:
+            claim: Claim that failed
+            error: Why it failed
+        """
+        claim_id = claim.get("id")
+        attempts = self.retries.get(claim_id, (claim, 0))[1] + 1
+        if attempts < self.max_attempts:
+            self.retries[claim_id] = (claim, attempts)
+            return
+        self.retries.pop(claim_id, None)
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.dead_letter_path, "a") as f:
+            f.write(json.dumps({
+                "id": claim_id,
+                "claim": claim.get("claim"),
+                "attempts": attempts,
+                "error": repr(error),
+                "failed_at": datetime.now().isoformat()
+            }) + "\n")
+        self.processed_claims.add(claim_id)
+        print(f"   ⚠️ Gave up on claim {claim_id} after {attempts} attempts")
+    
     def generate_dashboard_update(self, verification_results: List[Dict]) -> Dict:
         """
         Generate dashboard update from verification results
@@ -296,42 +466,54 @@ class MisinformationAgent:
             ]
         }
     
-    async def run_verification_cycle(self):
+    async def run_verification_cycle(self) -> bool:
         """
         Execute one verification cycle
         Fetches claims → detects misinformation → verifies → generates summary
+        
+        Returns:
+            Whether any claim was verified or given up on
         """
         print(f"\n⚡ Starting verification cycle at {datetime.now()}")
         
-        # Step 1: Fetch claims
-        claims = self.fetch_claims()
-        print(f"   ✓ Fetched {len(claims)} claims")
+        # Step 1: Fetch claims, behind the ones due for a retry
+        new_claims = await self.fetch_claims()
+        print(f"   ✓ Fetched {len(new_claims)} claims")
+        retried = [claim for claim, _ in sorted(self.retries.values(), key=lambda entry: entry[0]["id"])]
+        if retried:
+            print(f"   ✓ Retrying {len(retried)} claims")
+        claims = retried + new_claims
         
         if not claims:
             print("   ⚠️ No claims to process")
-            return
+            return False
         
-        # Step 2: Detect misinformation trends
-        trends = self.detect_misinformation_trends(claims)
+        # Step 2: Detect misinformation trends in the claims not seen before;
+        # those processed before a restart were counted and clustered then
+        trends = self.detect_misinformation_trends(
+            [claim for claim in new_claims if claim.get("id") not in self.processed_claims]
+        )
         print(f"   ✓ Detected {trends['detected_misinformation']} misinformation claims")
         print(f"   ✓ Identified topics: {', '.join(trends['emerging_topics'])}")
+        if trends["claim_clusters"]:
+            print(f"   ✓ Grouped reposts into {len(trends['claim_clusters'])} clusters")
         
         # Step 3: Verify claims
-        verified_results = self.verify_claims_batch(claims)
+        watermark = self.watermark.last_id
+        verified_results = await self.verify_claims_batch(claims)
         print(f"   ✓ Verified {len(verified_results)} claims")
+        self.advance_watermark(claims)
+        progressed = bool(verified_results) or self.watermark.last_id > watermark
         
         # Step 4: Generate dashboard update
         dashboard_update = self.generate_dashboard_update(verified_results)
         
         # Step 5: Send update to backend
         try:
-            response = requests.post(
-                f"{self.backend_url}/dashboard-update",
-                json=dashboard_update
-            )
+            await self.http.post_json("/dashboard-update", dashboard_update)
             print(f"   ✓ Dashboard update sent successfully")
-        except:
-            print(f"   ⚠️ Could not send dashboard update (backend may not have this endpoint)")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"   ⚠️ Could not send dashboard update: {e}")
         
         # Print verification summaries
         print("\n📝 Verification Summaries:")
@@ -339,6 +521,7 @@ class MisinformationAgent:
             print(f"   • {result['summary']}")
         
         print(f"\n✨ Verification cycle complete at {datetime.now()}\n")
+        return progressed
     
     async def start(self):
         """
@@ -349,20 +532,29 @@ class MisinformationAgent:
         print(f"\n🚀 EchoSheild Agent Started")
         print(f"   Backend URL: {self.backend_url}")
         print(f"   Update Interval: {self.update_interval} seconds")
-        print(f"   LLM: {self.llm.name}\n")
+        print(f"   LLM: {self.llm.name}")
+        print(f"   Resuming after claim: {self.watermark.last_id}\n")
         
         try:
             while self.is_running:
-                await self.run_verification_cycle()
-                await asyncio.sleep(self.update_interval)
+                progressed = await self.run_verification_cycle()
+                # Keep going without a pause while working through a
+                # backlog, but back off when nothing could be verified
+                if self.caught_up or not progressed:
+                    await asyncio.sleep(self.update_interval)
         except KeyboardInterrupt:
             print("\n⛔ Agent stopped by user")
         finally:
             self.stop()
+            await self.http.close()
+            self.processed_claims.checkpoint()
+            self.verify_executor.shutdown(wait=False, cancel_futures=True)
     
     def stop(self):
-        """Stop the agent"""
+        """Stop the agent, cancelling verifications in flight"""
         self.is_running = False
+        for task in list(self.inflight):
+            task.cancel()
         print("🛑 EchoSheild Agent stopped")
 
 
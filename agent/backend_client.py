@@ -0,0 +1,191 @@
+"""
+Pooled HTTP client for the EchoSheild backend
+One long-lived aiohttp session keeps connections alive between cycles,
+bounds every request with timeouts and retries transient failures with
+jittered exponential backoff, without blocking the agent's event loop
+"""
+
+import asyncio
+import random
+from typing import Dict, Optional
+
+import aiohttp
+
+POOL_SIZE = 32
+CONNECT_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 30.0
+KEEPALIVE_SECONDS = 60.0
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+
+# Statuses worth retrying: the backend is overloaded, restarting or behind a proxy
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Methods safe to resend after the request may have reached the backend
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class BackendClient:
+    """
+    Async client sharing one connection pool across all backend calls
+    """
+
+    def __init__(self, base_url: str, pool_size: int = POOL_SIZE, connect_timeout: float = CONNECT_TIMEOUT,
+                 request_timeout: float = REQUEST_TIMEOUT, retries: int = RETRIES,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX):
+        """
+        Args:
+            base_url: URL of the backend API
+            pool_size: Maximum open connections to the backend
+            connect_timeout: Seconds to wait for a connection
+            request_timeout: Seconds allowed for a whole request, including
+                reading the response
+            retries: Extra attempts after a transient failure
+            backoff_base: First retry waits up to this many seconds, doubling
+                with each further attempt
+            backoff_max: Cap on a single retry wait
+        """
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Open the session on the running event loop, once"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                # Responses are decompressed transparently
+                headers={"Accept-Encoding": "gzip, deflate", "Accept": "application/json"},
+                raise_for_status=False,
+            )
+        return self.session
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before a retry
+
+        Args:
+            attempt: Number of the failed attempt, from 0
+            retry_after: Retry-After header of the failed response, if any
+
+        Returns:
+            A server-requested delay, else a random delay up to the
+            exponential bound ("full jitter"), so clients spread out
+        """
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        """
+        Send a request, retrying transient failures
+
+        Connection errors before the request was sent, and retryable
+        statuses, are retried for every method; timeouts and dropped
+        connections only for idempotent ones.
+
+        Args:
+            method: HTTP method
+            path: Path under the backend URL
+            **kwargs: Passed to aiohttp (params, json, headers, ...)
+
+        Returns:
+            Response with its body read, so the connection is back in the pool
+
+        Raises:
+            aiohttp.ClientError: The backend could not be reached, or
+                answered with an error status, after all retries
+            asyncio.TimeoutError: The last attempt timed out
+        """
+        session = await self.start()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.requests += 1
+            retry_after = None
+            try:
+                async with session.request(method, f"{self.base_url}{path}", **kwargs) as response:
+                    await response.read()
+                    if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                        response.raise_for_status()
+                        return response
+                    retry_after = response.headers.get("Retry-After")
+            except aiohttp.ClientResponseError:
+                self.failures += 1
+                raise
+            except aiohttp.ClientConnectorError:
+                # Nothing was sent; safe to resend
+                if attempt >= self.retries:
+                    self.failures += 1
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not idempotent or attempt >= self.retries:
+                    self.failures += 1
+                    raise
+            self.retried += 1
+            await asyncio.sleep(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    async def get_json(self, path: str, params: Optional[Dict] = None):
+        """
+        GET a JSON resource
+
+        Args:
+            path: Path under the backend URL
+            params: Query parameters
+
+        Returns:
+            Decoded JSON body
+        """
+        response = await self.request("GET", path, params=params)
+        return await response.json()
+
+    async def post_json(self, path: str, payload: Dict):
+        """
+        POST a JSON body
+
+        Args:
+            path: Path under the backend URL
+            payload: JSON-serializable body
+
+        Returns:
+            Decoded JSON response body
+        """
+        response = await self.request("POST", path, json=payload)
+        return await response.json()
+
+    async def close(self):
+        """Close the session and its pooled connections"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def stats(self) -> Dict:
+        """
+        Client statistics
+
+        Returns:
+            Request, retry and failure counters and the pool size
+        """
+        return {
+            "requests": self.requests,
+            "retried": self.retried,
+            "failures": self.failures,
+            "pool_size": self.pool_size,
+        }
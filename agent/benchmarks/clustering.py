@@ -0,0 +1,136 @@
+"""
+Benchmark: near-duplicate clustering of a claim stream
+
+Feeds N synthetic claims through ClaimClusterer one batch at a time, as
+the agent does, and reports insertion throughput, memory and how well the
+clusters recover the original claims:
+
+  purity          share of claims in a cluster started by their own original
+  clusters/orig   clusters per original claim; 1.0 means no fragmentation
+
+Claims are reposts of a pool of originals (one per --reposts claims,
+popularity skewed) reworded the way reposts are: words reordered,
+dropped or inflected, retweet markers, mentions, hashtags and links
+added. Everything is driven by --seed. Pairwise comparison of 1M claims
+would take 5 * 10^11 similarity checks; each insertion here looks at
+a handful of candidate clusters instead.
+
+Usage (from agent/):
+    python benchmarks/clustering.py [--claims 100000 1000000] [--json out.json]
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from similarity import ClaimClusterer
+
+FILLER = ["the", "a", "is", "are", "that", "this", "of", "in", "by", "and"]
+PREFIXES = ["", "", "", "BREAKING:", "RT @newsbot:", "Wow!", "Share before they delete this:"]
+SUFFIXES = ["", "", "", "#truth", "https://t.co/x1y2z3", "@everyone", "!!!", "(source: a friend)"]
+
+
+def make_originals(n: int, rng: random.Random) -> List[List[str]]:
+    """Original claims as word lists drawn from a Zipf-like vocabulary"""
+    vocabulary = [f"{rng.choice('bcdfgklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfgklmnprstvz')}"
+                  f"{rng.choice('aeiou')}{rng.choice('nrstl')}{i}" for i in range(20_000)]
+    originals = []
+    for _ in range(n):
+        words = [vocabulary[min(int(rng.paretovariate(0.6)) - 1, len(vocabulary) - 1) if rng.random() < 0.3
+                            else rng.randrange(len(vocabulary))] for _ in range(rng.randint(6, 12))]
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER))
+        originals.append(words)
+    return originals
+
+
+def repost(words: List[str], rng: random.Random) -> str:
+    """A reworded copy of an original"""
+    words = list(words)
+    for _ in range(rng.randint(0, 2)):
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    if rng.random() < 0.3:
+        del words[rng.randrange(len(words))]
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words))
+        words[i] += rng.choice(["s", "ed", "ing"])
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER))
+    return " ".join(filter(None, [rng.choice(PREFIXES), " ".join(words), rng.choice(SUFFIXES)]))
+
+
+def make_stream(n: int, reposts: int, rng: random.Random) -> Tuple[List[str], List[int]]:
+    """Claims and the original each one reposts"""
+    originals = make_originals(max(1, n // reposts), rng)
+    truth = [min(int(len(originals) * rng.random() ** 2), len(originals) - 1) for _ in range(n)]
+    return [repost(originals[i], rng) for i in truth], truth
+
+
+def run(n: int, args) -> Dict:
+    rng = random.Random(args.seed)
+    texts, truth = make_stream(n, args.reposts, rng)
+    # Unbounded, to measure how the index grows with distinct claims
+    clusterer = ClaimClusterer(max_clusters=None)
+    started = time.perf_counter()
+    assigned = []
+    for start in range(0, n, args.batch):
+        assigned.extend(clusterer.add_many(texts[start:start + args.batch]))
+    seconds = time.perf_counter() - started
+
+    # A cluster belongs to the original most of its claims repost
+    owners: Dict[int, Counter] = {}
+    for cluster_id, original in zip(assigned, truth):
+        owners.setdefault(cluster_id, Counter())[original] += 1
+    pure = sum(counts.most_common(1)[0][1] for counts in owners.values())
+    stats = clusterer.stats()
+    return {
+        "claims": n,
+        "originals": len(set(truth)),
+        "clusters": stats["clusters"],
+        "seconds": round(seconds, 2),
+        "claims_per_second": round(n / seconds),
+        "purity": round(pure / n, 4),
+        "clusters_per_original": round(stats["clusters"] / len(set(truth)), 3),
+        "index_mib": round(stats["memory_bytes"] / 2**20, 1),
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, nargs="+", default=[100_000, 1_000_000], help="stream sizes")
+    parser.add_argument("--reposts", type=int, default=20, help="claims per original, on average")
+    parser.add_argument("--batch", type=int, default=500, help="claims added per call, like one agent cycle")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    runs = []
+    for n in args.claims:
+        r = run(n, args)
+        runs.append(r)
+        print(f"  {n:>10,} claims  {r['seconds']:>8.1f} s  {r['claims_per_second']:>8,} claims/s   "
+              f"{r['clusters']:>8,} clusters for {r['originals']:,} originals ({r['clusters_per_original']:.2f}x)   "
+              f"purity {r['purity']:.3f}   index {r['index_mib']:,.1f} MiB   peak RSS {r['peak_rss_mib']:,.0f} MiB")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "clustering",
+            "reposts": args.reposts,
+            "runs": runs,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
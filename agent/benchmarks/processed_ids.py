@@ -0,0 +1,130 @@
+"""
+Benchmark: memory of the processed-claims record against a Python set
+
+Records N processed claim IDs in ProcessedIds under several ID layouts
+and reports its memory, checkpoint size and add/lookup rates next to
+what a plain set of the same IDs would take:
+
+  sequential      IDs 1..N, watermark never moves (worst case for the floor)
+  watermark       IDs 1..N with the floor following 1000 IDs behind
+  half_dense      N random IDs out of 1..2N
+  sparse          N random IDs spread over 1..1000N
+
+The set's size is measured with tracemalloc on up to a million IDs and
+scaled linearly, since building a 10M-element set only to measure it
+takes over half a GB.
+
+Usage (from agent/):
+    python benchmarks/processed_ids.py [--ids 10000000] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processed import ProcessedIds
+
+
+def set_bytes(n: int) -> int:
+    """Bytes a set of n ints takes, measured on up to a million and scaled"""
+    sample = min(n, 1_000_000)
+    tracemalloc.start()
+    ids = set(range(1 << 20, (1 << 20) + sample))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del ids
+    return size * n // sample
+
+
+def layouts(n: int, rng: random.Random) -> Dict[str, Callable[[], List[int]]]:
+    """Builders of the ID sequence per scenario, in processing order"""
+    return {
+        "sequential": lambda: list(range(1, n + 1)),
+        "watermark": lambda: list(range(1, n + 1)),
+        "half_dense": lambda: rng.sample(range(1, 2 * n + 1), n),
+        "sparse": lambda: rng.sample(range(1, 1000 * n + 1), n),
+    }
+
+
+def run(name: str, ids: List[int], directory: str, rng: random.Random) -> Dict:
+    path = Path(directory) / f"{name}.bin"
+    record = ProcessedIds(path)
+    started = time.perf_counter()
+    if name == "watermark":
+        for claim_id in ids:
+            record.add(claim_id)
+            if claim_id % 1000 == 0:
+                record.raise_floor(claim_id - 1000)
+    else:
+        for claim_id in ids:
+            record.add(claim_id)
+    add_seconds = time.perf_counter() - started
+
+    probes = [rng.choice(ids) for _ in range(100_000)] + [rng.randint(1, 1000 * len(ids)) for _ in range(100_000)]
+    started = time.perf_counter()
+    for claim_id in probes:
+        claim_id in record
+    lookup_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    record.checkpoint()
+    checkpoint_seconds = time.perf_counter() - started
+    restored = ProcessedIds(path)
+    assert all(claim_id in restored for claim_id in ids[-1000:])
+
+    return {
+        "layout": name,
+        "ids": len(ids),
+        **record.stats(),
+        "bytes_per_id": round(record.memory_bytes() / len(ids), 4),
+        "checkpoint_bytes": os.path.getsize(path),
+        "checkpoint_ms": round(checkpoint_seconds * 1000, 1),
+        "adds_per_second": round(len(ids) / add_seconds),
+        "lookups_per_second": round(len(probes) / lookup_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=10_000_000, help="processed IDs per layout")
+    parser.add_argument("--layouts", nargs="+", default=["sequential", "watermark", "half_dense", "sparse"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    baseline = set_bytes(args.ids)
+    print(f"{args.ids:,} IDs; a Python set of them holds about {baseline / 2**20:,.1f} MiB")
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, build in layouts(args.ids, rng).items():
+            if name not in args.layouts:
+                continue
+            r = run(name, build(), directory, rng)
+            runs.append(r)
+            print(f"  {name:<11} {r['memory_bytes'] / 2**20:>8.2f} MiB ({r['bytes_per_id']:.3f} B/id, "
+                  f"{baseline / max(r['memory_bytes'], 1):,.0f}x smaller)   checkpoint {r['checkpoint_bytes'] / 2**10:>8.1f} KiB "
+                  f"in {r['checkpoint_ms']:.0f} ms   {r['adds_per_second']:,} adds/s   {r['lookups_per_second']:,} lookups/s")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "processed_ids",
+            "ids": args.ids,
+            "set_bytes": baseline,
+            "runs": runs,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
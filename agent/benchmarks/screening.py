@@ -0,0 +1,155 @@
+"""
+Benchmark: keyword pre-screening of a claim batch
+
+Screens N synthetic claims for misinformation keywords, topics and
+entity cues three ways and reports claims per second:
+
+  loops           the per-step scans this replaced: MockLLM keyword and
+                  topic checks plus LangChainSimulator topic and entity
+                  checks, each lowercasing and searching the text per keyword
+  regex           one alternation regex with a named group per keyword
+  matcher         patterns.screen_batch(): one tokenizing pass, hash lookups
+
+Claims are built from templates mixing keywords, their plurals, acronyms
+and filler, driven by --seed. Topic counts are printed too; the loops
+never file anything under technology by "5G" or "AI", since they search
+lowercased text for uppercase keywords.
+
+Usage (from agent/):
+    python benchmarks/screening.py [--claims 100000] [--json out.json]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from patterns import ENTITY_KEYWORDS, MISINFORMATION_KEYWORDS, TOPIC_KEYWORDS, screen_batch
+
+SUBJECTS = ["The new vaccine", "5G towers", "A government report", "The WHO", "Local doctors", "AI chatbots",
+            "Climate scientists", "The stock market", "Election officials", "Renewable energy", "The CDC",
+            "A viral post", "Carbon taxes", "Microchips in vaccines", "Our president", "Weather satellites"]
+VERBS = ["causes", "prevents", "is linked to", "hides", "was caught spreading", "reduces", "confirms", "denies"]
+OBJECTS = ["cancer", "infections", "a massive hoax", "rising prices", "voter fraud", "memory loss", "higher taxes",
+           "crop failures", "digital surveillance", "economic collapse", "new diseases", "lower emissions"]
+TAILS = ["according to a leaked memo", "experts say", "and nobody is talking about it", "in three countries",
+         "says a politician", "per an anonymous source", "", "", ""]
+
+
+def make_claims(n: int, rng: random.Random) -> List[str]:
+    """Synthetic claims in the shape of social media posts"""
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(TAILS)}".strip()
+            for _ in range(n)]
+
+
+def loops(texts: List[str]) -> List[Dict]:
+    """The scans as written before the shared matcher"""
+    results = []
+    for claim in texts:
+        # MockLLM.detect_misinformation
+        keywords = []
+        for keyword in MISINFORMATION_KEYWORDS:
+            if keyword.lower() in claim.lower():
+                keywords.append(keyword)
+                break
+        # MockLLM.cluster_claims
+        "health" if "vaccine" in claim.lower() or "health" in claim.lower() else \
+            "technology" if "5G" in claim.lower() or "AI" in claim.lower() else \
+            "politics" if "election" in claim.lower() else \
+            "environment" if "climate" in claim.lower() or "renewable" in claim.lower() else \
+            "other"
+        # LangChainSimulator.cluster_by_similarity
+        topic = "general"
+        for topic_name, topic_keywords in TOPIC_KEYWORDS.items():
+            if any(kw in claim.lower() for kw in topic_keywords):
+                topic = topic_name
+                break
+        # LangChainSimulator.extract_entities
+        entities = []
+        if "WHO" in claim or "CDC" in claim:
+            entities.append("organizations")
+        if "government" in claim.lower() or "politician" in claim.lower():
+            entities.append("people")
+        if "vaccine" in claim.lower() or "health" in claim.lower():
+            entities.append("claims")
+        results.append({"keywords": keywords, "topics": [topic] if topic != "general" else [], "entities": entities})
+    return results
+
+
+def build_regex() -> Callable[[List[str]], List[Dict]]:
+    """One alternation over every keyword, telling them apart by group name"""
+    targets = []
+    for group, labels in (("keywords", {"misinformation": MISINFORMATION_KEYWORDS}), ("topics", TOPIC_KEYWORDS),
+                          ("entities", ENTITY_KEYWORDS)):
+        for label, keywords in labels.items():
+            targets.extend((group, label, keyword) for keyword in keywords)
+    alternatives = []
+    for i, (_, _, keyword) in enumerate(targets):
+        flags = "" if keyword.isalpha() and keyword.isupper() else "(?i)"
+        alternatives.append(f"(?P<k{i}>{'(?i:' if flags else '(?:'}{re.escape(keyword)}(?:e?s)?))")
+    pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+
+    def run(texts: List[str]) -> List[Dict]:
+        results = []
+        for text in texts:
+            found: Dict[str, List[str]] = {"keywords": [], "topics": [], "entities": []}
+            for match in pattern.finditer(text):
+                group, label, keyword = targets[int(match.lastgroup[1:])]
+                found[group].append(keyword if group == "keywords" else label)
+            results.append(found)
+        return results
+
+    return run
+
+
+def measure(fn: Callable[[List[str]], List[Dict]], texts: List[str], repeat: int) -> Dict:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = fn(texts)
+        best = min(best, time.perf_counter() - started)
+    topics = Counter(r["topics"][0] if r["topics"] else "none" for r in results)
+    return {
+        "seconds": round(best, 3),
+        "claims_per_second": round(len(texts) / best),
+        "with_keywords": sum(1 for r in results if r["keywords"]),
+        "topics": dict(topics.most_common()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=100_000, help="claims to screen")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per method; the best is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    texts = make_claims(args.claims, random.Random(args.seed))
+    methods = {"loops": loops, "regex": build_regex(), "matcher": screen_batch}
+    runs = {}
+    for name, fn in methods.items():
+        r = runs[name] = measure(fn, texts, args.repeat)
+        speedup = runs["loops"]["seconds"] / r["seconds"]
+        print(f"  {name:<8} {r['seconds']:>7.3f} s  {r['claims_per_second']:>10,} claims/s ({speedup:4.2f}x)"
+              f"   technology: {r['topics'].get('technology', 0):,}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "screening",
+            "claims": args.claims,
+            "runs": runs,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,16 @@ Provides LLM-powered claim analysis and verification
 from typing import List, Dict, Optional
 import random
 
+from patterns import screen
+from similarity import ClaimClusterer
+
+# Entity reported for each type of cue found by patterns.screen()
+ENTITY_NAMES = {
+    "people": "Political Figure",
+    "organizations": "Health Organization",
+    "claims": "Health-related claim",
+}
+
 class LangChainSimulator:
     """
     Simulates LangChain integration with OpenAI GPT-4
@@ -16,38 +26,23 @@ class LangChainSimulator:
         """Initialize the simulator"""
         self.model_name = model_name
         self.chain_history = []
+        self.clusterer = ClaimClusterer()
     
     def cluster_by_similarity(self, texts: List[str]) -> Dict[str, List[str]]:
         """
-        Use LLM to cluster similar claims
+        Cluster near-duplicate claims by MinHash similarity
+        
+        Clusters persist across calls, so reworded copies of earlier
+        claims join their clusters.
         
         Args:
             texts: List of claim texts
         
         Returns:
-            Clustered claims by topic
+            First claim of each cluster -> the given texts in it, largest
+            cluster first
         """
-        clusters = {}
-        topic_keywords = {
-            "health": ["vaccine", "disease", "medicine", "health", "doctor"],
-            "politics": ["election", "vote", "government", "president", "minister"],
-            "technology": ["AI", "5G", "software", "computer", "digital"],
-            "environment": ["climate", "weather", "renewable", "carbon", "environment"],
-            "economics": ["stock", "money", "investment", "economy", "price"]
-        }
-        
-        for text in texts:
-            topic = "general"
-            for topic_name, keywords in topic_keywords.items():
-                if any(kw in text.lower() for kw in keywords):
-                    topic = topic_name
-                    break
-            
-            if topic not in clusters:
-                clusters[topic] = []
-            clusters[topic].append(text)
-        
-        return clusters
+        return self.clusterer.cluster(texts)
     
     def extract_entities(self, text: str) -> Dict:
         """
@@ -66,15 +61,9 @@ class LangChainSimulator:
             "claims": []
         }
         
-        # Mock entity extraction
-        if "WHO" in text or "CDC" in text or "WHO" in text:
-            entities["organizations"].append("Health Organization")
-        
-        if "government" in text.lower() or "politician" in text.lower():
-            entities["people"].append("Political Figure")
-        
-        if "vaccine" in text.lower() or "health" in text.lower():
-            entities["claims"].append("Health-related claim")
+        # Mock entity extraction from keyword cues
+        for entity_type in screen(text)["entities"]:
+            entities[entity_type].append(ENTITY_NAMES[entity_type])
         
         return entities
     
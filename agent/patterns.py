@@ -0,0 +1,182 @@
+"""
+Keyword pre-screening shared by the agent's analysis steps
+Misinformation keywords, topic keywords and entity cues are compiled into
+one matcher that reads each claim once and reports every hit together,
+instead of every step lowercasing and searching the text per keyword
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Keywords that make a claim suspicious
+MISINFORMATION_KEYWORDS = ["causes", "cancer", "vaccine", "5G", "microchip", "hoax"]
+
+# Topic keywords, in priority order: a claim goes to the first topic it hits
+TOPIC_KEYWORDS = {
+    "health": ["vaccine", "disease", "medicine", "health", "doctor"],
+    "politics": ["election", "vote", "government", "president", "minister"],
+    "technology": ["AI", "5G", "software", "computer", "digital"],
+    "environment": ["climate", "weather", "renewable", "carbon", "environment"],
+    "economics": ["stock", "money", "investment", "economy", "price"],
+}
+
+# Words hinting at an entity of each type
+ENTITY_KEYWORDS = {
+    "people": ["government", "politician"],
+    "organizations": ["WHO", "CDC"],
+    "claims": ["vaccine", "health"],
+}
+
+WORD = re.compile(r"\w+")
+
+# Endings under which a keyword still matches ("vaccines", "hoaxes")
+INFLECTIONS = ("", "s", "es")
+
+# Distinct words whose matches are remembered; claims reuse a small vocabulary
+TOKEN_CACHE_SIZE = 100_000
+
+# (rank, group, label, keyword); rank orders hits as the keywords were defined
+Target = Tuple[int, str, str, str]
+
+
+class PatternMatcher:
+    """
+    Compiled multi-keyword matcher over labelled keyword groups
+
+    Keywords are single words, matched as whole words in any case and
+    with a plural ending ("Vaccines" matches "vaccine", "vaccinated" does
+    not). Keywords in capital letters only ("WHO", "AI") are acronyms and
+    match exactly, so "who" or "said" never count.
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, Iterable[str]]]):
+        """
+        Args:
+            groups: Group name -> label -> keywords; labels keep their
+                order, which is their priority within the group
+        """
+        self.labels: Dict[str, List[str]] = {group: list(labels) for group, labels in groups.items()}
+        self.words: Dict[str, List[Target]] = {}
+        self.acronyms: Dict[str, List[Target]] = {}
+        self.targets: List[Target] = []
+        for group, labels in groups.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    if not WORD.fullmatch(keyword):
+                        raise ValueError(f"Keyword must be a single word: {keyword!r}")
+                    target = (len(self.targets), group, label, keyword)
+                    self.targets.append(target)
+                    if keyword.isalpha() and keyword.isupper():
+                        self.acronyms.setdefault(keyword, []).append(target)
+                    else:
+                        for ending in INFLECTIONS:
+                            self.words.setdefault(keyword.lower() + ending, []).append(target)
+        # Word as written -> what it matches, so each distinct word is
+        # case-folded and looked up once rather than in every text
+        self.tokens: Dict[str, Tuple[Target, ...]] = {}
+
+    def lookup(self, token: str) -> Tuple[Target, ...]:
+        """Keyword targets a word matches"""
+        targets = self.tokens.get(token)
+        if targets is None:
+            targets = tuple(self.acronyms.get(token, ())) + tuple(self.words.get(token.lower(), ()))
+            if len(self.tokens) >= TOKEN_CACHE_SIZE:
+                self.tokens.clear()
+            self.tokens[token] = targets
+        return targets
+
+    def match(self, text: str) -> List[Target]:
+        """
+        Every keyword hit in a text, in text order, from one pass over it
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            (rank, group, label, keyword) per hit, repeated if a word recurs
+        """
+        hits: List[Target] = []
+        tokens = self.tokens
+        for token in WORD.findall(text):
+            targets = tokens.get(token)
+            if targets is None:
+                targets = self.lookup(token)
+            if targets:
+                hits.extend(targets)
+        return hits
+
+    def scan(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Find every keyword in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Group -> label -> keywords found, with labels in priority order
+            and only labels that were hit; every group is present
+        """
+        return self.group(self.match(text))
+
+    def group(self, hits: List[Target]) -> Dict[str, Dict[str, List[str]]]:
+        """Arrange hits from match() as scan() returns them"""
+        found: Dict[str, Dict[str, List[str]]] = {group: {} for group in self.labels}
+        # In definition order, labels come out by priority without re-sorting
+        hits.sort()
+        for _, group, label, keyword in hits:
+            labels = found[group]
+            keywords = labels.get(label)
+            if keywords is None:
+                labels[label] = [keyword]
+            elif keywords[-1] != keyword:
+                keywords.append(keyword)
+        return found
+
+    def scan_batch(self, texts: Iterable[str]) -> List[Dict[str, Dict[str, List[str]]]]:
+        """Scan several texts; see scan()"""
+        return [self.scan(text or "") for text in texts]
+
+
+MATCHER = PatternMatcher({
+    "keywords": {"misinformation": MISINFORMATION_KEYWORDS},
+    "topics": TOPIC_KEYWORDS,
+    "entities": ENTITY_KEYWORDS,
+})
+
+
+def screen(text: str) -> Dict:
+    """
+    Pre-screen a claim for misinformation keywords, topics and entities
+
+    Args:
+        text: Claim text
+
+    Returns:
+        keywords: Misinformation keywords found
+        topics: Topics hit, highest priority first
+        entities: Entity type -> cue words found
+    """
+    hits = MATCHER.match(text or "")
+    keywords: List[str] = []
+    topics: List[str] = []
+    entities: Dict[str, List[str]] = {}
+    if len(hits) > 1:
+        # Definition order: topics by priority, repeated hits side by side
+        hits.sort()
+    for _, group, label, keyword in hits:
+        if group == "keywords":
+            if keyword not in keywords:
+                keywords.append(keyword)
+        elif group == "topics":
+            if not topics or topics[-1] != label:
+                topics.append(label)
+        else:
+            cues = entities.setdefault(label, [])
+            if keyword not in cues:
+                cues.append(keyword)
+    return {"keywords": keywords, "topics": topics, "entities": entities}
+
+
+def screen_batch(texts: Iterable[str]) -> List[Dict]:
+    """Pre-screen several claims; see screen()"""
+    return [screen(text) for text in texts]
@@ -0,0 +1,222 @@
+"""
+Compact, durable record of processed claim IDs
+Claim IDs are dense increasing integers, so they are kept in a compressed
+bitmap in the style of Roaring: IDs are split into chunks of 65536, and
+each chunk is stored as whichever is smallest of a sorted array of 16-bit
+offsets (sparse chunks), a 8 KiB bitmap (dense chunks) or a single marker
+(complete chunks). Everything at or below a floor, normally the agent's
+watermark, counts as processed and takes no memory at all, so the record
+only grows with the claims processed ahead of the watermark.
+"""
+
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+# Past this many entries an offset array is larger than a bitmap
+ARRAY_MAX = 4096
+BITMAP_BYTES = CHUNK_SIZE // 8
+
+CHECKPOINT_SECONDS = 60.0
+FORMAT_VERSION = 1
+
+ARRAY, BITMAP, FULL = 0, 1, 2
+HEADER = struct.Struct("<4sBqQ")
+CONTAINER = struct.Struct("<qBI")
+MAGIC = b"EPID"
+
+# The marker kept for a complete chunk
+FULL_CHUNK = None
+
+
+def bitmap_count(bitmap: bytearray) -> int:
+    """Number of set bits"""
+    return int.from_bytes(bitmap, "little").bit_count()
+
+
+def array_to_bitmap(offsets: array) -> bytearray:
+    """Bitmap of a sorted offset array"""
+    bitmap = bytearray(BITMAP_BYTES)
+    for offset in offsets:
+        bitmap[offset >> 3] |= 1 << (offset & 7)
+    return bitmap
+
+
+class ProcessedIds:
+    """
+    Set of processed claim IDs with bounded memory and periodic checkpoints
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, floor: int = 0):
+        """
+        Args:
+            path: Checkpoint file; None keeps the record in memory only
+            floor: Every ID up to and including this one is processed
+        """
+        self.path = Path(path) if path is not None else None
+        self.floor = floor
+        self.containers: Dict[int, Optional[Union[array, bytearray]]] = {}
+        self.cardinality: Dict[int, int] = {}
+        self.count = 0
+        self.dirty = False
+        self.checkpoints = 0
+        if self.path is not None:
+            self.load()
+        self.raise_floor(floor)
+
+    def __contains__(self, claim_id) -> bool:
+        if not isinstance(claim_id, int):
+            return False
+        if claim_id <= self.floor:
+            return True
+        key, offset = claim_id >> CHUNK_BITS, claim_id & (CHUNK_SIZE - 1)
+        if key not in self.containers:
+            return False
+        container = self.containers[key]
+        if container is FULL_CHUNK:
+            return True
+        if isinstance(container, bytearray):
+            return bool(container[offset >> 3] & (1 << (offset & 7)))
+        i = bisect_left(container, offset)
+        return i < len(container) and container[i] == offset
+
+    def __len__(self) -> int:
+        """IDs recorded, not counting those implied by the floor"""
+        return self.count
+
+    def add(self, claim_id: int):
+        """Record a processed ID"""
+        if claim_id in self:
+            return
+        key, offset = claim_id >> CHUNK_BITS, claim_id & (CHUNK_SIZE - 1)
+        if key not in self.containers:
+            self.containers[key] = array("H")
+            self.cardinality[key] = 0
+        container = self.containers[key]
+        if isinstance(container, array):
+            container.insert(bisect_left(container, offset), offset)
+            if len(container) > ARRAY_MAX:
+                self.containers[key] = array_to_bitmap(container)
+        else:
+            container[offset >> 3] |= 1 << (offset & 7)
+        self.cardinality[key] += 1
+        if self.cardinality[key] == CHUNK_SIZE:
+            self.containers[key] = FULL_CHUNK
+        self.count += 1
+        self.dirty = True
+
+    def update(self, claim_ids: Iterable[int]):
+        """Record several processed IDs"""
+        for claim_id in claim_ids:
+            self.add(claim_id)
+
+    def raise_floor(self, floor: int):
+        """
+        Mark every ID up to floor as processed and drop the chunks below it
+
+        Args:
+            floor: Highest ID such that every ID up to it is processed
+        """
+        if floor <= self.floor:
+            return
+        self.floor = floor
+        # The chunk holding the floor is kept until the floor passes it
+        below = floor >> CHUNK_BITS
+        for key in [key for key in self.containers if key < below]:
+            del self.containers[key]
+            self.count -= self.cardinality.pop(key)
+        self.dirty = True
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the containers and their index"""
+        total = 0
+        for container in self.containers.values():
+            if isinstance(container, bytearray):
+                total += BITMAP_BYTES
+            elif isinstance(container, array):
+                total += container.buffer_info()[1] * container.itemsize
+        # Dict slots, keys, counts and container objects, per chunk
+        return total + len(self.containers) * 200
+
+    def checkpoint(self):
+        """
+        Write the record if it changed; a crash leaves the old or new file
+        whole. IDs processed since the last checkpoint are verified again
+        after a crash, never skipped.
+        """
+        if self.path is None or not self.dirty:
+            return
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, self.floor, len(self.containers))]
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            if container is FULL_CHUNK:
+                parts.append(CONTAINER.pack(key, FULL, 0))
+            else:
+                data = container.tobytes() if isinstance(container, array) else bytes(container)
+                parts.append(CONTAINER.pack(key, ARRAY if isinstance(container, array) else BITMAP, len(data)))
+                parts.append(data)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(b"".join(parts), 6))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.dirty = False
+        self.checkpoints += 1
+
+    def load(self):
+        """Read the last checkpoint, starting empty if there is none"""
+        try:
+            data = zlib.decompress(self.path.read_bytes())
+            magic, version, floor, containers = HEADER.unpack_from(data)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("unknown format")
+            position = HEADER.size
+            for _ in range(containers):
+                key, kind, length = CONTAINER.unpack_from(data, position)
+                position += CONTAINER.size
+                if kind == FULL:
+                    container = FULL_CHUNK
+                elif kind == BITMAP:
+                    container = bytearray(data[position:position + length])
+                else:
+                    container = array("H")
+                    container.frombytes(data[position:position + length])
+                position += length
+                self.containers[key] = container
+                self.cardinality[key] = (CHUNK_SIZE if container is FULL_CHUNK else
+                                         bitmap_count(container) if kind == BITMAP else len(container))
+                self.count += self.cardinality[key]
+            self.floor = floor
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            print(f"⚠️ Ignoring unreadable processed-claims checkpoint {self.path}: {e}")
+            self.containers.clear()
+            self.cardinality.clear()
+            self.count = 0
+
+    def stats(self) -> Dict:
+        """
+        Record statistics
+
+        Returns:
+            Floor, IDs held in containers, container mix and memory estimate
+        """
+        kinds = {"array": 0, "bitmap": 0, "full": 0}
+        for container in self.containers.values():
+            kinds["full" if container is FULL_CHUNK else "bitmap" if isinstance(container, bytearray) else "array"] += 1
+        return {
+            "floor": self.floor,
+            "ids_held": self.count,
+            "containers": kinds,
+            "memory_bytes": self.memory_bytes(),
+            "checkpoints": self.checkpoints,
+        }
@@ -0,0 +1,304 @@
+"""
+Near-duplicate claim clustering with MinHash and LSH
+Claims are reduced to shingles (their stemmed content words),
+summarized by MinHash signatures whose agreement estimates the Jaccard
+similarity of the shingle sets, and indexed by LSH bands so a new claim
+is compared only with the few clusters it shares a band with. Inserting
+a claim costs the same however many claims came before, so reworded
+copies of a hoax join one cluster without any pairwise comparison.
+Clusters not joined for a while are dropped once there are too many.
+"""
+
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+# Estimated Jaccard similarity needed to join a cluster
+THRESHOLD = 0.5
+# Longest word run used as a shingle; reposts reorder words, and on
+# claims this short word pairs cost more recall than they add precision
+NGRAM = 1
+SEED = 1
+# Claims signed per vectorized batch
+BATCH_SIZE = 4096
+# Clusters kept; beyond it the least recently joined are dropped
+MAX_CLUSTERS = 20_000
+
+# Prime modulus of the permutation hashes; a * x + b stays below 2^64
+PRIME = (1 << 31) - 1
+
+WORD = re.compile(r"\w+")
+NOISE = re.compile(r"https?://\S+|www\.\S+|@\w+|#", re.IGNORECASE)
+SUFFIXES = ("ing", "ed", "es", "s", "e")
+# "n't" contractions and "cannot", rewritten as "not"
+CONTRACTED_NOT = re.compile(r"\bcannot\b|(?:ca|wo|sha)?n['\u2019]t\b")
+NEGATIONS = frozenset(["not", "no", "never", "nor", "none", "nobody", "nothing", "neither"])
+
+STOPWORDS = frozenset("""
+a an the and or but if of to in on at by for from with about as into over
+is are was were be been being has have had do does did will would can could
+may might must shall should this that these those it its they them their
+he she his her we our you your i me my so than then there here
+just very also says say said claims claim according new breaking rt
+""".split())
+
+
+def stem(word: str) -> str:
+    """Strip one common ending, so "caused", "causes" and "cause" agree"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def shingles(text: str, ngram: int = NGRAM) -> Set[str]:
+    """
+    Shingles of a claim: its content words and runs of up to ngram of them
+
+    Args:
+        text: Claim text
+        ngram: Longest word run; 1 uses single words only
+
+    Returns:
+        Set of shingle strings, empty if the text has no content words.
+        Shingles of a negated claim are marked, so a denial shares none
+        with the claim it denies
+    """
+    text = NOISE.sub(" ", text or "").lower()
+    if "'" in text or "\u2019" in text or "cannot" in text:
+        text = CONTRACTED_NOT.sub(" not", text)
+    words = [word for word in WORD.findall(text) if word not in STOPWORDS]
+    negated = not NEGATIONS.isdisjoint(words)
+    words = [stem(word) for word in words]
+    found = set(words)
+    for n in range(2, ngram + 1):
+        found.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    if negated:
+        found = {"~" + shingle for shingle in found}
+    return found
+
+
+class ClaimClusterer:
+    """
+    Incremental near-duplicate clustering of claim texts
+
+    Each cluster is represented by the signature of its first claim; only
+    representatives are indexed, so memory grows with the number of
+    distinct clusters, not with the claims added to them, and prune()
+    bounds that number.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, threshold: float = THRESHOLD,
+                 ngram: int = NGRAM, seed: int = SEED, max_clusters: Optional[int] = MAX_CLUSTERS):
+        """
+        Args:
+            num_perm: MinHash permutations per signature
+            bands: LSH bands; num_perm must divide into them evenly. More
+                bands find less similar candidates, at more memory
+            threshold: Estimated Jaccard similarity needed to join a cluster
+            ngram: Longest word run used as a shingle
+            seed: Seed of the permutations; clusterers with equal settings
+                and seed produce equal signatures
+            max_clusters: Clusters kept by prune(); None keeps them all
+
+        Raises:
+            ValueError: If num_perm is not a multiple of bands
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.ngram = ngram
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, PRIME, num_perm, dtype=np.uint64)
+        # Odd multipliers folding a band's rows into one 64-bit bucket key
+        self.fold = rng.integers(1, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        self.buckets: List[Dict[int, int]] = [{} for _ in range(bands)]
+        self.leaders = np.empty((1024, num_perm), dtype=np.uint32)
+        self.labels: List[str] = []
+        self.sizes = array("I")
+        # Claim count when each cluster was last joined
+        self.last_seen = array("Q")
+        self.max_clusters = max_clusters
+        self.claims = 0
+        self.dropped = 0
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """
+        MinHash signatures of several texts
+
+        Args:
+            texts: Claim texts
+
+        Returns:
+            Array of shape (len(texts), num_perm); texts without content
+            words share the signature of the empty shingle
+        """
+        hashed = []
+        offsets = []
+        for text in texts:
+            offsets.append(len(hashed))
+            found = shingles(text, self.ngram) or {""}
+            hashed.extend(zlib.crc32(shingle.encode()) for shingle in found)
+        x = np.array(hashed, dtype=np.uint64)
+        # Every permutation of every shingle, then the minimum per text
+        permuted = (self.a[:, None] * x[None, :] + self.b[:, None]) % np.uint64(PRIME)
+        return np.minimum.reduceat(permuted, offsets, axis=1).T.astype(np.uint32)
+
+    def band_keys(self, signatures: np.ndarray) -> List[List[int]]:
+        """LSH bucket key of every band of each signature"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        # Wrapping uint64 arithmetic is intended
+        return (bands * self.fold).sum(axis=2, dtype=np.uint64).tolist()
+
+    def candidates(self, keys: List[int]) -> List[int]:
+        """Clusters sharing a band with a signature"""
+        found = []
+        for buckets, key in zip(self.buckets, keys):
+            cluster_id = buckets.get(key)
+            if cluster_id is not None and cluster_id not in found:
+                found.append(cluster_id)
+        return found
+
+    def best_match(self, signature: np.ndarray, keys: List[int]) -> Optional[int]:
+        """Most similar candidate cluster reaching the threshold, if any"""
+        found = self.candidates(keys)
+        if not found:
+            return None
+        similarity = (self.leaders[found] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        return found[best] if similarity[best] >= self.threshold else None
+
+    def insert(self, text: str, signature: np.ndarray, keys: List[int]) -> int:
+        """Add a signed claim, joining the best cluster or starting one"""
+        self.claims += 1
+        cluster_id = self.best_match(signature, keys)
+        if cluster_id is not None:
+            self.sizes[cluster_id] += 1
+            self.last_seen[cluster_id] = self.claims
+            return cluster_id
+        cluster_id = len(self.labels)
+        if cluster_id == len(self.leaders):
+            self.leaders = np.concatenate([self.leaders, np.empty_like(self.leaders)])
+        self.leaders[cluster_id] = signature
+        self.labels.append(text)
+        self.sizes.append(1)
+        self.last_seen.append(self.claims)
+        for buckets, key in zip(self.buckets, keys):
+            buckets.setdefault(key, cluster_id)
+        return cluster_id
+
+    def add(self, text: str) -> int:
+        """
+        Add a claim
+
+        Args:
+            text: Claim text
+
+        Returns:
+            ID of the cluster it joined or started
+        """
+        return self.add_many([text])[0]
+
+    def add_many(self, texts: Iterable[str]) -> List[int]:
+        """
+        Add claims in order, signing them in vectorized batches
+
+        Args:
+            texts: Claim texts
+
+        Returns:
+            Cluster ID per claim, valid until the next prune()
+        """
+        texts = list(texts)
+        cluster_ids = []
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch = texts[start:start + BATCH_SIZE]
+            signatures = self.signatures(batch)
+            for text, signature, keys in zip(batch, signatures, self.band_keys(signatures)):
+                cluster_ids.append(self.insert(text, signature, keys))
+        return cluster_ids
+
+    def query(self, text: str) -> Optional[int]:
+        """Cluster a claim would join, without adding it"""
+        signature = self.signatures([text])
+        return self.best_match(signature[0], self.band_keys(signature)[0])
+
+    def prune(self) -> int:
+        """
+        Drop the least recently joined clusters once there are more than
+        max_clusters, keeping three quarters of max_clusters so the index
+        is rebuilt only now and then. Remaining clusters are renumbered
+
+        Returns:
+            Number of clusters dropped
+        """
+        if self.max_clusters is None or len(self.labels) <= self.max_clusters:
+            return 0
+        recent = np.argsort(np.frombuffer(self.last_seen, dtype=np.uint64), kind="stable")
+        kept = np.sort(recent[-(self.max_clusters * 3 // 4):])
+        dropped = len(self.labels) - len(kept)
+        self.leaders = self.leaders[kept]
+        self.labels = [self.labels[i] for i in kept]
+        self.sizes = array("I", (self.sizes[i] for i in kept))
+        self.last_seen = array("Q", (self.last_seen[i] for i in kept))
+        self.buckets = [{} for _ in range(self.bands)]
+        for cluster_id, keys in enumerate(self.band_keys(self.leaders)):
+            for buckets, key in zip(self.buckets, keys):
+                buckets.setdefault(key, cluster_id)
+        self.dropped += dropped
+        return dropped
+
+    def label(self, cluster_id: int) -> str:
+        """Text of the claim that started a cluster"""
+        return self.labels[cluster_id]
+
+    def cluster(self, texts: List[str]) -> Dict[str, List[str]]:
+        """
+        Add claims and group them by cluster, then prune
+
+        Args:
+            texts: Claim texts
+
+        Returns:
+            First claim of each cluster -> the given claims in it, largest
+            group first
+        """
+        groups: Dict[int, List[str]] = {}
+        for text, cluster_id in zip(texts, self.add_many(texts)):
+            groups.setdefault(cluster_id, []).append(text)
+        ordered = sorted(groups.items(), key=lambda item: -len(item[1]))
+        clusters = {self.label(cluster_id): members for cluster_id, members in ordered}
+        self.prune()
+        return clusters
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by signatures, buckets and labels"""
+        bucket_entries = sum(len(buckets) for buckets in self.buckets)
+        # A dict entry with its 64-bit int key is about 90 bytes
+        return (self.leaders.nbytes + bucket_entries * 90 + len(self.sizes) * (self.sizes.itemsize + self.last_seen.itemsize)
+                + sum(len(label) + 49 for label in self.labels) + len(self.labels) * 8)
+
+    def stats(self) -> Dict:
+        """
+        Clustering statistics
+
+        Returns:
+            Claims added, clusters kept and dropped, largest cluster and
+            memory estimate
+        """
+        return {
+            "claims": self.claims,
+            "clusters": len(self.labels),
+            "dropped_clusters": self.dropped,
+            "largest_cluster": max(self.sizes) if self.sizes else 0,
+            "memory_bytes": self.memory_bytes(),
+        }
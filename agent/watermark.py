@@ -0,0 +1,66 @@
+"""
+Durable high-water mark of the claims the agent has handled
+The agent asks the backend only for claims added after the mark, so each
+cycle reads new claims instead of the same first page again
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+STATE_DIR = "agent_state"
+
+
+class Watermark:
+    """
+    Highest claim ID (and its timestamp) below which every claim is handled
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: JSON file keeping the mark across restarts
+        """
+        self.path = Path(path)
+        self.last_id = 0
+        self.last_timestamp: Optional[str] = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Read the saved mark, starting from the beginning if there is none"""
+        try:
+            state = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable watermark {self.path}: {e}")
+            return
+        self.last_id = int(state.get("last_id", 0))
+        self.last_timestamp = state.get("last_timestamp")
+
+    def advance(self, claim: Dict):
+        """
+        Move the mark past a handled claim
+
+        Args:
+            claim: Claim with an ID above the mark
+        """
+        if claim.get("id", 0) > self.last_id:
+            self.last_id = claim["id"]
+            self.last_timestamp = claim.get("timestamp")
+            self.dirty = True
+
+    def save(self):
+        """Write the mark if it moved; a crash leaves the old or new file whole"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"last_id": self.last_id, "last_timestamp": self.last_timestamp}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.dirty = False
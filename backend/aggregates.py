@@ -0,0 +1,145 @@
+"""
+Incrementally maintained claim statistics
+Keeps running counters so /stats never has to scan the claims table
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+STAT_STATUSES = {
+    "TRUE": "verified_true",
+    "MISINFORMATION": "misinformation",
+    "PARTIALLY_TRUE": "partially_true",
+}
+
+BREAKDOWNS = ("category", "source")
+
+
+class Tally:
+    """Running claim count, per-status counts and trust score sum"""
+
+    __slots__ = ("total", "trust_sum", "by_status")
+
+    def __init__(self):
+        self.total = 0
+        self.trust_sum = 0
+        self.by_status: Dict[str, int] = {}
+
+    def apply(self, status: Optional[str], trust_score: Optional[int], count: int = 1):
+        """
+        Add (count > 0) or remove (count < 0) a claim from the tally
+
+        Args:
+            status: Claim status
+            trust_score: Claim trust score
+            count: +1 to add the claim, -1 to remove it
+        """
+        self.total += count
+        self.trust_sum += (trust_score or 0) * count
+        self.by_status[status] = self.by_status.get(status, 0) + count
+        if self.by_status[status] == 0:
+            del self.by_status[status]
+
+    def to_dict(self) -> Dict:
+        """
+        Render the tally in the /stats response shape
+
+        Returns:
+            Counts and average trust score
+        """
+        stats = {"total_claims": self.total}
+        for status, key in STAT_STATUSES.items():
+            stats[key] = self.by_status.get(status, 0)
+        stats["average_trust_score"] = self.trust_sum // self.total if self.total > 0 else 0
+        return stats
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Tally)
+            and self.total == other.total
+            and self.trust_sum == other.trust_sum
+            and self.by_status == other.by_status
+        )
+
+
+class ClaimStats:
+    """
+    Overall, per-category and per-source claim statistics
+    Updated in O(1) on every claim insert or change
+    """
+
+    def __init__(self):
+        self.overall = Tally()
+        self.breakdowns: Dict[str, Dict[str, Tally]] = {name: {} for name in BREAKDOWNS}
+
+    def _tallies(self, claim: Dict) -> Iterable[Tally]:
+        yield self.overall
+        for name, groups in self.breakdowns.items():
+            key = claim.get(name)
+            if key not in groups:
+                groups[key] = Tally()
+            yield groups[key]
+
+    def add(self, claim: Dict):
+        """Count a newly stored claim"""
+        for tally in self._tallies(claim):
+            tally.apply(claim.get("status"), claim.get("trust_score"))
+
+    def remove(self, claim: Dict):
+        """Stop counting a deleted or replaced claim"""
+        for tally in self._tallies(claim):
+            tally.apply(claim.get("status"), claim.get("trust_score"), -1)
+        for name, groups in self.breakdowns.items():
+            key = claim.get(name)
+            if groups[key].total == 0:
+                del groups[key]
+
+    def replace(self, old: Dict, new: Dict):
+        """
+        Move a claim's contribution from its old to its new values
+
+        Args:
+            old: Claim before the change
+            new: Claim after the change
+        """
+        self.remove(old)
+        self.add(new)
+
+    def load(self, rows: Iterable[Tuple]):
+        """
+        Reset counters from grouped storage totals
+
+        Args:
+            rows: (status, category, source, count, trust_sum) tuples
+        """
+        self.__init__()
+        for status, category, source, count, trust_sum in rows:
+            claim = {"category": category, "source": source}
+            for tally in self._tallies(claim):
+                tally.total += count
+                tally.trust_sum += trust_sum
+                tally.by_status[status] = tally.by_status.get(status, 0) + count
+
+    def snapshot(self, breakdown: Optional[str] = None) -> Dict:
+        """
+        Current statistics, optionally broken down by category or source
+
+        Args:
+            breakdown: "category", "source" or None
+
+        Returns:
+            Statistics dict
+        """
+        stats = self.overall.to_dict()
+        if breakdown:
+            stats[f"by_{breakdown}"] = {
+                key: tally.to_dict()
+                for key, tally in sorted(self.breakdowns[breakdown].items(), key=lambda item: str(item[0]))
+            }
+        return stats
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, ClaimStats)
+            and self.overall == other.overall
+            and self.breakdowns == other.breakdowns
+        )
@@ -0,0 +1,243 @@
+"""
+Persistent misinformation alerts
+Repeats of the same incident, the same claim at the same severity within
+the dedup window, are coalesced into one alert with an occurrence counter
+"""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from storage import decode_token, encode_token
+
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+DEDUP_SECONDS = 3600
+FANOUT_SECONDS = 60
+
+ALERT_COLUMNS = ("id", "claim_id", "title", "description", "severity", "platform", "status", "occurrences", "created_at", "last_seen_at")
+
+SELECT_ALERT = "SELECT id, claim_id, title, description, severity, platform, status, occurrences, created_at, last_seen_at FROM alerts WHERE id = ?"
+SELECT_OPEN_INCIDENT = "SELECT id FROM alerts WHERE claim_id = ? AND severity = ? AND last_seen_at >= ? ORDER BY last_seen_at DESC LIMIT 1"
+INSERT_ALERT = "INSERT INTO alerts (claim_id, title, description, severity, platform, status, occurrences, created_at, last_seen_at) VALUES (:claim_id, :title, :description, :severity, :platform, 'ACTIVE', 1, :seen_at, :seen_at)"
+COALESCE_ALERT = "UPDATE alerts SET occurrences = occurrences + 1, last_seen_at = :seen_at, description = :description WHERE id = :id"
+ALERT_FILTERS = ("severity", "status", "claim_id")
+
+
+def build_alert(data: Dict) -> Dict:
+    """
+    Normalize submitted alert data
+
+    Args:
+        data: Submitted alert fields
+
+    Returns:
+        Alert fields ready to be recorded
+
+    Raises:
+        ValueError: If severity or claim_id is invalid
+    """
+    severity = str(data.get("severity", "MEDIUM")).upper()
+    if severity not in SEVERITIES:
+        raise ValueError(f"Unknown severity: {data.get('severity')}")
+    claim_id = data.get("claim_id")
+    if claim_id is not None and (not isinstance(claim_id, int) or isinstance(claim_id, bool)):
+        raise ValueError("Field 'claim_id' must be an integer")
+    return {
+        "claim_id": claim_id,
+        "title": data.get("title", ""),
+        "description": data.get("description", ""),
+        "severity": severity,
+        "platform": data.get("platform", "Unknown"),
+    }
+
+
+def fetch_alert(conn: sqlite3.Connection, alert_id: int) -> Optional[Dict]:
+    """Get an alert by ID, or None if it does not exist"""
+    row = conn.execute(SELECT_ALERT, (alert_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def write_alerts(conn: sqlite3.Connection, alerts: List[Dict], seen_at: str, window_start: str) -> List[Tuple[Dict, bool]]:
+    """
+    Record alerts in one transaction, coalescing each into an open incident
+    when there is one
+
+    Alerts without a claim_id cannot be matched and always open a new
+    incident.
+
+    Args:
+        conn: Writer connection
+        alerts: Fields from build_alert()
+        seen_at: Time of this occurrence (ISO format)
+        window_start: Incidents last seen before this time are closed
+
+    Returns:
+        (stored alert, True if a new incident was opened) per alert
+    """
+    results = []
+    with conn:
+        for alert in alerts:
+            params = {**alert, "seen_at": seen_at}
+            row = None
+            if alert["claim_id"] is not None:
+                row = conn.execute(SELECT_OPEN_INCIDENT, (alert["claim_id"], alert["severity"], window_start)).fetchone()
+            if row is not None:
+                alert_id = row[0]
+                conn.execute(COALESCE_ALERT, {**params, "id": alert_id})
+            else:
+                alert_id = conn.execute(INSERT_ALERT, params).lastrowid
+            results.append((fetch_alert(conn, alert_id), row is None))
+    return results
+
+
+def fetch_alerts(conn: sqlite3.Connection, limit: int, before_id: Optional[int], filters: Dict) -> List[Dict]:
+    """
+    List alerts newest first, starting below an alert ID
+
+    Args:
+        conn: Database connection
+        limit: Maximum number of alerts
+        before_id: Only alerts with a smaller ID
+        filters: Exact-match filters on severity, status or claim_id
+
+    Returns:
+        Alert dicts
+    """
+    clauses, params = [], []
+    for name, value in filters.items():
+        if value is not None:
+            clauses.append(f"{name} = ?")
+            params.append(value)
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    sql = f"SELECT {', '.join(ALERT_COLUMNS)} FROM alerts"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+class AlertStore:
+    """
+    Alert repository with incident deduplication and rate-limited fan-out
+    """
+
+    def __init__(self, db, dedup_seconds: float = DEDUP_SECONDS, fanout_seconds: float = FANOUT_SECONDS):
+        """
+        Args:
+            db: Database holding the alerts table
+            dedup_seconds: Repeats within this long of an incident's last
+                occurrence are coalesced into it
+            fanout_seconds: Minimum interval between live updates for one
+                coalesced incident
+        """
+        self.db = db
+        self.dedup_seconds = dedup_seconds
+        self.fanout_seconds = fanout_seconds
+        self.last_published: Dict[int, float] = {}
+        self.created = 0
+        self.coalesced = 0
+
+    async def record(self, data: Dict) -> Tuple[Dict, bool, bool]:
+        """
+        Store an alert occurrence
+
+        Args:
+            data: Submitted alert fields
+
+        Returns:
+            (alert, True if a new incident was opened, True if the change
+            should be pushed to live subscribers)
+
+        Raises:
+            ValueError: If the alert data is invalid
+        """
+        return (await self.record_many([build_alert(data)]))[0]
+
+    async def record_many(self, alerts: List[Dict]) -> List[Tuple[Dict, bool, bool]]:
+        """
+        Store several alert occurrences in one transaction
+
+        Args:
+            alerts: Alerts already normalized by build_alert()
+
+        Returns:
+            (alert, created, publish) per alert, as for record()
+        """
+        if not alerts:
+            return []
+        now = datetime.now()
+        window_start = (now - timedelta(seconds=self.dedup_seconds)).isoformat()
+        stored = await self.db.write(write_alerts, alerts, now.isoformat(), window_start)
+
+        # Only new incidents always fan out; a repeating one is pushed at
+        # most once per fanout_seconds so its counter stays roughly live
+        clock = time.monotonic()
+        results = []
+        for alert, created in stored:
+            if created:
+                self.created += 1
+                publish = True
+            else:
+                self.coalesced += 1
+                publish = clock - self.last_published.get(alert["id"], 0.0) >= self.fanout_seconds
+            if publish:
+                self.last_published[alert["id"]] = clock
+            results.append((alert, created, publish))
+        if len(self.last_published) > 4096:
+            self._prune(clock)
+        return results
+
+    async def list(self, limit: int = 20, cursor: Optional[str] = None, session=None,
+                   **filters) -> Tuple[List[Dict], Optional[str]]:
+        """
+        List alerts newest first with cursor pagination
+
+        Args:
+            limit: Maximum number of alerts to return
+            cursor: Cursor from a previous page
+            session: Request ReadSession to reuse; a pooled connection otherwise
+            **filters: Exact-match filters on severity, status or claim_id
+
+        Returns:
+            (alerts, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor or a filter name is invalid
+        """
+        for name in filters:
+            if name not in ALERT_FILTERS:
+                raise ValueError(f"Unknown filter: {name}")
+        before_id = None
+        if cursor is not None:
+            tag, before_id = decode_token(cursor, str, int)
+            if tag != "alert":
+                raise ValueError("Invalid cursor")
+        args = (fetch_alerts, limit + 1, before_id, filters)
+        alerts = await (session.run(*args) if session is not None else self.db.read(*args))
+        next_cursor = None
+        if len(alerts) > limit:
+            alerts = alerts[:limit]
+            next_cursor = encode_token(["alert", alerts[-1]["id"]])
+        return alerts, next_cursor
+
+    def stats(self) -> Dict:
+        """
+        Alert statistics
+
+        Returns:
+            Incidents opened and repeats coalesced since startup
+        """
+        return {
+            "created": self.created,
+            "coalesced": self.coalesced,
+            "dedup_seconds": self.dedup_seconds
+        }
+
+    def _prune(self, clock: float):
+        horizon = clock - max(self.dedup_seconds, self.fanout_seconds)
+        for alert_id in [a for a, t in self.last_published.items() if t < horizon]:
+            del self.last_published[alert_id]
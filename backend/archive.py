@@ -0,0 +1,340 @@
+"""
+Time-partitioned claim archive
+Claims older than the retention horizon move out of the claims table into
+one compressed file per day, so the table, its indexes and every hot
+query only cover recent claims. A partition file is a series of gzip
+members, each a block of claims sorted by ID: the whole file reads as
+ordinary .ndjson.gz, while a lookup by ID decompresses just one block,
+found through the archive_blocks table
+"""
+
+import asyncio
+import gzip
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from changes import append_change
+from storage import CLAIM_COLUMNS
+
+RETENTION_DAYS = 30
+COMPACTION_SECONDS = 3600
+BLOCK_CLAIMS = 256
+
+SELECT_EXPIRED_DAYS = "SELECT DISTINCT substr(timestamp, 1, 10) FROM claims WHERE timestamp < ?"
+SELECT_DAY = f"SELECT {', '.join(CLAIM_COLUMNS)} FROM claims WHERE timestamp >= ? AND timestamp < ? ORDER BY id"
+DELETE_DAY_SUMMARIES = "DELETE FROM summaries WHERE claim_id IN (SELECT id FROM claims WHERE timestamp >= ? AND timestamp < ?)"
+DELETE_DAY = "DELETE FROM claims WHERE timestamp >= ? AND timestamp < ?"
+SELECT_PARTITION = "SELECT file FROM archive_partitions WHERE day = ?"
+UPSERT_PARTITION = "INSERT OR REPLACE INTO archive_partitions (day, file, claims, max_id, compacted_at) VALUES (?, ?, ?, ?, ?)"
+DELETE_BLOCKS = "DELETE FROM archive_blocks WHERE day = ?"
+INSERT_BLOCK = "INSERT INTO archive_blocks (day, first_id, last_id, offset, length) VALUES (?, ?, ?, ?, ?)"
+ADD_TOTALS = "INSERT INTO archive_totals (status, category, source, claims, trust_sum) VALUES (?, ?, ?, ?, ?) ON CONFLICT (status, category, source) DO UPDATE SET claims = claims + excluded.claims, trust_sum = trust_sum + excluded.trust_sum"
+SELECT_BLOCKS_FOR_ID = "SELECT p.file, b.offset, b.length FROM archive_blocks b JOIN archive_partitions p ON p.day = b.day WHERE b.first_id <= ? AND b.last_id >= ?"
+SUMMARIZE_PARTITIONS = "SELECT COUNT(*), COALESCE(SUM(claims), 0), MIN(day), MAX(day) FROM archive_partitions"
+
+logger = logging.getLogger("echosheild.archive")
+
+
+def read_partition(path: Path) -> Iterator[Dict]:
+    """Stream the claims of a partition file in ID order"""
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def write_partition(path: Path, claims: Iterator[Dict], block_claims: int = BLOCK_CLAIMS) -> List[Tuple[int, int, int, int]]:
+    """
+    Write claims, already in ID order, as a partition file
+
+    Args:
+        path: File to create
+        claims: Claims sorted by ID
+        block_claims: Claims per independently compressed block
+
+    Returns:
+        (first_id, last_id, offset, length) of every block
+    """
+    blocks = []
+    with open(path, "wb") as f:
+        lines: List[bytes] = []
+        first_id = last_id = None
+
+        def flush():
+            data = gzip.compress(b"".join(lines), mtime=0)
+            blocks.append((first_id, last_id, f.tell(), len(data)))
+            f.write(data)
+            lines.clear()
+
+        for claim in claims:
+            if not lines:
+                first_id = claim["id"]
+            last_id = claim["id"]
+            lines.append(json.dumps(claim, separators=(",", ":")).encode() + b"\n")
+            if len(lines) >= block_claims:
+                flush()
+        if lines:
+            flush()
+        f.flush()
+        os.fsync(f.fileno())
+    return blocks
+
+
+def day_range(day: str, cutoff: str) -> Tuple[str, str]:
+    """Timestamp bounds [start, end) of the expired part of a day"""
+    next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+    return day, min(next_day, cutoff)
+
+
+def expired_days(conn: sqlite3.Connection, cutoff: str) -> List[str]:
+    """Days holding claims older than cutoff, oldest first"""
+    days = []
+    for (day,) in conn.execute(SELECT_EXPIRED_DAYS, (cutoff,)):
+        try:
+            date.fromisoformat(day)
+        except (TypeError, ValueError):
+            # Claims with unparseable timestamps are never archived
+            continue
+        days.append(day)
+    return sorted(days)
+
+
+def archive_day(conn: sqlite3.Connection, archive_dir: Path, day: str, cutoff: str) -> int:
+    """
+    Move a day's expired claims into its partition file
+
+    New claims are merged with the existing partition into a freshly
+    named file; the index switches to it in the same transaction that
+    deletes the rows, so a crash leaves either the old or the new state.
+
+    Args:
+        conn: Writer connection
+        archive_dir: Directory holding partition files
+        day: Partition day (YYYY-MM-DD)
+        cutoff: Retention horizon; only older claims move
+
+    Returns:
+        Number of claims archived
+    """
+    start, end = day_range(day, cutoff)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    new_file = archive_dir / f"claims-{day}-{time.time_ns():x}.ndjson.gz"
+    old_file = None
+    moved = 0
+    totals: Dict[Tuple, List[int]] = {}
+
+    def expiring() -> Iterator[Dict]:
+        nonlocal moved
+        for row in conn.execute(SELECT_DAY, (start, end)):
+            claim = dict(row)
+            moved += 1
+            tally = totals.setdefault((claim["status"], claim["category"], claim["source"]), [0, 0])
+            tally[0] += 1
+            tally[1] += claim["trust_score"] or 0
+            yield claim
+
+    # Archived claims keep their verification history, which references
+    # them by ID, so foreign keys are off while their rows are removed
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(SELECT_PARTITION, (day,)).fetchone()
+            existing: Iterator[Dict] = iter(())
+            if row is not None:
+                old_file = archive_dir / row[0]
+                existing = read_partition(old_file)
+
+            # Both inputs are sorted by ID; on a repeated ID the live row wins
+            def merged() -> Iterator[Dict]:
+                last = None
+                for claim in heapq.merge(expiring(), existing, key=lambda c: c["id"]):
+                    if claim["id"] != last:
+                        last = claim["id"]
+                        yield claim
+
+            count = 0
+
+            def counted() -> Iterator[Dict]:
+                nonlocal count
+                for claim in merged():
+                    count += 1
+                    yield claim
+
+            blocks = write_partition(new_file, counted())
+            if moved == 0:
+                conn.rollback()
+                new_file.unlink()
+                return 0
+            conn.execute(DELETE_BLOCKS, (day,))
+            conn.executemany(INSERT_BLOCK, [(day, *block) for block in blocks])
+            conn.execute(UPSERT_PARTITION, (day, new_file.name, count, blocks[-1][1], datetime.now().isoformat()))
+            conn.executemany(ADD_TOTALS, [(*key, n, trust) for key, (n, trust) in totals.items()])
+            conn.execute(DELETE_DAY_SUMMARIES, (start, end))
+            conn.execute(DELETE_DAY, (start, end))
+            append_change(conn, "claims_archived", {"day": day, "claims": moved})
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            new_file.unlink(missing_ok=True)
+            raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+    if old_file is not None:
+        old_file.unlink(missing_ok=True)
+    return moved
+
+
+def optimize_hot(conn: sqlite3.Connection):
+    """Merge full-text index segments and checkpoint after rows were removed"""
+    with conn:
+        conn.execute("INSERT INTO claims_fts(claims_fts, rank) VALUES ('merge', 500)")
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+def fetch_archived_claim(conn: sqlite3.Connection, archive_dir: Path, claim_id: int) -> Optional[Dict]:
+    """
+    Read one archived claim by decompressing only the block holding it
+
+    Args:
+        conn: Database connection
+        archive_dir: Directory holding partition files
+        claim_id: ID of the claim
+
+    Returns:
+        Claim dict, or None if it is not archived
+    """
+    for file, offset, length in conn.execute(SELECT_BLOCKS_FOR_ID, (claim_id, claim_id)).fetchall():
+        with open(archive_dir / file, "rb") as f:
+            f.seek(offset)
+            block = gzip.decompress(f.read(length))
+        for line in block.splitlines():
+            claim = json.loads(line)
+            if claim["id"] == claim_id:
+                return claim
+    return None
+
+
+def summarize_partitions(conn: sqlite3.Connection) -> Tuple:
+    """(partitions, archived claims, oldest day, newest day)"""
+    return tuple(conn.execute(SUMMARIZE_PARTITIONS).fetchone())
+
+
+class ClaimArchiver:
+    """
+    Background compaction moving expired claims into the archive
+    """
+
+    def __init__(self, db, store, archive_dir: Union[str, Path], retention_days: int = RETENTION_DAYS,
+                 interval: float = COMPACTION_SECONDS):
+        """
+        Args:
+            db: Database holding the claims table
+            store: ClaimStore whose data version changes when claims move
+            archive_dir: Directory for partition files
+            retention_days: Claims older than this many days are archived;
+                0 keeps every claim in the table
+            interval: Seconds between background compaction runs
+        """
+        self.db = db
+        self.store = store
+        self.archive_dir = Path(archive_dir)
+        self.retention_days = retention_days
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+        self.archived = 0
+        self.runs = 0
+        self.last_run: Optional[str] = None
+
+    async def compact(self) -> Dict:
+        """
+        Archive every claim older than the retention horizon, one day
+        partition per write so other writes interleave
+
+        Returns:
+            Claims archived and partitions touched by this run
+        """
+        if self.retention_days <= 0:
+            return {"archived": 0, "partitions": 0}
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        days = await self.db.write(expired_days, cutoff)
+        archived = 0
+        for day in days:
+            archived += await self.db.write(archive_day, self.archive_dir, day, cutoff)
+        if archived:
+            await self.db.write(optimize_hot)
+            # All-time statistics are unchanged, but listings are not
+            await self.store.changed()
+        self.archived += archived
+        self.runs += 1
+        self.last_run = datetime.now().isoformat()
+        return {"archived": archived, "partitions": len(days)}
+
+    async def get(self, claim_id: int, session=None) -> Optional[Dict]:
+        """
+        Get an archived claim by ID
+
+        Args:
+            claim_id: ID of the claim
+            session: Request ReadSession to reuse; a pooled connection otherwise
+
+        Returns:
+            Claim dict, or None if it is not archived
+        """
+        args = (fetch_archived_claim, self.archive_dir, claim_id)
+        return await (session.run(*args) if session is not None else self.db.read(*args))
+
+    def start(self):
+        """Start periodic compaction on the running event loop, first run after one interval"""
+        if self.task is None and self.retention_days > 0:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            # Startup stays fast, and a database nothing has opened yet
+            # is left closed
+            await asyncio.sleep(self.interval)
+            if not self.db.opened:
+                continue
+            try:
+                result = await self.compact()
+                if result["archived"]:
+                    logger.info("Archived %d claims from %d partitions", result["archived"], result["partitions"])
+            except Exception:
+                logger.exception("Claim compaction failed")
+
+    async def close(self):
+        """Stop periodic compaction, letting a running partition finish"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def stats(self) -> Dict:
+        """
+        Archive statistics
+
+        Returns:
+            Retention setting, partition summary and compaction counters
+        """
+        partitions, claims, oldest, newest = await self.db.read(summarize_partitions)
+        return {
+            "retention_days": self.retention_days,
+            "partitions": partitions,
+            "archived_claims": claims,
+            "oldest_partition": oldest,
+            "newest_partition": newest,
+            "archived_since_start": self.archived,
+            "compaction_runs": self.runs,
+            "last_run": self.last_run
+        }
@@ -0,0 +1,134 @@
+"""
+Benchmark: serverless cold start
+
+Measures, in fresh interpreters with SERVERLESS=true:
+
+  import      wall time of `import main`, plus a per-module breakdown from
+              python -X importtime (self and cumulative microseconds)
+  first       latency of the first /health request (must not open the
+              database) and of the first /claims request (opens, migrates
+              if needed and loads the in-memory indexes)
+
+Each measurement runs twice against the same database file, so the
+second run shows a warm file: no DDL, no seeding.
+
+Exits non-zero when the cold import exceeds --budget-ms, so it can gate CI.
+
+Usage (from backend/):
+    python benchmarks/cold_start.py [--budget-ms 500] [--top 15] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter: import the app, then serve two requests
+# in-process without lifespan events, as a serverless adapter would
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter() - started
+
+async def first_requests():
+    import httpx
+    timings = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://cold") as client:
+        for name, path in (("health", "/health"), ("claims", "/claims?limit=10")):
+            t0 = time.perf_counter()
+            response = await client.get(path)
+            timings[name] = (time.perf_counter() - t0, response.status_code)
+            if name == "health":
+                timings["opened_by_health"] = main.db.opened
+    return timings
+
+timings = asyncio.run(first_requests())
+print(json.dumps({
+    "import_ms": round(imported * 1000, 2),
+    "first_health_ms": round(timings["health"][0] * 1000, 2),
+    "first_claims_ms": round(timings["claims"][0] * 1000, 2),
+    "claims_status": timings["claims"][1],
+    "health_opened_db": timings["opened_by_health"],
+}))
+"""
+
+
+def parse_importtime(stderr: str, top: int) -> List[Dict]:
+    """
+    Parse `python -X importtime` output into the slowest modules
+
+    Args:
+        stderr: Captured stderr of the child
+        top: Number of modules to keep
+
+    Returns:
+        Modules sorted by cumulative import time, slowest first
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    modules.sort(key=lambda m: m["cumulative_us"], reverse=True)
+    return modules[:top]
+
+
+def run_child(db_path: str, importtime: bool) -> subprocess.CompletedProcess:
+    """Run the child script, or just `import main` under -X importtime, in a fresh interpreter"""
+    env = {**os.environ, "SERVERLESS": "true", "DB_PATH": db_path}
+    command = [sys.executable, "-X", "importtime", "-c", "import main"] if importtime else [sys.executable, "-c", CHILD]
+    return subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="fail if the cold import takes longer")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to report")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "cold.db")
+    runs = {}
+    for label in ("new_database", "existing_database"):
+        runs[label] = json.loads(run_child(db_path, importtime=False).stdout.strip().splitlines()[-1])
+        r = runs[label]
+        print(f"{label:<18} import {r['import_ms']:>8.2f} ms   first /health {r['first_health_ms']:>7.2f} ms"
+              f"   first /claims {r['first_claims_ms']:>8.2f} ms")
+
+    profile = parse_importtime(run_child(db_path, importtime=True).stderr, args.top)
+    print(f"\n{'cumulative ms':>13} {'self ms':>9}  module")
+    for m in profile:
+        print(f"{m['cumulative_us'] / 1000:>13.2f} {m['self_us'] / 1000:>9.2f}  {m['module']}")
+
+    cold_import = runs["new_database"]["import_ms"]
+    within_budget = cold_import <= args.budget_ms
+    print(f"\ncold import {cold_import:.2f} ms, budget {args.budget_ms:.0f} ms: {'OK' if within_budget else 'OVER'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "cold_start",
+            "budget_ms": args.budget_ms,
+            "within_budget": within_budget,
+            "runs": runs,
+            "slowest_imports": profile,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == "__main__":
+    main()
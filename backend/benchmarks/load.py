@@ -0,0 +1,321 @@
+"""
+Benchmark: end-to-end request latency and throughput at scale
+
+Seeds a database with synthetic claims, then drives the app in-process
+through an ASGI client (no sockets) and reports p50/p99 latency and
+throughput per scenario:
+
+  claims_page     GET /claims?limit=50, sometimes filtered by category
+  claim_by_id     GET /claims/{id} for random IDs
+  stats           GET /stats
+  trends          GET /trends, windowed and all-time
+  summaries       GET /summaries/{id} in a random language
+  create_claim    POST /claims
+
+Synthetic claims follow skewed, realistic distributions: weighted
+categories and sources, Pareto engagement, and timestamps concentrated
+in the last few days. Everything is driven by --seed, so runs are
+reproducible and their JSON output can be diffed between versions.
+
+Usage (from backend/):
+    python benchmarks/load.py [--scale 10k] [--json out.json]
+    python benchmarks/load.py --scale 10k 1m 10m --json out.json
+    python benchmarks/load.py --claims 250000 --db /tmp/bench.db   (reuse a seeded file)
+
+Each scale runs in its own process so the app starts cold on its own
+database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+SEED_CHUNK = 50_000
+
+CATEGORIES = {"Health": 25, "Politics": 25, "Technology": 18, "Environment": 12, "Science": 10, "Finance": 10}
+SOURCES = {"Twitter": 35, "Facebook": 25, "News Article": 15, "Reddit": 12, "TikTok": 10, "Research Paper": 3}
+STATUSES = {"MISINFORMATION": 45, "PARTIALLY_TRUE": 30, "TRUE": 25}
+TRUST_RANGES = {"MISINFORMATION": (0, 30), "PARTIALLY_TRUE": (31, 70), "TRUE": (71, 100)}
+SUBJECTS = ["A new vaccine", "5G technology", "The central bank", "Climate scientists", "A viral video",
+            "The election commission", "Renewable energy", "A leaked memo", "Social media apps", "Tap water"]
+VERBS = ["causes", "prevents", "secretly funds", "was banned for", "doubles the risk of", "has no link to",
+         "is being replaced by", "will end", "was proven to cure", "is hiding data about"]
+OBJECTS = ["autism", "infections", "inflation", "power outages", "memory loss", "crop failures",
+           "the next pandemic", "vote counts", "cancer", "wildfires"]
+LANGUAGES = ["en", "es", "fr", "hi"]
+
+
+def weighted(rng: random.Random, table: Dict[str, int], k: int) -> List[str]:
+    """Draw k values from a {value: weight} table"""
+    return rng.choices(list(table), weights=list(table.values()), k=k)
+
+
+def synthetic_claims(rng: random.Random, count: int, now: datetime) -> List[Dict]:
+    """
+    Generate synthetic claims
+
+    Args:
+        rng: Seeded random generator
+        count: Number of claims
+        now: Reference time; timestamps fall before it
+
+    Returns:
+        Claim dicts without IDs
+    """
+    statuses = weighted(rng, STATUSES, count)
+    categories = weighted(rng, CATEGORIES, count)
+    sources = weighted(rng, SOURCES, count)
+    claims = []
+    for status, category, source in zip(statuses, categories, sources):
+        # Most claims are recent; the tail reaches back about three months
+        age = min(rng.expovariate(1 / (3 * 86400)), 90 * 86400)
+        low, high = TRUST_RANGES[status]
+        claims.append({
+            "claim": f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}",
+            "source": source,
+            "timestamp": (now - timedelta(seconds=age)).isoformat(),
+            "trust_score": rng.randint(low, high),
+            "status": status,
+            "category": category,
+            # A few claims go viral, most barely spread
+            "engagement": min(int(rng.paretovariate(1.2) * 40), 5_000_000),
+        })
+    return claims
+
+
+def seed_database(db_path: str, count: int, rng: random.Random) -> float:
+    """
+    Fill a database with count synthetic claims unless it already has them
+
+    Args:
+        db_path: SQLite file
+        count: Claims wanted
+        rng: Seeded random generator
+
+    Returns:
+        Seconds spent seeding (0 when the file was reused)
+    """
+    from storage import connect, count_claims, init_db, write_claims
+
+    conn = connect(db_path)
+    init_db(conn)
+    existing = count_claims(conn)
+    if existing >= count:
+        conn.close()
+        return 0.0
+    started = time.perf_counter()
+    now = datetime.now()
+    for offset in range(existing, count, SEED_CHUNK):
+        # Synthetic texts repeat by design; keep every row rather than merge reposts
+        write_claims(conn, synthetic_claims(rng, min(SEED_CHUNK, count - offset), now), dedup=False)
+        print(f"  seeded {min(offset + SEED_CHUNK, count):,}/{count:,}", end="\r", flush=True)
+    conn.execute("PRAGMA optimize")
+    conn.close()
+    print()
+    return time.perf_counter() - started
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict:
+    """Latency percentiles (ms) and throughput for one scenario"""
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1),
+    }
+
+
+async def drive(client, make_request: Callable, requests: int, concurrency: int) -> Dict:
+    """
+    Issue requests from concurrency workers and time each one
+
+    Args:
+        client: httpx.AsyncClient bound to the app
+        make_request: Called with (client, i); returns the request coroutine
+        requests: Total requests
+        concurrency: Requests in flight at once
+
+    Returns:
+        summarize() result
+    """
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < requests:
+            i = issued
+            issued += 1
+            t0 = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                errors += 1
+            # Requests served from memory never suspend in-process, so a
+            # worker would otherwise starve tasks waiting on database
+            # threads; over a real socket every request yields
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def scenarios(rng: random.Random, max_id: int) -> Dict[str, Callable]:
+    """Request factories for each benchmarked scenario"""
+    categories = list(CATEGORIES)
+    now = datetime.now()
+
+    def claims_page(client, i):
+        params = {"limit": 50}
+        if i % 3 == 0:
+            params["category"] = rng.choice(categories)
+        if i % 5 == 0:
+            # Pages below the first, as a scrolling client would ask for
+            params["until"] = (now - timedelta(hours=rng.randint(1, 72))).isoformat()
+        return client.get("/claims", params=params)
+
+    def trends(client, i):
+        window = [None, "15m", "1h", "24h"][i % 4]
+        return client.get("/trends", params={"window": window} if window else {})
+
+    return {
+        "claims_page": claims_page,
+        "claim_by_id": lambda client, i: client.get(f"/claims/{rng.randint(1, max_id)}"),
+        "stats": lambda client, i: client.get("/stats", params={"breakdown": "category"} if i % 2 else {}),
+        "trends": trends,
+        "summaries": lambda client, i: client.get(f"/summaries/{rng.randint(1, max_id)}",
+                                                  params={"language": rng.choice(LANGUAGES)}),
+        "create_claim": lambda client, i: client.post("/claims", json={
+            "claim": f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}",
+            "source": rng.choice(list(SOURCES)),
+            "category": rng.choice(categories),
+        }),
+    }
+
+
+async def run_scenarios(app, max_id: int, requests: int, concurrency: int, rng: random.Random,
+                        only: List[str]) -> Dict:
+    """Run every selected scenario against the app, one after another"""
+    import httpx
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, make_request in scenarios(rng, max_id).items():
+                if only and name not in only:
+                    continue
+                # Short warm-up so one-off costs (statement preparation,
+                # first summaries) do not land in the percentiles
+                await drive(client, make_request, min(50, requests), concurrency)
+                results[name] = await drive(client, make_request, requests, concurrency)
+                r = results[name]
+                print(f"  {name:<14} p50 {r['p50_ms']:>9.3f} ms   p99 {r['p99_ms']:>9.3f} ms   "
+                      f"{r['throughput_rps']:>9.1f} req/s   errors {r['errors']}")
+    return results
+
+
+def git_revision() -> str:
+    """Current commit, so results can be matched to the code they measured"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_one(args, claims: int) -> Dict:
+    """Seed, start the app on the seeded file and run the scenarios"""
+    rng = random.Random(args.seed)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    print(f"{claims:,} claims ({db_path})")
+    seed_seconds = seed_database(db_path, claims, rng)
+
+    # main reads DB_PATH at import; with claims present it skips its mock seed
+    os.environ["DB_PATH"] = db_path
+    started = time.perf_counter()
+    from main import app, store
+    startup_seconds = time.perf_counter() - started
+    max_id = store.stats.overall.total
+
+    results = asyncio.run(run_scenarios(app, max_id, args.requests, args.concurrency, rng, args.only))
+    return {
+        "claims": claims,
+        "seed_seconds": round(seed_seconds, 2),
+        "startup_seconds": round(startup_seconds, 3),
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=["10k"], help="claim counts to benchmark")
+    parser.add_argument("--claims", type=int, help="exact claim count, instead of --scale")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight at once")
+    parser.add_argument("--only", nargs="+", default=[], help="run only these scenarios")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for data and requests")
+    parser.add_argument("--db", help="database file to seed or reuse (single scale only)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    counts = [args.claims] if args.claims else [SCALES[name] for name in args.scale]
+    if len(counts) == 1:
+        runs = [run_one(args, counts[0])]
+    else:
+        if args.db:
+            parser.error("--db works with a single scale only")
+        # The app is a module-level singleton, so each scale gets a fresh process
+        runs = []
+        for count in counts:
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as out:
+                child_json = out.name
+            command = [sys.executable, __file__, "--claims", str(count), "--requests", str(args.requests),
+                       "--concurrency", str(args.concurrency), "--seed", str(args.seed), "--json", child_json]
+            if args.only:
+                command += ["--only", *args.only]
+            subprocess.run(command, check=True)
+            runs += json.loads(Path(child_json).read_text())["runs"]
+            os.unlink(child_json)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "load",
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "runs": runs,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: GET /claims serialization paths
+
+Compares, per page size, the cost of turning a page of stored claims into
+response bytes:
+
+  response_model  rows -> dicts -> per-item ClaimResponse validation ->
+                  jsonable_encoder -> json.dumps (FastAPI's response_model path)
+  validated       rows -> dicts -> TypeAdapter validate + dump_json
+  fast            SQLite json_object() rows joined into one array (list_json)
+
+Usage (from backend/):
+    python benchmarks/serialization.py [--claims 20000] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+PAGE_SIZES = [10, 100, 1000, 10000]
+
+
+def seed(conn, count: int):
+    """Insert synthetic claims into an empty database"""
+    from storage import write_claims
+    now = datetime.now()
+    statuses = ["TRUE", "MISINFORMATION", "PARTIALLY_TRUE"]
+    write_claims(conn, [
+        {
+            "claim": f"Synthetic claim number {i} about a developing story",
+            "source": random.choice(["Twitter", "Facebook", "News Article"]),
+            "timestamp": (now - timedelta(seconds=i)).isoformat(),
+            "trust_score": random.randint(0, 100),
+            "status": random.choice(statuses),
+            "category": random.choice(["Health", "Technology", "Politics"]),
+            "engagement": random.randint(0, 50000),
+        }
+        for i in range(count)
+    ])
+
+
+def measure(fn: Callable[[], bytes], min_seconds: float = 0.3) -> Dict:
+    """Run fn repeatedly and report the median call time"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < 5 or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median_ms": round(statistics.median(times) * 1000, 4), "runs": len(times)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=20000, help="claims to seed")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from main import ClaimResponse
+    from storage import CLAIM_COLUMNS, CLAIM_JSON, build_page_query, connect, fetch_page, fetch_rows, init_db
+
+    # Queries run directly on one connection: the pool's thread hop is the
+    # same for every path and would only blur the serialization cost
+    conn = connect(os.environ["DB_PATH"])
+    init_db(conn)
+    seed(conn, args.claims)
+    claim_list = TypeAdapter(List[ClaimResponse])
+
+    def rows(n):
+        return fetch_page(conn, *build_page_query(", ".join(CLAIM_COLUMNS), n, None, 0, None, None, {}))
+
+    def rows_json(n):
+        page = fetch_rows(conn, *build_page_query(f"id, timestamp, {CLAIM_JSON}", n, None, 0, None, None, {}))
+        return ("[" + ",".join(row[2] for row in page) + "]").encode()
+
+    paths = {
+        "response_model": lambda n: json.dumps(jsonable_encoder(
+            [ClaimResponse.model_validate(c) for c in rows(n)]
+        )).encode(),
+        "validated": lambda n: claim_list.dump_json(claim_list.validate_python(rows(n))),
+        "fast": rows_json,
+    }
+
+    results = []
+    print(f"{'page':>6} " + " ".join(f"{name:>16}" for name in paths) + "   speedup")
+    for size in PAGE_SIZES:
+        row = {"page_size": size}
+        for name, fn in paths.items():
+            row[name] = measure(lambda: fn(size))
+        row["speedup_vs_response_model"] = round(row["response_model"]["median_ms"] / row["fast"]["median_ms"], 2)
+        results.append(row)
+        print(f"{size:>6} " + " ".join(f"{row[name]['median_ms']:>13.3f} ms" for name in paths)
+              + f"   {row['speedup_vs_response_model']:>6.2f}x")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "serialization",
+            "claims": args.claims,
+            "results": results,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
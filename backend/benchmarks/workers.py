@@ -0,0 +1,167 @@
+"""
+Benchmark: read throughput against the number of uvicorn workers
+
+Starts `uvicorn main:app --workers N` on a seeded database for each N,
+then saturates it over real sockets from several client processes and
+reports requests per second and p50/p99 latency for a read mix:
+
+  claim_by_id     GET /claims/{id} for random IDs
+  claims_page     GET /claims?limit=20
+  stats           GET /stats
+
+Workers share state through the database and its change log, so reads
+should scale close to linearly until the cores run out; clients get their
+own processes so they are not the bottleneck. Before measuring, a claim
+is written through one worker and every worker is checked to report it.
+
+Usage (from backend/):
+    python benchmarks/workers.py [--workers 1 2 4] [--claims 100000] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "benchmarks"))
+
+
+def client(args) -> List[float]:
+    """Issue requests from one client process; returns latencies in seconds"""
+    import httpx
+
+    base_url, max_id, seconds, concurrency, seed = args
+    rng = random.Random(seed)
+    latencies: List[float] = []
+
+    async def worker(http):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            path = f"/claims/{rng.randint(1, max_id)}" if roll < 0.6 else "/claims?limit=20" if roll < 0.85 else "/stats"
+            t0 = time.perf_counter()
+            response = await http.get(path)
+            if response.status_code < 400:
+                latencies.append(time.perf_counter() - t0)
+
+    async def run():
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as http:
+            await asyncio.gather(*[worker(http) for _ in range(concurrency)])
+
+    asyncio.run(run())
+    return latencies
+
+
+def wait_ready(base_url: str, workers: int, timeout: float = 60.0):
+    """Wait until every worker answers, told apart by their change feed origin"""
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    seen = set()
+    while time.monotonic() < deadline:
+        try:
+            # A fresh connection per request lets the kernel pick any worker
+            seen.add(httpx.get(f"{base_url}/changes/stats").json()["origin"])
+        except httpx.HTTPError:
+            time.sleep(0.2)
+            continue
+        if len(seen) >= workers:
+            return
+    raise RuntimeError(f"only {len(seen)} of {workers} workers answered")
+
+
+def check_propagation(base_url: str, workers: int) -> float:
+    """Write through one worker and time until every worker counts the claim"""
+    import httpx
+
+    before = httpx.get(f"{base_url}/stats").json()["total_claims"]
+    httpx.post(f"{base_url}/claims", json={"claim": "propagation probe", "source": "Benchmark", "category": "Science"})
+    started = time.perf_counter()
+    while time.perf_counter() - started < 10:
+        totals = {httpx.get(f"{base_url}/stats").json()["total_claims"] for _ in range(workers * 4)}
+        if totals == {before + 1}:
+            return time.perf_counter() - started
+        time.sleep(0.01)
+    raise RuntimeError("claim did not reach every worker")
+
+
+def run_workers(args, db_path: str, workers: int, port: int) -> Dict:
+    """Start the server with a worker count and measure it"""
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "DB_PATH": db_path, "CLAIM_RETENTION_DAYS": "0"}
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--workers", str(workers),
+                               "--port", str(port), "--log-level", "warning"], cwd=BACKEND_DIR, env=env)
+    try:
+        wait_ready(base_url, workers)
+        propagation = check_propagation(base_url, workers)
+        jobs = [(base_url, args.claims, args.seconds, args.concurrency, args.seed + i) for i in range(args.clients)]
+        with Pool(args.clients) as pool:
+            latencies = sorted(l for batch in pool.map(client, jobs) for l in batch)
+    finally:
+        server.terminate()
+        server.wait()
+
+    def percentile(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / args.seconds, 1),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "propagation_ms": round(propagation * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to compare")
+    parser.add_argument("--claims", type=int, default=100_000, help="claims to seed")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measurement time per worker count")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 4, help="client processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per client process")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    from load import seed_database
+
+    db_path = os.path.join(tempfile.mkdtemp(), "workers.db")
+    print(f"seeding {args.claims:,} claims ({db_path})")
+    seed_database(db_path, args.claims, random.Random(args.seed))
+
+    runs = []
+    for workers in args.workers:
+        r = run_workers(args, db_path, workers, args.port)
+        runs.append(r)
+        scaling = r["throughput_rps"] / runs[0]["throughput_rps"] * runs[0]["workers"]
+        print(f"  {workers:>2} workers  {r['throughput_rps']:>9.1f} req/s ({scaling:4.2f}x)   p50 {r['p50_ms']:>8.3f} ms"
+              f"   p99 {r['p99_ms']:>8.3f} ms   write visible everywhere after {r['propagation_ms']:.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "benchmark": "workers",
+            "claims": args.claims,
+            "clients": args.clients,
+            "concurrency": args.concurrency,
+            "runs": runs,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
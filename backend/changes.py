@@ -0,0 +1,237 @@
+"""
+Change log shared by every worker process
+Writes append a row describing what changed, in the same transaction as
+the data, to the changes table. Each worker tails the table and applies
+changes made by the others to its in-memory state, so counters, indexes,
+caches and live streams stay in step across `uvicorn --workers N`
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Identifies this process in the change log; a worker skips its own changes,
+# which it applied when making them, except kinds it follows
+ORIGIN = uuid.uuid4().hex
+
+POLL_SECONDS = 0.1
+RETENTION_SECONDS = 300
+PRUNE_SECONDS = 60
+FETCH_LIMIT = 1000
+
+INSERT_CHANGE = "INSERT INTO changes (origin, kind, payload, created_at) VALUES (?, ?, ?, ?)"
+SELECT_CHANGES = "SELECT id, origin, kind, payload FROM changes WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+LATEST_CHANGE = "SELECT COALESCE(MAX(id), 0) FROM changes"
+PRUNE_CHANGES = "DELETE FROM changes WHERE created_at < ?"
+
+Change = Tuple[int, str, str, str]
+
+logger = logging.getLogger("echosheild.changes")
+
+
+def append_change(conn: sqlite3.Connection, kind: str, payload: Dict) -> int:
+    """
+    Record a change; call inside the transaction making it
+
+    Args:
+        conn: Writer connection
+        kind: Change kind, dispatched to the handlers subscribed to it
+        payload: JSON-serializable description of the change
+
+    Returns:
+        ID of the change, the same for every worker
+    """
+    return conn.execute(INSERT_CHANGE, (ORIGIN, kind, json.dumps(payload, default=str, separators=(",", ":")),
+                                        datetime.now().isoformat())).lastrowid
+
+
+def write_changes(conn: sqlite3.Connection, changes: List[Tuple[str, Dict]]) -> List[int]:
+    """Record several changes in their own transaction, returning their IDs"""
+    with conn:
+        return [append_change(conn, kind, payload) for kind, payload in changes]
+
+
+def latest_change_id(conn: sqlite3.Connection) -> int:
+    """ID of the newest change, 0 if there is none"""
+    return conn.execute(LATEST_CHANGE).fetchone()[0]
+
+
+def fetch_changes(conn: sqlite3.Connection, after_id: int, until_id: Optional[int] = None,
+                  limit: int = FETCH_LIMIT) -> List[Change]:
+    """Changes after an ID, oldest first, as (id, origin, kind, payload JSON)"""
+    rows = conn.execute(SELECT_CHANGES, (after_id, until_id if until_id is not None else 2 ** 63 - 1, limit))
+    return [tuple(row) for row in rows]
+
+
+def prune_changes(conn: sqlite3.Connection, before: str):
+    """Delete changes recorded before a time"""
+    with conn:
+        conn.execute(PRUNE_CHANGES, (before,))
+
+
+class ChangeFeed:
+    """
+    Tails the change log, dispatching other workers' changes to handlers
+    and relaying live events through it, so every worker numbers an event
+    by its change ID
+    """
+
+    def __init__(self, db, poll_seconds: float = POLL_SECONDS, retention_seconds: float = RETENTION_SECONDS):
+        """
+        Args:
+            db: Database holding the changes table
+            poll_seconds: Interval between checks for new changes, the
+                longest another worker lags behind this one
+            retention_seconds: Changes older than this are pruned; a worker
+                lagging further behind resynchronizes from the tables
+        """
+        self.db = db
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self.position = 0
+        self.handlers: Dict[str, Callable[[Dict], None]] = {}
+        self.followers: Dict[str, Callable[[int, Dict], None]] = {}
+        self.resync: Optional[Callable[[], "asyncio.Future"]] = None
+        self.outbox: List[Tuple[str, Dict, asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+        self.last_prune = 0.0
+        self.applied = 0
+        self.relayed = 0
+        self.resyncs = 0
+
+    def subscribe(self, kind: str, handler: Callable[[Dict], None]):
+        """
+        Handle changes of a kind made by other workers
+
+        Args:
+            kind: Change kind
+            handler: Called on the event loop with the change payload
+        """
+        self.handlers[kind] = handler
+
+    def follow(self, kind: str, handler: Callable[[int, Dict], None]):
+        """
+        Handle every change of a kind, this worker's own included, in log order
+
+        Args:
+            kind: Change kind
+            handler: Called on the event loop with the change ID and payload
+        """
+        self.followers[kind] = handler
+
+    def relay(self, kind: str, payload: Dict) -> asyncio.Future:
+        """
+        Queue a change that only needs to reach followers, written on the next poll
+
+        Args:
+            kind: Change kind
+            payload: JSON-serializable description of the change
+
+        Returns:
+            Future resolved with the change ID once written, cancelled if
+            the write fails
+        """
+        written = asyncio.get_running_loop().create_future()
+        self.outbox.append((kind, payload, written))
+        return written
+
+    async def flush(self):
+        """Write queued relayed changes"""
+        if not self.outbox:
+            return
+        outbox, self.outbox = self.outbox, []
+        try:
+            change_ids = await self.db.write(write_changes, [(kind, payload) for kind, payload, _ in outbox])
+        except BaseException:
+            for _, _, written in outbox:
+                written.cancel()
+            raise
+        self.relayed += len(outbox)
+        for (_, _, written), change_id in zip(outbox, change_ids):
+            if not written.done():
+                written.set_result(change_id)
+
+    async def sync(self, until_id: Optional[int] = None):
+        """
+        Write relayed changes, then apply every new change from other workers
+
+        Args:
+            until_id: Stop after this change instead of at the newest
+        """
+        async with self.lock:
+            await self.flush()
+            while until_id is None or self.position < until_id:
+                changes = await self.db.read(fetch_changes, self.position, until_id)
+                if not changes:
+                    break
+                if changes[0][0] != self.position + 1 and self.resync is not None:
+                    # Changes were pruned before this worker saw them
+                    self.resyncs += 1
+                    await self.resync()
+                    continue
+                for change_id, origin, kind, payload in changes:
+                    handler = self.handlers.get(kind)
+                    follower = self.followers.get(kind)
+                    if follower is not None:
+                        follower(change_id, json.loads(payload))
+                        if origin != ORIGIN:
+                            self.applied += 1
+                    elif origin != ORIGIN and handler is not None:
+                        handler(json.loads(payload))
+                        self.applied += 1
+                    self.position = change_id
+
+    def start(self):
+        """Start tailing the change log on the running event loop"""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            # Polling would open a database this process has not needed yet
+            if not self.db.opened:
+                continue
+            try:
+                await self.sync()
+                clock = asyncio.get_running_loop().time()
+                if clock - self.last_prune >= PRUNE_SECONDS:
+                    self.last_prune = clock
+                    before = (datetime.now() - timedelta(seconds=self.retention_seconds)).isoformat()
+                    await self.db.write(prune_changes, before)
+            except Exception:
+                logger.exception("Change log sync failed")
+
+    async def close(self):
+        """Stop tailing, after writing any relayed changes"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.db.opened:
+            await self.flush()
+
+    def stats(self) -> Dict:
+        """
+        Change feed statistics
+
+        Returns:
+            Log position and counters of applied, relayed and resynced changes
+        """
+        return {
+            "origin": ORIGIN,
+            "position": self.position,
+            "applied": self.applied,
+            "relayed": self.relayed,
+            "resyncs": self.resyncs,
+            "pending_relay": len(self.outbox),
+            "poll_seconds": self.poll_seconds
+        }
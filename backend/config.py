@@ -3,10 +3,20 @@ EchoSheild Configuration Module
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Serverless mode (set SERVERLESS=true; detected automatically on Vercel).
+# Cold starts skip .env loading, open the database on first use and keep
+# no work in background tasks that a frozen instance would never run.
+SERVERLESS = (os.getenv("SERVERLESS") or os.getenv("VERCEL") or "").lower() in ("1", "true")
+
+# Load environment variables (the platform provides them when serverless)
+if not SERVERLESS:
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
 
 # API Configuration
 API_TITLE = "EchoSheild - Misinformation Detection API"
@@ -17,10 +27,20 @@ API_DESCRIPTION = "Real-time detection and verification of misinformation claims
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))     # worker processes; they share state through the database
+CHANGE_POLL_SECONDS = float(os.getenv("CHANGE_POLL_SECONDS", 0.1))  # how often a worker applies the others' writes
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///echosheild.db")
-DB_PATH = os.getenv("DB_PATH", "echosheild.db")
+DB_PATH = os.getenv("DB_PATH", "/tmp/echosheild.db" if SERVERLESS else "echosheild.db")
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 1 if SERVERLESS else 4))  # read-only connections
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5.0))      # seconds to wait for one
+
+# Verification write-behind queue
+VERIFICATION_BATCH_SIZE = int(os.getenv("VERIFICATION_BATCH_SIZE", 200))          # records per transaction
+VERIFICATION_FLUSH_SECONDS = float(os.getenv("VERIFICATION_FLUSH_SECONDS", 0.5))   # max time a record waits
+VERIFICATION_QUEUE_LIMIT = int(os.getenv("VERIFICATION_QUEUE_LIMIT", 10000))      # submitters wait beyond this
+VERIFICATION_WRITE_THROUGH = os.getenv("VERIFICATION_WRITE_THROUGH", str(SERVERLESS)).lower() == "true"
 
 # LLM Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -30,6 +50,23 @@ LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4")
 AGENT_UPDATE_INTERVAL = int(os.getenv("AGENT_UPDATE_INTERVAL", 300))  # 5 minutes
 CLAIM_FETCH_INTERVAL = int(os.getenv("CLAIM_FETCH_INTERVAL", 60))     # 1 minute
 
+# Observability
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", 1.0))  # fraction of requests timed
+LOG_SAMPLED_REQUESTS = os.getenv("LOG_SAMPLED_REQUESTS", "False").lower() == "true"
+
+# Alerts
+ALERT_DEDUP_SECONDS = int(os.getenv("ALERT_DEDUP_SECONDS", 3600))    # repeats within this window are coalesced
+ALERT_FANOUT_SECONDS = int(os.getenv("ALERT_FANOUT_SECONDS", 60))    # min interval between live pushes per incident
+
+# Deduplication: reposts with the same normalized text always merge into
+# one canonical claim; this also merges rewordings with the same content words
+DEDUP_NEAR_DUPLICATES = os.getenv("DEDUP_NEAR_DUPLICATES", "false").lower() == "true"
+
+# Retention
+CLAIM_RETENTION_DAYS = int(os.getenv("CLAIM_RETENTION_DAYS", 30))    # older claims move to the archive; 0 keeps all
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "/tmp/echosheild-archive" if SERVERLESS else "claims_archive")
+COMPACTION_INTERVAL_SECONDS = int(os.getenv("COMPACTION_INTERVAL_SECONDS", 3600))  # between background archive runs
+
 # Frontend Configuration
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
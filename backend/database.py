@@ -0,0 +1,272 @@
+"""
+Async access to the SQLite database
+A single writer connection runs on its own thread, and read-only
+connections come from a bounded pool served by a thread pool. All queries
+run off the event loop, so slow reads or writes never stall other requests.
+Nothing touches the file until the first query, or an explicit open()
+"""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from storage import connect, init_db
+
+READ_POOL_SIZE = 4
+ACQUIRE_TIMEOUT = 5.0
+
+T = TypeVar("T")
+
+
+class PoolTimeout(Exception):
+    """No read connection became available within the acquire timeout"""
+
+
+def connect_readonly(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """
+    Open a read-only connection to an existing database
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        Configured sqlite3 connection that rejects writes
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class ReadSession:
+    """
+    Read connection bound to one request
+    The connection is checked out on the first query and reused for every
+    later one, then returned to the pool when the request finishes
+    """
+
+    def __init__(self, db: "Database"):
+        self.db = db
+        self.conn: Optional[sqlite3.Connection] = None
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(conn, *args) on a reader thread
+
+        Args:
+            fn: Query function taking a connection first
+            *args: Further arguments for fn
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            PoolTimeout: If no connection could be checked out in time
+        """
+        if self.conn is None:
+            self.conn = await self.db.acquire()
+        return await asyncio.get_running_loop().run_in_executor(self.db.read_executor, fn, self.conn, *args)
+
+    def release(self):
+        """Return the connection, if one was checked out, to the pool"""
+        if self.conn is not None:
+            self.db.release(self.conn)
+            self.conn = None
+
+    async def __aenter__(self) -> "ReadSession":
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+class Database:
+    """
+    Dedicated writer plus a bounded pool of read-only connections
+    """
+
+    def __init__(self, db_path: Union[str, Path], read_pool_size: int = READ_POOL_SIZE,
+                 acquire_timeout: float = ACQUIRE_TIMEOUT):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            read_pool_size: Number of read-only connections
+            acquire_timeout: Seconds a request may wait for a read connection
+        """
+        self.db_path = Path(db_path)
+        self.acquire_timeout = acquire_timeout
+        self.pool_size = read_pool_size
+        self.opened = False
+        self.startup_hooks: List[Callable[[sqlite3.Connection], None]] = []
+        self._writer: Optional[sqlite3.Connection] = None
+        self.readers: "asyncio.Queue[sqlite3.Connection]" = asyncio.Queue()
+        self.read_connections: List[sqlite3.Connection] = []
+        self.write_executor: Optional[ThreadPoolExecutor] = None
+        self.read_executor: Optional[ThreadPoolExecutor] = None
+
+        # Pool saturation counters
+        self.waiting = 0
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.writes_pending = 0
+        self.writes = 0
+        self.write_seconds = 0.0
+
+    def on_open(self, hook: Callable[[sqlite3.Connection], None]):
+        """
+        Register a function run with the writer connection once the
+        database is opened, e.g. to load in-memory indexes
+
+        Args:
+            hook: Called with the writer connection
+        """
+        self.startup_hooks.append(hook)
+        if self.opened:
+            hook(self._writer)
+
+    def open(self):
+        """
+        Open the writer, create or migrate the schema, then open the readers
+
+        Safe to call repeatedly; only the first call does any work.
+        """
+        if self.opened:
+            return
+        writer = connect(self.db_path)
+        init_db(writer)
+        self._writer = writer
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self.read_connections = [connect_readonly(self.db_path) for _ in range(self.pool_size)]
+        for conn in self.read_connections:
+            self.readers.put_nowait(conn)
+        self.read_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="db-reader")
+        self.opened = True
+        for hook in self.startup_hooks:
+            hook(writer)
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """The writer connection, for synchronous startup work"""
+        self.open()
+        return self._writer
+
+    @property
+    def in_use(self) -> int:
+        """Read connections currently checked out"""
+        return self.pool_size - self.readers.qsize() if self.opened else 0
+
+    async def acquire(self) -> sqlite3.Connection:
+        """
+        Check out a read connection, waiting up to acquire_timeout
+
+        Returns:
+            Read-only connection; hand it back with release()
+
+        Raises:
+            PoolTimeout: If the pool stayed exhausted for the whole timeout
+        """
+        self.open()
+        self.acquisitions += 1
+        try:
+            return self.readers.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self.waits += 1
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self.readers.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolTimeout(f"No database connection available after {self.acquire_timeout}s")
+        finally:
+            self.waiting -= 1
+            self.wait_seconds += time.perf_counter() - started
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a read connection to the pool"""
+        self.readers.put_nowait(conn)
+
+    def session(self) -> ReadSession:
+        """
+        Start a per-request read session
+
+        Returns:
+            ReadSession, usable as an async context manager
+        """
+        return ReadSession(self)
+
+    async def read(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run one query function on a pooled read connection
+
+        Args:
+            fn: Query function taking a connection first
+            *args: Further arguments for fn
+
+        Returns:
+            Whatever fn returns
+        """
+        async with self.session() as session:
+            return await session.run(fn, *args)
+
+    async def write(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(writer, *args) on the writer thread
+
+        Writes are serialized in submission order, so fn can hold a
+        transaction without ever contending with another writer.
+
+        Args:
+            fn: Write function taking the writer connection first
+            *args: Further arguments for fn
+
+        Returns:
+            Whatever fn returns
+        """
+        self.open()
+        self.writes_pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.write_executor, fn, self.writer, *args)
+        finally:
+            self.writes_pending -= 1
+            self.writes += 1
+            self.write_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool statistics
+
+        Returns:
+            Reader pool saturation and writer queue counters
+        """
+        return {
+            "read_pool_size": self.pool_size,
+            "read_in_use": self.in_use,
+            "read_waiting": self.waiting,
+            "read_acquisitions": self.acquisitions,
+            "read_waits": self.waits,
+            "read_wait_seconds": round(self.wait_seconds, 6),
+            "read_timeouts": self.timeouts,
+            "writes_pending": self.writes_pending,
+            "writes": self.writes,
+            "write_seconds": round(self.write_seconds, 6)
+        }
+
+    def close(self):
+        """Finish queued writes, then close every connection"""
+        if not self.opened:
+            return
+        self.opened = False
+        self.write_executor.shutdown(wait=True)
+        self.read_executor.shutdown(wait=True)
+        for conn in self.read_connections:
+            conn.close()
+        self._writer.close()
@@ -0,0 +1,72 @@
+"""
+Claim deduplication
+Reposts of a claim are recognized by a hash of its normalized text, so
+they attach to one canonical claim instead of becoming new rows.
+Optionally, near-duplicates (the same content words reordered, or with
+filler words and punctuation changed) match by a hash of their word set.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+
+# Texts with fewer distinct content words are only matched exactly
+MIN_TOKENS = 4
+
+# Dropped before comparing: links, @mentions, a leading retweet marker
+NOISE = re.compile(r"https?://\S+|www\.\S+|@\w+|^\s*rt\b:?", re.IGNORECASE)
+NON_WORD = re.compile(r"[\W_]+")
+# "n't" contractions and "cannot", rewritten as "not" so "doesn't"
+# matches "does not"
+CONTRACTED_NOT = re.compile(r"\bcannot\b|(?:ca|wo|sha)?n['\u2019]t\b")
+
+STOPWORDS = frozenset("""
+a an the and or but if of to in on at by for from with about as into over
+is are was were be been being has have had do does did will would can could
+may might must shall should this that these those it its they them their
+he she his her we our you your i me my so than then there here
+just very also says say said claims claim according new breaking study
+""".split())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of claim text for comparison
+
+    Unicode compatibility forms, case, punctuation, links, mentions and
+    whitespace differences are removed.
+
+    Args:
+        text: Claim text
+
+    Returns:
+        Space-separated lowercase words
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = NOISE.sub(" ", text)
+    return NON_WORD.sub(" ", text).strip()
+
+
+def content_hash(text: str) -> str:
+    """Hash of the normalized text; equal for reposts of the same claim"""
+    return hashlib.blake2b(normalize_text(text).encode(), digest_size=16).hexdigest()
+
+
+def token_hash(text: str) -> Optional[str]:
+    """
+    Hash of the set of content words, ignoring order, repeats and filler
+
+    Args:
+        text: Claim text
+
+    Returns:
+        Hash equal for near-duplicate wordings, or None when the text has
+        too few content words to match on safely
+    """
+    # Negations are content: a claim and its denial must not merge
+    text = CONTRACTED_NOT.sub(" not", unicodedata.normalize("NFKC", text or "").casefold())
+    tokens = sorted({token for token in normalize_text(text).split() if token not in STOPWORDS})
+    if len(tokens) < MIN_TOKENS:
+        return None
+    return hashlib.blake2b(" ".join(tokens).encode(), digest_size=16).hexdigest()
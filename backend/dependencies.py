@@ -2,24 +2,44 @@
 FastAPI dependencies and utilities
 """
 
-from typing import List
+import logging
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 
-def get_db():
+from fastapi import Request
+
+from database import ReadSession
+
+logger = logging.getLogger("echosheild.requests")
+
+async def get_db(request: Request) -> AsyncIterator[ReadSession]:
     """
     Database session dependency
+    
+    Yields a read session on the app's Database. A pooled read-only
+    connection is checked out on the request's first query, reused by any
+    later ones, and returned to the pool when the request finishes.
+    Requests that never query never touch the pool.
     """
-    # In production, use actual DB connection
-    pass
+    async with request.app.state.db.session() as session:
+        yield session
 
-def log_request(method: str, path: str, timestamp: datetime = None):
+def log_request(method: str, path: str, timestamp: datetime = None,
+                status: Optional[int] = None, duration: Optional[float] = None):
     """
     Log API requests
     
+    Formatting is deferred to the logging module, so nothing is built
+    unless the echosheild.requests logger is enabled for INFO.
+    
     Args:
         method: HTTP method
         path: Request path
         timestamp: Request timestamp
+        status: Response status code
+        duration: Request duration in seconds
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     ts = timestamp or datetime.now()
-    print(f"[{ts}] {method} {path}")
+    logger.info("[%s] %s %s %s %.1fms", ts, method, path, status, (duration or 0) * 1000)
@@ -0,0 +1,145 @@
+"""
+Server-sent event fan-out for live dashboard updates
+Each event is serialized once and shared by every subscriber
+"""
+
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional, Set
+
+HISTORY_SIZE = 1000
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+
+
+class Subscriber:
+    """
+    One connected stream with a bounded queue of encoded events
+    When the queue is full the oldest event is dropped, so a slow client
+    falls behind instead of growing server memory
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue: Deque[bytes] = deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def push(self, frame: bytes):
+        """Queue an encoded event, dropping the oldest one if full"""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(frame)
+        self.ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Wait for the next event
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            Encoded event, or None on timeout
+        """
+        while not self.queue:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.queue.popleft()
+
+
+class EventBroker:
+    """
+    Publishes events to all subscribers and keeps a replay history so
+    reconnecting clients can resume from their Last-Event-ID
+    """
+
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.history: Deque = deque(maxlen=history_size)
+        self.subscribers: Set[Subscriber] = set()
+        self.last_id = 0
+        # Numbers events from a sequence shared by every worker process:
+        # called with each published event, it returns a future of the
+        # event's ID and hands the event back to deliver() in every worker,
+        # this one included. Without it events are numbered locally
+        self.relay: Optional[Callable[[str, Dict], asyncio.Future]] = None
+
+    def publish(self, event_type: str, data: Dict) -> asyncio.Future:
+        """
+        Send an event to every subscriber, here and, through the relay, in
+        other worker processes
+
+        Args:
+            event_type: SSE event name
+            data: JSON-serializable payload
+
+        Returns:
+            Future resolved with the ID assigned to the event
+        """
+        if self.relay is not None:
+            return self.relay(event_type, data)
+        published = asyncio.get_running_loop().create_future()
+        published.set_result(self.deliver(self.last_id + 1, event_type, data))
+        return published
+
+    def deliver(self, event_id: int, event_type: str, data: Dict) -> int:
+        """
+        Send a numbered event to this process's subscribers only
+
+        Args:
+            event_id: ID of the event, greater than any delivered before
+            event_type: SSE event name
+            data: JSON-serializable payload
+
+        Returns:
+            event_id
+        """
+        self.last_id = event_id
+        payload = json.dumps(data, default=str, separators=(",", ":"))
+        frame = f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+        self.history.append((event_id, frame))
+        for subscriber in self.subscribers:
+            subscriber.push(frame)
+        return event_id
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscriber:
+        """
+        Register a subscriber, replaying missed events when resuming
+
+        Args:
+            last_event_id: Last event the client saw, if reconnecting
+
+        Returns:
+            New subscriber
+        """
+        subscriber = Subscriber(self.queue_size)
+        if last_event_id is not None:
+            for event_id, frame in self.history:
+                if event_id > last_event_id:
+                    subscriber.push(frame)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a disconnected subscriber"""
+        self.subscribers.discard(subscriber)
+
+    def stats(self) -> Dict:
+        """
+        Broker statistics
+
+        Returns:
+            Subscriber count, last event ID and dropped event totals
+        """
+        return {
+            "subscribers": len(self.subscribers),
+            "last_event_id": self.last_id,
+            "history_size": len(self.history),
+            "dropped_events": sum(s.dropped for s in self.subscribers),
+            "timestamp": datetime.now().isoformat()
+        }
@@ -0,0 +1,143 @@
+"""
+Conditional GET and response caching for read endpoints
+ETags are derived from the store's data version, so an unchanged dataset
+answers If-None-Match with 304 without rebuilding the response. The version
+and epoch come from the shared database, so every worker issues the same ETags
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+CACHE_TTL_SECONDS = 2.0
+CACHE_MAX_ENTRIES = 1024
+
+Built = Tuple[bytes, Dict[str, str]]
+
+
+class CachedResponse:
+    """Serialized response body and headers for one route + params"""
+
+    __slots__ = ("etag", "body", "headers", "created")
+
+    def __init__(self, etag: str, body: bytes, headers: Dict[str, str]):
+        self.etag = etag
+        self.body = body
+        self.headers = headers
+        self.created = time.monotonic()
+
+
+def cache_key(request: Request) -> str:
+    """
+    Key identifying a route and its query parameters, independent of order
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Cache key
+    """
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{params}"
+
+
+def make_etag(key: str, version: int, extra: str = "", epoch: str = "") -> str:
+    """
+    Build a strong ETag for a route at a data version
+
+    Args:
+        key: Cache key of the route and params
+        version: Store data version
+        extra: Additional validator input, e.g. a time bucket
+        epoch: Identifies the data version sequence the version belongs to
+
+    Returns:
+        Quoted ETag
+    """
+    digest = hashlib.blake2b(f"{epoch}|{key}|{extra}".encode(), digest_size=8).hexdigest()
+    return f'"{version:x}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers the given ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCache:
+    """
+    Short-lived LRU of serialized responses keyed by route + params
+    An entry is reused only while its data version is unchanged and it is
+    younger than the TTL, which bounds staleness of time-based fields
+    """
+
+    def __init__(self, epoch: Callable[[], str], ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        """
+        Args:
+            epoch: Returns the epoch of the data version sequence, drawn once
+                per database so ETags from a recreated one never validate
+            ttl: Seconds an entry may be reused for
+            max_entries: Entries kept, least recently used evicted first
+        """
+        self.epoch = epoch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    async def respond(self, request: Request, version: int, build: Callable[[], Awaitable[Built]], extra: str = "") -> Response:
+        """
+        Answer a GET from the cache, with 304 when the client is current
+
+        Args:
+            request: Incoming request
+            version: Current store data version
+            build: Coroutine function producing (JSON body bytes, extra
+                headers) on a miss
+            extra: Additional ETag input for time-dependent responses
+
+        Returns:
+            304 or 200 response carrying the ETag
+        """
+        key = cache_key(request)
+        etag = make_etag(key, version, extra, self.epoch())
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        entry = self.entries.get(key)
+        if entry is not None and entry.etag == etag and time.monotonic() - entry.created < self.ttl:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+            body, built_headers = await build()
+            entry = CachedResponse(etag, body, built_headers)
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return Response(content=entry.body, media_type="application/json", headers={**entry.headers, **headers})
+
+    def stats(self) -> Dict:
+        """
+        Cache statistics
+
+        Returns:
+            Hit, miss and 304 counters
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "entries": len(self.entries)
+        }
@@ -0,0 +1,200 @@
+"""
+Claim ingestion helpers
+Builds new claims and streams NDJSON bulk uploads into the store in
+batched transactions
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+BATCH_SIZE = 500
+MAX_LINE_BYTES = 64 * 1024
+RESULT_SPOOL_BYTES = 1024 * 1024
+# How far ahead of this server's clock a submitted timestamp may be
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def build_claim(data: Dict) -> Dict:
+    """
+    Build a new claim record from submitted data (mock verdict)
+
+    Args:
+        data: Submitted claim fields
+
+    Returns:
+        Claim dict ready to be stored
+    """
+    return {
+        "claim": data.get("claim", ""),
+        "source": data.get("source", "Unknown"),
+        "timestamp": data.get("timestamp") or datetime.now().isoformat(),
+        "trust_score": random.randint(20, 95),
+        "status": random.choice(["TRUE", "MISINFORMATION", "PARTIALLY_TRUE"]),
+        "category": data.get("category", "Other"),
+        "engagement": data.get("engagement", random.randint(100, 50000))
+    }
+
+
+def parse_claim_line(line: bytes) -> Dict:
+    """
+    Parse and validate one NDJSON line
+
+    Args:
+        line: Raw line without its newline
+
+    Returns:
+        Claim dict ready to be stored
+
+    Raises:
+        ValueError: If the line is not a valid claim
+    """
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    return validate_claim(data)
+
+
+def validate_claim(data) -> Dict:
+    """
+    Validate submitted claim fields and build the claim to store
+
+    Args:
+        data: Decoded claim object
+
+    Returns:
+        Claim dict ready to be stored
+
+    Raises:
+        ValueError: If the data is not a valid claim
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Claim must be a JSON object")
+    if not isinstance(data.get("claim"), str) or not data["claim"].strip():
+        raise ValueError("Field 'claim' must be a non-empty string")
+    for field in ("source", "category"):
+        if field in data and not isinstance(data[field], str):
+            raise ValueError(f"Field '{field}' must be a string")
+    data = dict(data)
+    if "timestamp" in data:
+        try:
+            timestamp = datetime.fromisoformat(data["timestamp"])
+            if timestamp.tzinfo is not None:
+                # Stored timestamps are naive local time, compared as strings
+                timestamp = timestamp.astimezone().replace(tzinfo=None)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("Field 'timestamp' must be an ISO 8601 datetime")
+        if timestamp > datetime.now() + MAX_CLOCK_SKEW:
+            raise ValueError("Field 'timestamp' must not be in the future")
+        data["timestamp"] = timestamp.isoformat()
+    if "engagement" in data:
+        engagement = data["engagement"]
+        if not isinstance(engagement, int) or isinstance(engagement, bool) or engagement < 0:
+            raise ValueError("Field 'engagement' must be a non-negative integer")
+    return build_claim(data)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into numbered lines without buffering the body
+
+    Args:
+        chunks: Incoming body chunks
+        max_line_bytes: Longest accepted line
+
+    Yields:
+        (line number, line) pairs; line is None when it exceeded max_line_bytes
+    """
+    buffer = b""
+    number = 0
+    oversized = False
+    async for chunk in chunks:
+        lines = chunk.split(b"\n")
+        lines[0] = buffer + lines[0]
+        buffer = lines.pop()
+        for line in lines:
+            number += 1
+            yield number, None if oversized or len(line) > max_line_bytes else line
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer = b""
+    if buffer or oversized:
+        number += 1
+        yield number, None if oversized else buffer
+
+
+async def ingest_ndjson(chunks: AsyncIterator[bytes], store, broker=None, batch_size: int = BATCH_SIZE) -> AsyncIterator[bytes]:
+    """
+    Ingest NDJSON claims, yielding one NDJSON result per input line
+
+    Valid lines are inserted batch_size at a time; blank lines are skipped.
+    Results come in input order: a rejected line is reported with the
+    batch it was read in. A repost of a stored claim is accepted by merging
+    it into that claim, whose ID its result carries. The last result line
+    is a summary with accepted/merged/rejected totals.
+
+    Args:
+        chunks: Incoming body chunks
+        store: ClaimStore to insert into
+        broker: Optional EventBroker notified once per batch
+        batch_size: Lines per transaction
+
+    Yields:
+        Encoded result lines
+    """
+    accepted = merged = rejected = 0
+    # (line number, claim to store or the reason it was rejected)
+    pending: List[Tuple[int, Union[Dict, str]]] = []
+
+    async def flush() -> List[bytes]:
+        nonlocal merged
+        claims = [claim for _, claim in pending if isinstance(claim, dict)]
+        stored = iter(await store.insert_many(claims) if claims else [])
+        inserted = []
+        results = []
+        for number, claim in pending:
+            if not isinstance(claim, dict):
+                results.append(_encode({"line": number, "status": "rejected", "error": claim}))
+                continue
+            record, was_merged = next(stored)
+            if was_merged:
+                merged += 1
+            else:
+                inserted.append(record["id"])
+            results.append(_encode({"line": number, "status": "accepted", "id": record["id"], "merged": was_merged}))
+        if broker is not None and claims:
+            broker.publish("claims_ingested", {
+                "count": len(inserted),
+                "merged": len(claims) - len(inserted),
+                "first_id": inserted[0] if inserted else None,
+                "last_id": inserted[-1] if inserted else None,
+            })
+        pending.clear()
+        return results
+
+    async for number, line in iter_lines(chunks):
+        if line is not None and not line.strip():
+            continue
+        try:
+            if line is None:
+                raise ValueError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+            pending.append((number, parse_claim_line(line)))
+            accepted += 1
+        except ValueError as e:
+            rejected += 1
+            pending.append((number, str(e)))
+        if len(pending) >= batch_size:
+            for result in await flush():
+                yield result
+
+    if pending:
+        for result in await flush():
+            yield result
+    yield _encode({"summary": True, "accepted": accepted, "merged": merged, "rejected": rejected})
+
+
+def _encode(result: Dict) -> bytes:
+    return json.dumps(result, separators=(",", ":")).encode() + b"\n"
@@ -3,15 +3,32 @@ EchoSheild FastAPI Backend
 Real-time misinformation detection and verification platform
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
-import random
-import uvicorn
-import sqlite3
-from pathlib import Path
+import json
+import tempfile
+import time
+
+from config import (
+    ALERT_DEDUP_SECONDS, ALERT_FANOUT_SECONDS, ARCHIVE_DIR, CHANGE_POLL_SECONDS, CLAIM_RETENTION_DAYS, COMPACTION_INTERVAL_SECONDS, DB_PATH, DEDUP_NEAR_DUPLICATES, DB_POOL_TIMEOUT, DB_READ_POOL_SIZE, LOG_SAMPLED_REQUESTS, METRICS_SAMPLE_RATE,
+    SERVERLESS, VERIFICATION_BATCH_SIZE, VERIFICATION_FLUSH_SECONDS, VERIFICATION_QUEUE_LIMIT, VERIFICATION_WRITE_THROUGH, WORKERS,
+)
+from alerts import AlertStore, build_alert
+from archive import ClaimArchiver
+from changes import ChangeFeed
+from database import Database, PoolTimeout, ReadSession
+from dependencies import get_db, log_request
+from events import HEARTBEAT_SECONDS, EventBroker
+from http_cache import ResponseCache
+from ingest import RESULT_SPOOL_BYTES, ingest_ndjson, validate_claim
+from metrics import MetricsMiddleware, MetricsRegistry
+from storage import ClaimStore
+from trending import BUCKET_CAPACITY, BUCKET_SECONDS
+from verifications import VerificationWriter
 
 app = FastAPI(
     title="EchoSheild API",
@@ -26,59 +43,58 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# Database setup
-DB_PATH = Path("echosheild.db")
-
-def init_db():
-    """Initialize SQLite database with tables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Claims table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS claims (
-            id INTEGER PRIMARY KEY,
-            claim TEXT NOT NULL,
-            source TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            trust_score INTEGER,
-            status TEXT,
-            category TEXT,
-            engagement INTEGER
-        )
-    ''')
-    
-    # Verification results table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS verifications (
-            id INTEGER PRIMARY KEY,
-            claim_id INTEGER,
-            verification_method TEXT,
-            details TEXT,
-            verified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(claim_id) REFERENCES claims(id)
-        )
-    ''')
-    
-    # Summaries table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS summaries (
-            id INTEGER PRIMARY KEY,
-            claim_id INTEGER,
-            summary TEXT,
-            language TEXT DEFAULT 'en',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(claim_id) REFERENCES claims(id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+# Request metrics (outermost, so they include time spent in other middleware)
+metrics = MetricsRegistry(sample_rate=METRICS_SAMPLE_RATE)
+app.add_middleware(
+    MetricsMiddleware,
+    registry=metrics,
+    on_sample=(lambda method, path, status, duration: log_request(method, path, status=status, duration=duration))
+    if LOG_SAMPLED_REQUESTS else None,
+)
+
+# Database setup: one writer thread plus a pool of read-only connections
+db = Database(DB_PATH, read_pool_size=DB_READ_POOL_SIZE, acquire_timeout=DB_POOL_TIMEOUT)
+app.state.db = db
+
+# Writes made by other worker processes, applied to this one's memory
+feed = ChangeFeed(db, poll_seconds=CHANGE_POLL_SECONDS)
 
-# Initialize DB on startup
-init_db()
+# Claims repository; its in-memory indexes load when the database opens
+store = ClaimStore(db, feed, near_duplicates=DEDUP_NEAR_DUPLICATES)
+
+# Claims past the retention horizon move to compressed day partitions
+archiver = ClaimArchiver(db, store, ARCHIVE_DIR, retention_days=CLAIM_RETENTION_DAYS, interval=COMPACTION_INTERVAL_SECONDS)
+
+# Verification records are written behind, in grouped transactions
+verification_writer = VerificationWriter(
+    db,
+    batch_size=VERIFICATION_BATCH_SIZE,
+    flush_seconds=VERIFICATION_FLUSH_SECONDS,
+    queue_limit=VERIFICATION_QUEUE_LIMIT,
+    write_through=VERIFICATION_WRITE_THROUGH,
+)
+
+# Alerts, deduplicated per incident
+alert_store = AlertStore(db, dedup_seconds=ALERT_DEDUP_SECONDS, fanout_seconds=ALERT_FANOUT_SECONDS)
+
+# Live update fan-out for dashboards, reaching subscribers of every worker.
+# Events go through the change log and take their change ID as event ID,
+# so Last-Event-ID resumes correctly on whichever worker a client reaches.
+# A serverless instance is a single process and delivers them directly
+broker = EventBroker()
+if not SERVERLESS:
+    broker.relay = lambda event_type, data: feed.relay("event", {"type": event_type, "data": data})
+    feed.follow("event", lambda change_id, payload: broker.deliver(change_id, payload["type"], payload["data"]))
+
+# Serialized responses for conditional GETs on read endpoints
+response_cache = ResponseCache(lambda: store.epoch)
+
+def encode_json(data) -> bytes:
+    """Serialize a response body the way FastAPI's JSONResponse does"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode()
 
 # Data Models
 class Claim(BaseModel):
@@ -99,6 +115,8 @@ class VerificationResult(BaseModel):
     verification_method: str
     details: str
     verified_sources: List[str]
+    status: Optional[Literal["TRUE", "MISINFORMATION", "PARTIALLY_TRUE"]] = None
+    trust_score: Optional[int] = Field(None, ge=0, le=100)
 
 class Summary(BaseModel):
     """Summary model"""
@@ -117,7 +135,7 @@ class ClaimResponse(BaseModel):
     category: str
     engagement: int
 
-# Mock data - simulates live claims stream
+# Mock data - seeds an empty database with a sample claims stream
 MOCK_CLAIMS = [
     {
         "id": 1,
@@ -172,6 +190,43 @@ VERIFICATION_SOURCES = [
     "Government Public Information Bureau"
 ]
 
+store.seed(MOCK_CLAIMS)
+
+# A long-running server pays for opening, migrating and loading the
+# indexes up front; a serverless cold start defers it to the first query
+if not SERVERLESS:
+    db.open()
+
+@app.on_event("startup")
+async def start_background_writers():
+    """Start the change feed, the verification flush loop and periodic compaction"""
+    verification_writer.start()
+    # A serverless instance has no other workers to follow, and a frozen one
+    # never gets to compact; POST /archive/compact does instead
+    if not SERVERLESS:
+        feed.start()
+        archiver.start()
+
+@app.on_event("shutdown")
+async def close_database():
+    """Stop compaction, flush queued verifications and writes, then close the connections"""
+    await archiver.close()
+    await verification_writer.close()
+    await feed.close()
+    db.close()
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Answer 503 when the read pool stays exhausted"""
+    return JSONResponse(status_code=503, content={"detail": "Database busy, retry later"}, headers={"Retry-After": "1"})
+
+async def find_claim(claim_id: int, session: ReadSession) -> Optional[dict]:
+    """Get a claim from the claims table, falling back to the archive"""
+    claim = await store.get(claim_id, session)
+    if claim is None:
+        claim = await archiver.get(claim_id, session)
+    return claim
+
 # Routes
 
 @app.get("/health")
@@ -180,21 +235,94 @@ async def health_check():
     return {"status": "healthy", "service": "EchoSheild API", "version": "1.0.0"}
 
 @app.get("/claims", response_model=List[ClaimResponse])
-async def get_claims(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100)):
+async def get_claims(
+    request: Request,
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    since_id: Optional[int] = Query(None, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True),
+    session: ReadSession = Depends(get_db),
+):
     """
-    Get all claims with optional pagination
+    Get claims newest first with cursor pagination and filtering
     
     Args:
-        skip: Number of claims to skip
         limit: Maximum number of claims to return
+        cursor: Opaque token from the X-Next-Cursor header of the previous page
+        status: Only claims with this status
+        category: Only claims in this category
+        source: Only claims from this source
+        since: Only claims at or after this time
+        until: Only claims before this time
+        since_id: Only claims added after this ID, oldest first; pass the
+            last ID returned to get the next page
+        skip: Legacy offset pagination; prefer cursor
     
     Returns:
-        List of claims
+        List of claims; X-Next-Cursor is set when more claims remain
     """
-    return MOCK_CLAIMS[skip:skip + limit]
+    async def build():
+        # Rows are encoded to ClaimResponse JSON by SQLite itself, skipping
+        # per-item Pydantic validation (see benchmarks/serialization.py)
+        try:
+            body, next_cursor = await store.list_json(
+                limit,
+                cursor=cursor,
+                skip=skip,
+                since=since.isoformat() if since else None,
+                until=until.isoformat() if until else None,
+                since_id=since_id,
+                session=session,
+                status=status,
+                category=category,
+                source=source,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return body, headers
+    
+    return await response_cache.respond(request, store.data_version, build)
+
+@app.get("/claims/search", response_model=List[ClaimResponse])
+async def search_claims(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=512),
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    session: ReadSession = Depends(get_db),
+):
+    """
+    Full-text search over claim text
+    
+    Args:
+        q: Search query; supports "exact phrases", prefix* terms and AND/OR/NOT
+        limit: Maximum number of claims to return
+        cursor: Opaque token from the X-Next-Cursor header of the previous page
+        sort: "relevance" (best match first) or "recent" (newest first)
+    
+    Returns:
+        Matching claims; X-Next-Cursor is set when more matches remain
+    """
+    async def build():
+        try:
+            body, next_cursor = await store.search_json(q, limit, cursor, sort, session)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return body, headers
+    
+    return await response_cache.respond(request, store.data_version, build)
 
 @app.get("/claims/{claim_id}", response_model=ClaimResponse)
-async def get_claim(claim_id: int):
+async def get_claim(request: Request, claim_id: int, session: ReadSession = Depends(get_db)):
     """
     Get a specific claim by ID
     
@@ -204,10 +332,43 @@ async def get_claim(claim_id: int):
     Returns:
         Claim details
     """
-    for claim in MOCK_CLAIMS:
-        if claim["id"] == claim_id:
-            return claim
-    raise HTTPException(status_code=404, detail="Claim not found")
+    async def build():
+        claim = await find_claim(claim_id, session)
+        if not claim:
+            raise HTTPException(status_code=404, detail="Claim not found")
+        return ClaimResponse.model_validate(claim).model_dump_json().encode(), {}
+    
+    return await response_cache.respond(request, store.data_version, build)
+
+@app.get("/claims/{claim_id}/sources")
+async def get_claim_sources(claim_id: int, session: ReadSession = Depends(get_db)):
+    """
+    Get the sources a claim was posted from
+    
+    Args:
+        claim_id: ID of the claim
+    
+    Returns:
+        Total reposts and per-source occurrences and engagement
+    """
+    claim = await find_claim(claim_id, session)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    sources = await store.sources(claim_id, session)
+    if not sources:
+        sources = [{
+            "source": claim["source"],
+            "occurrences": 1,
+            "engagement": claim["engagement"],
+            "first_seen": claim["timestamp"],
+            "last_seen": claim["timestamp"]
+        }]
+    return {
+        "claim_id": claim_id,
+        "occurrences": sum(source["occurrences"] for source in sources),
+        "engagement": claim["engagement"],
+        "sources": sources
+    }
 
 @app.post("/claims")
 async def create_claim(claim: dict):
@@ -218,21 +379,44 @@ async def create_claim(claim: dict):
         claim: Claim data
     
     Returns:
-        Created claim with ID
-    """
-    new_id = max([c["id"] for c in MOCK_CLAIMS]) + 1
-    new_claim = {
-        "id": new_id,
-        "claim": claim.get("claim", ""),
-        "source": claim.get("source", "Unknown"),
-        "timestamp": datetime.now().isoformat(),
-        "trust_score": random.randint(20, 95),
-        "status": random.choice(["TRUE", "MISINFORMATION", "PARTIALLY_TRUE"]),
-        "category": claim.get("category", "Other"),
-        "engagement": random.randint(100, 50000)
-    }
-    MOCK_CLAIMS.append(new_claim)
-    return new_claim
+        Created claim with ID, or the canonical claim it was merged into
+        when it reposts a stored claim
+    
+    Raises:
+        HTTPException: 400 if the claim fails the checks applied to
+            /claims/bulk lines
+    """
+    try:
+        new_claim = validate_claim(claim)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    new_claim, merged = await store.insert(new_claim)
+    broker.publish("claim_merged" if merged else "claim_created", new_claim)
+    return {**new_claim, "merged": merged}
+
+@app.post("/claims/bulk")
+async def create_claims_bulk(request: Request):
+    """
+    Stream-ingest claims sent as NDJSON (one JSON claim object per line)
+    
+    The body is parsed as it arrives and inserted in batched transactions.
+    Per-line results are spooled (to disk once large) rather than kept in
+    memory, then streamed back once the whole body has been consumed.
+    
+    Returns:
+        application/x-ndjson stream with one result per input line,
+        followed by a summary line
+    """
+    results = tempfile.SpooledTemporaryFile(max_size=RESULT_SPOOL_BYTES)
+    async for line in ingest_ndjson(request.stream(), store, broker):
+        results.write(line)
+    results.seek(0)
+    
+    def read_results():
+        with results:
+            yield from iter(lambda: results.read(64 * 1024), b"")
+    
+    return StreamingResponse(read_results(), media_type="application/x-ndjson")
 
 @app.post("/verify/{claim_id}")
 async def verify_claim(claim_id: int, verification: VerificationResult):
@@ -246,16 +430,17 @@ async def verify_claim(claim_id: int, verification: VerificationResult):
     Returns:
         Verification result
     """
-    claim = None
-    for c in MOCK_CLAIMS:
-        if c["id"] == claim_id:
-            claim = c
-            break
+    verdict = {}
+    if verification.status is not None:
+        verdict["status"] = verification.status
+    if verification.trust_score is not None:
+        verdict["trust_score"] = verification.trust_score
     
+    claim = await store.update(claim_id, **verdict)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    return {
+    result = {
         "claim_id": claim_id,
         "claim_text": claim["claim"],
         "verification_method": verification.verification_method,
@@ -265,9 +450,30 @@ async def verify_claim(claim_id: int, verification: VerificationResult):
         "status": claim["status"],
         "verified_at": datetime.now().isoformat()
     }
+    await verification_writer.submit(
+        claim_id,
+        verification.verification_method,
+        verification.details,
+        result["verified_at"],
+        status=verification.status,
+        trust_score=verification.trust_score,
+        verified_sources=verification.verified_sources,
+    )
+    broker.publish("claim_verified", result)
+    return result
+
+@app.get("/verify/queue/stats")
+async def verification_queue_stats():
+    """
+    Get verification write-behind queue statistics
+    
+    Returns:
+        Queue depth and batch counters
+    """
+    return verification_writer.stats()
 
 @app.get("/summaries/{claim_id}")
-async def get_summary(claim_id: int, language: str = Query("en")):
+async def get_summary(claim_id: int, language: str = Query("en"), session: ReadSession = Depends(get_db)):
     """
     Get AI-generated summary for a claim
     
@@ -278,101 +484,341 @@ async def get_summary(claim_id: int, language: str = Query("en")):
     Returns:
         Summary text
     """
-    claim = None
-    for c in MOCK_CLAIMS:
-        if c["id"] == claim_id:
-            claim = c
-            break
-    
+    claim = await find_claim(claim_id, session)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    # Mock LLM summary generation
-    summary_dict = {
-        "en": f"Claim Analysis: The statement '{claim['claim']}' has been analyzed using multiple verification sources. Status: {claim['status']}. Trust Score: {claim['trust_score']}/100.",
-        "es": f"Análisis de Reclamación: La declaración '{claim['claim']}' ha sido analizada usando múltiples fuentes de verificación. Estado: {claim['status']}.",
-        "fr": f"Analyse de Réclamation: L'énoncé '{claim['claim']}' a été analysé à l'aide de plusieurs sources de vérification. Statut: {claim['status']}.",
-        "hi": f"दावा विश्लेषण: कथन '{claim['claim']}' का विश्लेषण कई सत्यापन स्रोतों का उपयोग करके किया गया है। स्थिति: {claim['status']}।"
-    }
-    
+    summary, created_at = await store.summaries.get(claim, language, session)
     return {
         "claim_id": claim_id,
-        "summary": summary_dict.get(language, summary_dict["en"]),
+        "summary": summary,
         "language": language,
-        "created_at": datetime.now().isoformat()
+        "created_at": created_at
     }
 
+@app.get("/summaries/cache/stats")
+async def get_summary_cache_stats():
+    """
+    Get summary cache statistics
+    
+    Returns:
+        Memory/database hit and miss counters
+    """
+    return store.summaries.stats()
+
 @app.get("/trends")
-async def get_trending():
+async def get_trending(
+    request: Request,
+    window: Optional[str] = Query(None, pattern="^(15m|1h|24h)$"),
+    category: Optional[str] = Query(None),
+    limit: int = Query(5, ge=1, le=BUCKET_CAPACITY),
+    session: ReadSession = Depends(get_db),
+):
     """
     Get trending claims and topics
     
+    Args:
+        window: Only claims from the last "15m", "1h" or "24h"; all-time if omitted
+        category: Only claims in this category
+        limit: Number of trending claims to return
+    
     Returns:
         List of trending claims sorted by engagement
     """
-    sorted_claims = sorted(MOCK_CLAIMS, key=lambda x: x["engagement"], reverse=True)
-    return {
-        "trending": sorted_claims[:5],
-        "total_claims": len(MOCK_CLAIMS),
-        "timestamp": datetime.now().isoformat()
-    }
+    async def build():
+        if window:
+            trending = store.trending.top(window, limit, category)
+        else:
+            trending = await store.top_by_engagement(limit, category, session)
+        return encode_json({
+            "trending": trending,
+            "total_claims": store.stats.overall.total,
+            "window": window,
+            "category": category,
+            "timestamp": datetime.now().isoformat()
+        }), {}
+    
+    # Windowed results also change as claims age out, so their ETag
+    # rolls over with the trending bucket even when no data is written
+    extra = str(int(time.time()) // BUCKET_SECONDS) if window else ""
+    return await response_cache.respond(request, store.data_version, build, extra)
 
 @app.get("/stats")
-async def get_stats():
+async def get_stats(request: Request, breakdown: Optional[str] = Query(None, pattern="^(category|source)$")):
     """
     Get platform statistics
     
+    Args:
+        breakdown: Optionally add per-"category" or per-"source" statistics
+    
     Returns:
         Statistics about claims, verification, and misinformation
     """
-    total = len(MOCK_CLAIMS)
-    verified = sum(1 for c in MOCK_CLAIMS if c["status"] == "TRUE")
-    misinformation = sum(1 for c in MOCK_CLAIMS if c["status"] == "MISINFORMATION")
-    partial = sum(1 for c in MOCK_CLAIMS if c["status"] == "PARTIALLY_TRUE")
-    avg_trust = sum(c["trust_score"] for c in MOCK_CLAIMS) // total if total > 0 else 0
+    async def build():
+        stats = store.stats.snapshot(breakdown)
+        stats["timestamp"] = datetime.now().isoformat()
+        return encode_json(stats), {}
+    
+    return await response_cache.respond(request, store.data_version, build)
+
+@app.post("/stats/rebuild")
+async def rebuild_stats():
+    """
+    Rebuild the running statistics from the database
     
+    Returns:
+        Whether the counters had drifted, plus the rebuilt statistics
+    """
+    consistent = await store.check_stats()
     return {
-        "total_claims": total,
-        "verified_true": verified,
-        "misinformation": misinformation,
-        "partially_true": partial,
-        "average_trust_score": avg_trust,
+        "consistent": consistent,
+        "stats": store.stats.snapshot(),
         "timestamp": datetime.now().isoformat()
     }
 
 @app.get("/sources")
-async def get_verification_sources():
+async def get_verification_sources(request: Request):
     """
     Get list of trusted verification sources
     
     Returns:
         List of verification sources
     """
-    return {
-        "sources": VERIFICATION_SOURCES,
-        "total": len(VERIFICATION_SOURCES)
-    }
+    async def build():
+        return encode_json({
+            "sources": VERIFICATION_SOURCES,
+            "total": len(VERIFICATION_SOURCES)
+        }), {}
+    
+    # The source list is static, so it never needs a data version
+    return await response_cache.respond(request, 0, build)
 
-@app.post("/alerts")
-async def create_alert(alert_data: dict):
+@app.post("/alerts", status_code=201)
+async def create_alert(alert_data: dict, response: Response):
     """
     Create an alert for misinformation
     
+    A repeat of an open incident (same claim_id and severity within the
+    dedup window) increments that alert's occurrences instead.
+    
     Args:
         alert_data: Alert information
     
     Returns:
-        Created alert
+        Created alert (201), or the incident it was coalesced into (200)
+    """
+    try:
+        alert, created, publish = await alert_store.record(alert_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not created:
+        response.status_code = 200
+    if publish:
+        broker.publish("alert_created" if created else "alert_updated", alert)
+    return alert
+
+@app.get("/alerts")
+async def list_alerts(
+    response: Response,
+    limit: int = Query(20, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    severity: Optional[str] = Query(None, pattern="^(CRITICAL|HIGH|MEDIUM|LOW)$"),
+    status: Optional[str] = Query(None),
+    claim_id: Optional[int] = Query(None),
+    session: ReadSession = Depends(get_db),
+):
+    """
+    List alerts newest first with cursor pagination
+    
+    Args:
+        limit: Maximum number of alerts to return
+        cursor: Opaque token from the X-Next-Cursor header of the previous page
+        severity: Only alerts with this severity
+        status: Only alerts with this status
+        claim_id: Only alerts about this claim
+    
+    Returns:
+        List of alerts; X-Next-Cursor is set when more alerts remain
+    """
+    try:
+        alerts, next_cursor = await alert_store.list(
+            limit, cursor, session, severity=severity, status=status, claim_id=claim_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return alerts
+
+@app.get("/alerts/stats")
+async def alert_stats():
+    """
+    Get alert deduplication statistics
+    
+    Returns:
+        Incidents opened and repeats coalesced
     """
+    return alert_store.stats()
+
+@app.post("/dashboard-update")
+async def dashboard_update(update: dict):
+    """
+    Accept a dashboard update from the agent and push it to live streams
+    
+    Alerts in the update go through the alert store, so an incident the
+    agent reports on every cycle is stored once and counted; only alerts
+    due for fan-out stay in the pushed update.
+    
+    Args:
+        update: Dashboard update payload (stats, verification results, alerts)
+    
+    Returns:
+        Event ID, number of subscribers it was delivered to and alert counts
+    """
+    alerts = []
+    for alert_data in update.get("alerts") or []:
+        try:
+            alerts.append(build_alert(alert_data))
+        except (ValueError, AttributeError):
+            continue
+    recorded = await alert_store.record_many(alerts)
+    created = sum(1 for _, is_new, _ in recorded if is_new)
+    coalesced = len(recorded) - created
+    if "alerts" in update:
+        update["alerts"] = [alert for alert, _, publish in recorded if publish]
+    
+    published = broker.publish("dashboard_update", update)
+    # Write and deliver it now rather than on the next poll, for its ID
+    await feed.sync()
+    event_id = await published
     return {
-        "id": random.randint(1000, 9999),
-        "title": alert_data.get("title", ""),
-        "description": alert_data.get("description", ""),
-        "severity": alert_data.get("severity", "MEDIUM"),
-        "platform": alert_data.get("platform", "Unknown"),
-        "created_at": datetime.now().isoformat(),
-        "status": "ACTIVE"
+        "event_id": event_id,
+        "subscribers": len(broker.subscribers),
+        "alerts": {"created": created, "coalesced": coalesced},
+        "received_at": datetime.now().isoformat()
     }
 
+@app.get("/stream")
+async def stream_updates(
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    since: Optional[int] = Query(None, ge=0),
+):
+    """
+    Server-sent event stream of dashboard updates, new claims and verdicts
+    
+    Args:
+        last_event_id: Last-Event-ID header sent by reconnecting EventSource clients
+        since: Event ID to resume after, for clients that cannot set headers
+    
+    Returns:
+        text/event-stream response
+    """
+    resume_from = last_event_id if last_event_id is not None else since
+    subscriber = broker.subscribe(resume_from)
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                frame = await subscriber.next(timeout=HEARTBEAT_SECONDS)
+                yield frame if frame is not None else b": keep-alive\n\n"
+        finally:
+            broker.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/stream/stats")
+async def stream_stats():
+    """
+    Get live stream statistics
+    
+    Returns:
+        Subscriber count, last event ID and dropped events
+    """
+    return broker.stats()
+
+@app.get("/db/stats")
+async def database_stats():
+    """
+    Get database pool statistics
+    
+    Returns:
+        Read pool saturation and writer queue counters
+    """
+    return db.stats()
+
+@app.post("/archive/compact")
+async def compact_archive():
+    """
+    Archive every claim past the retention horizon now, instead of
+    waiting for the next background run
+    
+    Returns:
+        Claims archived and day partitions touched
+    """
+    return await archiver.compact()
+
+@app.get("/archive/stats")
+async def archive_stats():
+    """
+    Get claim archive statistics
+    
+    Returns:
+        Retention setting, partitions and compaction counters
+    """
+    return await archiver.stats()
+
+@app.get("/changes/stats")
+async def change_feed_stats():
+    """
+    Get change feed statistics for the worker answering
+    
+    Returns:
+        Worker origin, change log position and sync counters
+    """
+    return feed.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus metrics: per-route request counts, latency and response
+    size histograms, in-flight requests and application gauges
+    
+    Returns:
+        Prometheus text exposition format
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+metrics.register_routes(app.routes)
+metrics.register("echosheild_claims", "Stored claims", lambda: store.stats.overall.total)
+metrics.register("echosheild_claims_merged_total", "Reposts merged into a canonical claim", lambda: store.merged, "counter")
+metrics.register("echosheild_stream_subscribers", "Connected live stream subscribers", lambda: len(broker.subscribers))
+metrics.register("echosheild_response_cache_hits_total", "Read responses served from the response cache", lambda: response_cache.hits, "counter")
+metrics.register("echosheild_response_cache_misses_total", "Read responses rebuilt", lambda: response_cache.misses, "counter")
+metrics.register("echosheild_response_not_modified_total", "Conditional GETs answered with 304", lambda: response_cache.not_modified, "counter")
+metrics.register("echosheild_summary_cache_hits_total", "Summaries served from memory or the database", lambda: store.summaries.hits + store.summaries.db_hits, "counter")
+metrics.register("echosheild_summary_cache_misses_total", "Summaries generated", lambda: store.summaries.misses, "counter")
+metrics.register("echosheild_alerts_created_total", "Alert incidents opened", lambda: alert_store.created, "counter")
+metrics.register("echosheild_alerts_coalesced_total", "Alert repeats folded into an open incident", lambda: alert_store.coalesced, "counter")
+metrics.register("echosheild_db_read_pool_size", "Read-only database connections", lambda: db.pool_size)
+metrics.register("echosheild_db_read_pool_in_use", "Read connections checked out", lambda: db.in_use)
+metrics.register("echosheild_db_read_pool_waiting", "Requests waiting for a read connection", lambda: db.waiting)
+metrics.register("echosheild_db_read_pool_waits_total", "Read checkouts that had to wait", lambda: db.waits, "counter")
+metrics.register("echosheild_db_read_pool_wait_seconds_total", "Time spent waiting for read connections", lambda: db.wait_seconds, "counter")
+metrics.register("echosheild_db_read_pool_timeouts_total", "Read checkouts that timed out", lambda: db.timeouts, "counter")
+metrics.register("echosheild_db_writes_pending", "Writes queued or running on the writer thread", lambda: db.writes_pending)
+metrics.register("echosheild_verification_queue_depth", "Verification records waiting to be written", lambda: verification_writer.depth)
+metrics.register("echosheild_verifications_written_total", "Verification records committed", lambda: verification_writer.written, "counter")
+metrics.register("echosheild_claims_archived_total", "Claims moved to the archive since startup", lambda: archiver.archived, "counter")
+metrics.register("echosheild_changes_applied_total", "Changes from other workers applied", lambda: feed.applied, "counter")
+metrics.register("echosheild_change_resyncs_total", "Full reloads after falling behind the change log", lambda: feed.resyncs, "counter")
+metrics.register("echosheild_db_writes_total", "Completed writes", lambda: db.writes, "counter")
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import uvicorn
+    # Workers are started from the import string so each loads its own app
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=WORKERS)
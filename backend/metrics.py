@@ -0,0 +1,197 @@
+"""
+Request metrics middleware and Prometheus text exposition
+The hot path only does integer/float arithmetic on preallocated per-route
+objects; all string formatting happens when /metrics is scraped
+"""
+
+import random
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative rendering"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteMetrics:
+    """Counters for one (route, method) pair"""
+
+    __slots__ = ("route", "method", "statuses", "latency", "size")
+
+    def __init__(self, route: str, method: str):
+        self.route = route
+        self.method = method
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    Per-route request metrics plus application gauges
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        """
+        Args:
+            sample_rate: Fraction of requests whose latency and size are
+                recorded; request counts and in-flight gauges are always exact
+        """
+        self.sample_rate = sample_rate
+        self.in_flight = 0
+        self.routes: Dict[Tuple[object, str], RouteMetrics] = {}
+        self.route_paths: Dict[object, str] = {}
+        self.collectors: List[Tuple[str, str, str, Callable[[], float]]] = []
+
+    def route_for(self, endpoint: Optional[object], method: str) -> RouteMetrics:
+        """Get (creating once) the metrics object for an endpoint and method"""
+        key = (endpoint, method)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            path = self.route_paths.get(endpoint, "unmatched")
+            metrics = self.routes[key] = RouteMetrics(path, method)
+        return metrics
+
+    def register_routes(self, routes):
+        """
+        Map endpoint functions to their route templates
+
+        Args:
+            routes: app.routes
+        """
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is not None:
+                self.route_paths[endpoint] = route.path
+
+    def register(self, name: str, help_text: str, read: Callable[[], float], kind: str = "gauge"):
+        """
+        Register an application metric read at scrape time
+
+        Args:
+            name: Metric name
+            help_text: HELP line text
+            read: Returns the current value
+            kind: Prometheus type, "gauge" or "counter"
+        """
+        self.collectors.append((name, help_text, kind, read))
+
+    def render(self) -> str:
+        """
+        Render all metrics in Prometheus text format
+
+        Returns:
+            Exposition text
+        """
+        routes = sorted(self.routes.values(), key=lambda m: (m.route, m.method))
+        lines = [
+            "# HELP echosheild_http_requests_total HTTP requests by route, method and status",
+            "# TYPE echosheild_http_requests_total counter",
+        ]
+        for m in routes:
+            for status, count in sorted(m.statuses.items()):
+                lines.append(f'echosheild_http_requests_total{{route="{m.route}",method="{m.method}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP echosheild_http_requests_in_flight HTTP requests currently being served",
+            "# TYPE echosheild_http_requests_in_flight gauge",
+            f"echosheild_http_requests_in_flight {self.in_flight}",
+        ]
+
+        lines += [
+            "# HELP echosheild_http_request_duration_seconds Sampled request latency",
+            "# TYPE echosheild_http_request_duration_seconds histogram",
+        ]
+        for m in routes:
+            lines += m.latency.render("echosheild_http_request_duration_seconds", f'route="{m.route}",method="{m.method}"')
+
+        lines += [
+            "# HELP echosheild_http_response_size_bytes Sampled response body size",
+            "# TYPE echosheild_http_response_size_bytes histogram",
+        ]
+        for m in routes:
+            lines += m.size.render("echosheild_http_response_size_bytes", f'route="{m.route}",method="{m.method}"')
+
+        for name, help_text, kind, read in self.collectors:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {read()}"]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route request metrics
+    """
+
+    def __init__(self, app, registry: MetricsRegistry, on_sample: Optional[Callable] = None):
+        """
+        Args:
+            app: Wrapped ASGI app
+            registry: Where metrics are recorded
+            on_sample: Optional callback(method, path, status, seconds) for
+                sampled requests, e.g. request logging
+        """
+        self.app = app
+        self.registry = registry
+        self.on_sample = on_sample
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        sampled = registry.sample_rate >= 1.0 or random.random() < registry.sample_rate
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif sampled and message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            # The router stores the matched endpoint in the shared scope
+            metrics = registry.route_for(scope.get("endpoint"), scope["method"])
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if sampled:
+                elapsed = time.perf_counter() - started
+                metrics.latency.observe(elapsed)
+                metrics.size.observe(size)
+                if self.on_sample is not None:
+                    self.on_sample(scope["method"], scope["path"], status, elapsed)
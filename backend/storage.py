@@ -0,0 +1,1026 @@
+"""
+EchoSheild SQLite storage layer
+Persists claims in the schema created by init_db()
+"""
+
+import base64
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+from aggregates import ClaimStats
+from changes import append_change, latest_change_id
+from dedup import content_hash, token_hash
+from summaries import SummaryCache
+from trending import TrendingIndex
+
+if TYPE_CHECKING:
+    from changes import ChangeFeed
+    from database import Database, ReadSession
+
+CLAIM_COLUMNS = ("id", "claim", "source", "timestamp", "trust_score", "status", "category", "engagement")
+CLAIM_FILTERS = ("status", "category", "source")
+MUTABLE_COLUMNS = ("trust_score", "status", "engagement")
+# Seconds a write waits for another process's transaction to finish
+BUSY_TIMEOUT = 30.0
+VERDICT_COLUMNS = ("trust_score", "status")
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS claims (
+        id INTEGER PRIMARY KEY,
+        claim TEXT NOT NULL,
+        source TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        trust_score INTEGER,
+        status TEXT,
+        category TEXT,
+        engagement INTEGER
+    );
+
+    CREATE TABLE IF NOT EXISTS verifications (
+        id INTEGER PRIMARY KEY,
+        claim_id INTEGER,
+        verification_method TEXT,
+        details TEXT,
+        verified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(claim_id) REFERENCES claims(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS summaries (
+        id INTEGER PRIMARY KEY,
+        claim_id INTEGER,
+        summary TEXT,
+        language TEXT DEFAULT 'en',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(claim_id) REFERENCES claims(id)
+    );
+
+    -- claims.id is the rowid, so primary key lookups need no extra index.
+    -- Every secondary index ends in (timestamp, rowid), which is the keyset
+    -- order used for cursor pagination, so filtered pages are index walks.
+    DROP INDEX IF EXISTS idx_claims_status;
+    DROP INDEX IF EXISTS idx_claims_category;
+    CREATE INDEX IF NOT EXISTS idx_claims_status_ts ON claims(status, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_claims_category_ts ON claims(category, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_claims_source_ts ON claims(source, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_claims_timestamp ON claims(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_claims_engagement ON claims(engagement);
+    CREATE INDEX IF NOT EXISTS idx_claims_category_engagement ON claims(category, engagement);
+    CREATE INDEX IF NOT EXISTS idx_verifications_claim ON verifications(claim_id);
+'''
+
+# JSON encoding of a claim row in ClaimResponse field order
+CLAIM_JSON = "json_object(" + ", ".join(f"'{column}', {column}" for column in CLAIM_COLUMNS) + ")"
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache compiles each of them once and reuses the prepared statement.
+SELECT_CLAIM = "SELECT id, claim, source, timestamp, trust_score, status, category, engagement FROM claims WHERE id = ?"
+SELECT_TOP_ENGAGEMENT = "SELECT id, claim, source, timestamp, trust_score, status, category, engagement FROM claims ORDER BY engagement DESC LIMIT ?"
+SELECT_TOP_ENGAGEMENT_IN_CATEGORY = "SELECT id, claim, source, timestamp, trust_score, status, category, engagement FROM claims WHERE category = ? ORDER BY engagement DESC LIMIT ?"
+SELECT_SINCE = "SELECT id, claim, source, timestamp, trust_score, status, category, engagement FROM claims WHERE timestamp >= ?"
+INSERT_CLAIM = "INSERT INTO claims (id, claim, source, timestamp, trust_score, status, category, engagement, content_hash, token_hash) VALUES (:id, :claim, :source, :timestamp, :trust_score, :status, :category, :engagement, :content_hash, :token_hash)"
+SELECT_BY_CONTENT_HASH = "SELECT id FROM claims WHERE content_hash = ? ORDER BY id LIMIT 1"
+SELECT_BY_TOKEN_HASH = "SELECT id FROM claims WHERE token_hash = ? ORDER BY id LIMIT 1"
+ADD_ENGAGEMENT = "UPDATE claims SET engagement = COALESCE(engagement, 0) + ? WHERE id = ?"
+# The canonical claim's own source is recorded on its first merge
+SEED_CLAIM_SOURCE = "INSERT OR IGNORE INTO claim_sources (claim_id, source, occurrences, engagement, first_seen, last_seen) SELECT id, COALESCE(source, 'Unknown'), 1, COALESCE(engagement, 0), timestamp, timestamp FROM claims WHERE id = ?"
+ADD_CLAIM_SOURCE = "INSERT INTO claim_sources (claim_id, source, occurrences, engagement, first_seen, last_seen) VALUES (?, ?, 1, ?, ?, ?) ON CONFLICT (claim_id, source) DO UPDATE SET occurrences = occurrences + 1, engagement = engagement + excluded.engagement, first_seen = MIN(first_seen, excluded.first_seen), last_seen = MAX(last_seen, excluded.last_seen)"
+SELECT_CLAIM_SOURCES = "SELECT source, occurrences, engagement, first_seen, last_seen FROM claim_sources WHERE claim_id = ? ORDER BY occurrences DESC, source"
+SEARCH_BY_RANK = f"SELECT claims.id, m.rank, {CLAIM_JSON} FROM (SELECT rowid, rank FROM claims_fts WHERE claims_fts MATCH ? ORDER BY rank, rowid LIMIT ?) AS m JOIN claims ON claims.id = m.rowid ORDER BY m.rank, m.rowid"
+SEARCH_BY_RANK_AFTER = f"SELECT claims.id, m.rank, {CLAIM_JSON} FROM (SELECT rowid, rank FROM claims_fts WHERE claims_fts MATCH ? AND (rank, rowid) > (?, ?) ORDER BY rank, rowid LIMIT ?) AS m JOIN claims ON claims.id = m.rowid ORDER BY m.rank, m.rowid"
+SEARCH_BY_ID = f"SELECT claims.id, NULL, {CLAIM_JSON} FROM (SELECT rowid FROM claims_fts WHERE claims_fts MATCH ? ORDER BY rowid DESC LIMIT ?) AS m JOIN claims ON claims.id = m.rowid ORDER BY m.rowid DESC"
+SEARCH_BY_ID_BEFORE = f"SELECT claims.id, NULL, {CLAIM_JSON} FROM (SELECT rowid FROM claims_fts WHERE claims_fts MATCH ? AND rowid < ? ORDER BY rowid DESC LIMIT ?) AS m JOIN claims ON claims.id = m.rowid ORDER BY m.rowid DESC"
+COUNT_CLAIMS = "SELECT COUNT(*) FROM claims"
+# Archived claims keep their IDs, so the sequence continues past them too
+MAX_CLAIM_ID = "SELECT MAX(COALESCE((SELECT MAX(id) FROM claims), 0), COALESCE((SELECT MAX(max_id) FROM archive_partitions), 0))"
+SELECT_EPOCH = "SELECT value FROM settings WHERE name = 'epoch'"
+# All-time totals: live claims plus what archived claims contributed
+AGGREGATE_TOTALS = (
+    "SELECT status, category, source, SUM(n), SUM(trust) FROM ("
+    "SELECT status, category, source, COUNT(*) AS n, COALESCE(SUM(trust_score), 0) AS trust FROM claims GROUP BY status, category, source"
+    " UNION ALL SELECT status, category, source, claims, trust_sum FROM archive_totals"
+    ") GROUP BY status, category, source"
+)
+
+
+def encode_token(values: List) -> str:
+    """
+    Encode keyset values as an opaque URL-safe pagination token
+
+    Args:
+        values: JSON-serializable keyset position
+
+    Returns:
+        Token string
+    """
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(cursor: str, *types) -> Tuple:
+    """
+    Decode a token produced by encode_token() and check its shape
+
+    Args:
+        cursor: Token string
+        *types: Expected type (or tuple of types) of each value
+
+    Returns:
+        Decoded keyset values
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+def encode_cursor(claim: Dict) -> str:
+    """
+    Build an opaque pagination cursor pointing just past a claim
+
+    Args:
+        claim: Last claim of the current page
+
+    Returns:
+        URL-safe cursor token
+    """
+    return encode_token([claim["timestamp"], claim["id"]])
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Args:
+        cursor: Cursor token
+
+    Returns:
+        (timestamp, id) keyset position
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    return decode_token(cursor, str, int)
+
+
+def connect(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """
+    Open a connection tuned for concurrent readers and a single writer
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        Configured sqlite3 connection
+    """
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+# Schema changes applied on top of SCHEMA, tracked with PRAGMA user_version.
+# Append new steps; never edit one that has shipped.
+MIGRATIONS = [
+    # 1: summaries are cached per claim version
+    '''
+    ALTER TABLE summaries ADD COLUMN claim_version TEXT;
+    DELETE FROM summaries;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_summaries_version ON summaries(claim_id, language, claim_version);
+    DROP INDEX IF EXISTS idx_summaries_claim;
+    ''',
+    # 2: full-text search index over claim text, kept in sync by triggers
+    '''
+    CREATE VIRTUAL TABLE claims_fts USING fts5(
+        claim,
+        content='claims',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    );
+    CREATE TRIGGER claims_fts_insert AFTER INSERT ON claims BEGIN
+        INSERT INTO claims_fts(rowid, claim) VALUES (new.id, new.claim);
+    END;
+    CREATE TRIGGER claims_fts_delete AFTER DELETE ON claims BEGIN
+        INSERT INTO claims_fts(claims_fts, rowid, claim) VALUES ('delete', old.id, old.claim);
+    END;
+    CREATE TRIGGER claims_fts_update AFTER UPDATE OF claim ON claims BEGIN
+        INSERT INTO claims_fts(claims_fts, rowid, claim) VALUES ('delete', old.id, old.claim);
+        INSERT INTO claims_fts(rowid, claim) VALUES (new.id, new.claim);
+    END;
+    INSERT INTO claims_fts(claims_fts) VALUES ('rebuild');
+    ''',
+    # 3: verification records keep the verdict and sources they reported
+    '''
+    ALTER TABLE verifications ADD COLUMN status TEXT;
+    ALTER TABLE verifications ADD COLUMN trust_score INTEGER;
+    ALTER TABLE verifications ADD COLUMN verified_sources TEXT;
+    ''',
+    # 4: persistent alerts, one row per incident with a repeat counter
+    '''
+    CREATE TABLE alerts (
+        id INTEGER PRIMARY KEY,
+        claim_id INTEGER,
+        title TEXT,
+        description TEXT,
+        severity TEXT,
+        platform TEXT,
+        status TEXT DEFAULT 'ACTIVE',
+        occurrences INTEGER DEFAULT 1,
+        created_at DATETIME,
+        last_seen_at DATETIME
+    );
+    CREATE INDEX idx_alerts_incident ON alerts(claim_id, severity, last_seen_at);
+    CREATE INDEX idx_alerts_severity ON alerts(severity, id);
+    ''',
+    # 5: claims past the retention horizon live in compressed archive files
+    '''
+    CREATE TABLE archive_partitions (
+        day TEXT PRIMARY KEY,
+        file TEXT NOT NULL,
+        claims INTEGER NOT NULL,
+        max_id INTEGER NOT NULL,
+        compacted_at DATETIME
+    );
+    CREATE TABLE archive_blocks (
+        day TEXT NOT NULL,
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL
+    );
+    CREATE INDEX idx_archive_blocks_first ON archive_blocks(first_id, last_id);
+    CREATE INDEX idx_archive_blocks_day ON archive_blocks(day);
+    CREATE TABLE archive_totals (
+        status TEXT,
+        category TEXT,
+        source TEXT,
+        claims INTEGER NOT NULL,
+        trust_sum INTEGER NOT NULL,
+        PRIMARY KEY (status, category, source)
+    );
+    ''',
+    # 6: change log tailed by every worker process. AUTOINCREMENT keeps IDs
+    # rising after old changes are pruned, so positions never go backwards
+    '''
+    CREATE TABLE changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        origin TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at DATETIME NOT NULL
+    );
+    CREATE INDEX idx_changes_created ON changes(created_at);
+    ''',
+    # 7: reposts merge into a canonical claim found by normalized-text hash
+    # (or content-word hash for near-duplicates), recording their sources
+    '''
+    ALTER TABLE claims ADD COLUMN content_hash TEXT;
+    ALTER TABLE claims ADD COLUMN token_hash TEXT;
+    UPDATE claims SET content_hash = claim_content_hash(claim), token_hash = claim_token_hash(claim);
+    CREATE INDEX idx_claims_content_hash ON claims(content_hash);
+    CREATE INDEX idx_claims_token_hash ON claims(token_hash) WHERE token_hash IS NOT NULL;
+    CREATE TABLE claim_sources (
+        claim_id INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        occurrences INTEGER NOT NULL,
+        engagement INTEGER NOT NULL,
+        first_seen DATETIME,
+        last_seen DATETIME,
+        PRIMARY KEY (claim_id, source)
+    ) WITHOUT ROWID;
+    ''',
+    # 8: repair claims POST /claims stored before it validated its body, so
+    # every row matches ClaimResponse and can be served without re-validation
+    '''
+    UPDATE claims SET engagement = 0
+        WHERE engagement IS NULL OR typeof(engagement) != 'integer' OR engagement < 0;
+    UPDATE claims SET source = COALESCE(CAST(source AS TEXT), 'Unknown') WHERE typeof(source) != 'text';
+    UPDATE claims SET category = COALESCE(CAST(category AS TEXT), 'Other') WHERE typeof(category) != 'text';
+    UPDATE claims SET claim = CAST(claim AS TEXT) WHERE typeof(claim) != 'text';
+    UPDATE claims SET timestamp = claim_timestamp(timestamp) WHERE timestamp IS NOT claim_timestamp(timestamp);
+    ''',
+    # 9: negations count as content words in near-duplicate hashes
+    '''
+    UPDATE claims SET token_hash = claim_token_hash(claim);
+    ''',
+    # 10: an epoch drawn once per database, so every worker builds the same
+    # HTTP validators and a recreated database never reuses old ones
+    '''
+    CREATE TABLE settings (
+        name TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    INSERT INTO settings (name, value) VALUES ('epoch', lower(hex(randomblob(4))));
+    ''',
+]
+
+
+def split_statements(script: str) -> List[str]:
+    """
+    Split an SQL script into complete statements
+
+    Unlike executescript(), the statements can then run inside a
+    transaction the caller controls. Trigger bodies stay whole.
+
+    Args:
+        script: Semicolon-separated SQL
+
+    Returns:
+        Statements in order
+    """
+    statements, buffer = [], ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+def normalize_timestamp(value) -> str:
+    """Stored timestamp in ISO 8601 form; the current time if it cannot be parsed"""
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        return datetime.now().isoformat()
+
+
+def init_db(conn: sqlite3.Connection):
+    """
+    Initialize SQLite database with tables and indexes, then migrate it
+
+    An up-to-date database is detected from PRAGMA user_version alone, so
+    reopening one runs no DDL at all. Otherwise the schema and pending
+    migrations are applied in one IMMEDIATE transaction, and the version
+    is re-read under the lock so concurrent processes migrate only once.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < len(MIGRATIONS):
+            # Used by migrations that backfill hashes and repair rows
+            conn.create_function("claim_content_hash", 1, content_hash, deterministic=True)
+            conn.create_function("claim_token_hash", 1, token_hash, deterministic=True)
+            conn.create_function("claim_timestamp", 1, normalize_timestamp)
+            for statement in split_statements(SCHEMA):
+                conn.execute(statement)
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                for statement in split_statements(migration):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def build_page_query(columns: str, limit: int, cursor: Optional[str], skip: int,
+                     since: Optional[str], until: Optional[str],
+                     filters: Dict[str, Optional[str]], since_id: Optional[int] = None) -> Tuple[str, List]:
+    """
+    Build a keyset-paginated claims query, newest first
+
+    With since_id the query instead returns claims added after that ID,
+    oldest first, so a client can follow new claims by passing the last
+    ID it saw. IDs only grow, unlike timestamps, which ingest may backdate.
+
+    Args:
+        columns: Select list
+        limit: Row limit
+        cursor: Cursor from a previous page; the page starts after it
+        skip: Legacy offset, applied after the cursor
+        since: Only claims with timestamp >= since (ISO format)
+        until: Only claims with timestamp < until (ISO format)
+        filters: Exact-match filters on status, category or source
+        since_id: Only claims with id > since_id, in ID order
+
+    Returns:
+        (SQL, parameters)
+
+    Raises:
+        ValueError: If the cursor or a filter name is invalid, or a
+            cursor is combined with since_id
+    """
+    if since_id is not None and cursor is not None:
+        raise ValueError("cursor cannot be combined with since_id")
+    clauses, params = [], []
+    for name, value in filters.items():
+        if name not in CLAIM_FILTERS:
+            raise ValueError(f"Unknown filter: {name}")
+        if value is not None:
+            clauses.append(f"{name} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    if cursor is not None:
+        timestamp, claim_id = decode_cursor(cursor)
+        clauses.append("(timestamp, id) < (?, ?)")
+        params.extend([timestamp, claim_id])
+    if since_id is not None:
+        clauses.append("id > ?")
+        params.append(since_id)
+
+    # The SQL text only varies with which filters are present, so each
+    # combination is still prepared once and served from the cache.
+    sql = f"SELECT {columns} FROM claims"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id" if since_id is not None else " ORDER BY timestamp DESC, id DESC"
+    sql += " LIMIT ? OFFSET ?"
+    params.extend([limit, skip])
+    return sql, params
+
+
+# Query and write functions take the connection as their first argument so
+# Database can run them on a pooled reader or the writer thread.
+
+def fetch_claim(conn: sqlite3.Connection, claim_id: int) -> Optional[Dict]:
+    """Get a claim by ID, or None if it does not exist"""
+    row = conn.execute(SELECT_CLAIM, (claim_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def fetch_page(conn: sqlite3.Connection, sql: str, params: List) -> List[Dict]:
+    """Run a query built by build_page_query() and return claim dicts"""
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def fetch_rows(conn: sqlite3.Connection, sql: str, params: List) -> List[Tuple]:
+    """Run a query and return its raw rows"""
+    return conn.execute(sql, params).fetchall()
+
+
+def fetch_top_engagement(conn: sqlite3.Connection, limit: int, category: Optional[str]) -> List[Dict]:
+    """Get the most engaged claims by walking an engagement index"""
+    if category is None:
+        rows = conn.execute(SELECT_TOP_ENGAGEMENT, (limit,)).fetchall()
+    else:
+        rows = conn.execute(SELECT_TOP_ENGAGEMENT_IN_CATEGORY, (category, limit)).fetchall()
+    return [dict(row) for row in rows]
+
+
+def load_stats(conn: sqlite3.Connection) -> ClaimStats:
+    """Compute claim statistics from the table with a single grouped scan"""
+    stats = ClaimStats()
+    stats.load(tuple(row) for row in conn.execute(AGGREGATE_TOTALS))
+    return stats
+
+
+def load_trending(conn: sqlite3.Connection) -> TrendingIndex:
+    """Build the trending index from claims inside its time horizon"""
+    trending = TrendingIndex()
+    since = (datetime.now() - trending.horizon).isoformat()
+    trending.load(dict(row) for row in conn.execute(SELECT_SINCE, (since,)))
+    return trending
+
+
+def load_snapshot(conn: sqlite3.Connection, trending: bool = True) -> Tuple[ClaimStats, Optional[TrendingIndex], int]:
+    """
+    Load statistics and the trending index from one consistent snapshot
+
+    Args:
+        conn: Database connection
+        trending: Also build the trending index
+
+    Returns:
+        (stats, trending index or None, ID of the last change they include)
+    """
+    conn.execute("BEGIN")
+    try:
+        return load_stats(conn), load_trending(conn) if trending else None, latest_change_id(conn)
+    finally:
+        conn.commit()
+
+
+def count_claims(conn: sqlite3.Connection) -> int:
+    """Total number of stored claims"""
+    return conn.execute(COUNT_CLAIMS).fetchone()[0]
+
+
+def claim_hashes(record: Dict) -> Dict[str, Optional[str]]:
+    """Deduplication hashes of a claim, as INSERT_CLAIM parameters"""
+    return {"content_hash": content_hash(record["claim"]), "token_hash": token_hash(record["claim"])}
+
+
+def write_claim(conn: sqlite3.Connection, record: Dict) -> int:
+    """Insert one claim under a given ID and return the ID"""
+    with conn:
+        claim_id = conn.execute(INSERT_CLAIM, {**record, **claim_hashes(record)}).lastrowid
+        append_change(conn, "claims_inserted", {"claims": [{**record, "id": claim_id}]})
+    return claim_id
+
+
+def find_canonical(conn: sqlite3.Connection, hashes: Dict[str, Optional[str]], near_duplicates: bool) -> Optional[int]:
+    """ID of the stored claim a claim with these hashes duplicates, or None"""
+    row = conn.execute(SELECT_BY_CONTENT_HASH, (hashes["content_hash"],)).fetchone()
+    if row is None and near_duplicates and hashes["token_hash"] is not None:
+        row = conn.execute(SELECT_BY_TOKEN_HASH, (hashes["token_hash"],)).fetchone()
+    return row[0] if row else None
+
+
+def merge_duplicate(conn: sqlite3.Connection, canonical_id: int, record: Dict) -> Dict:
+    """
+    Fold a repost into its canonical claim: add its engagement and
+    record its source
+
+    Args:
+        conn: Writer connection, inside a transaction
+        canonical_id: ID of the canonical claim
+        record: The repost
+
+    Returns:
+        Canonical claim after the merge
+    """
+    engagement = record["engagement"] or 0
+    conn.execute(SEED_CLAIM_SOURCE, (canonical_id,))
+    conn.execute(ADD_CLAIM_SOURCE, (canonical_id, record["source"] or "Unknown", engagement,
+                                    record["timestamp"], record["timestamp"]))
+    conn.execute(ADD_ENGAGEMENT, (engagement, canonical_id))
+    return fetch_claim(conn, canonical_id)
+
+
+def write_claims(conn: sqlite3.Connection, claims: List[Dict], dedup: bool = True,
+                 near_duplicates: bool = False) -> List[Tuple[Dict, bool]]:
+    """
+    Insert a batch of claims in one transaction, merging reposts
+
+    IDs are taken from the claims sequence (MAX(id) + 1 onwards) while
+    the write lock is held, so concurrent writers never collide. A claim
+    whose normalized text matches a stored one, including one earlier in
+    the batch, is merged into it instead of inserted.
+
+    Args:
+        conn: Writer connection
+        claims: Claim dicts without IDs
+        dedup: Merge reposts into their canonical claim
+        near_duplicates: Also merge claims with the same content words
+
+    Returns:
+        (stored claim, True if merged into an existing claim) per input;
+        a merged entry is the canonical claim after the merge
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        next_id = conn.execute(MAX_CLAIM_ID).fetchone()[0] + 1
+        results = []
+        inserted: List[Dict] = []
+        merged: Dict[int, Dict] = {}
+        for claim in claims:
+            record = {column: claim.get(column) for column in CLAIM_COLUMNS}
+            hashes = claim_hashes(record)
+            canonical_id = find_canonical(conn, hashes, near_duplicates) if dedup else None
+            if canonical_id is None:
+                record["id"] = next_id
+                next_id += 1
+                conn.execute(INSERT_CLAIM, {**record, **hashes})
+                inserted.append(record)
+                results.append((record, False))
+            else:
+                canonical = merge_duplicate(conn, canonical_id, record)
+                merged[canonical_id] = canonical
+                results.append((canonical, True))
+        if inserted:
+            append_change(conn, "claims_inserted", {"claims": inserted})
+        if merged:
+            reposts = sum(1 for _, was_merged in results if was_merged)
+            append_change(conn, "claims_merged", {"claims": list(merged.values()), "reposts": reposts})
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return results
+
+
+def fetch_claim_sources(conn: sqlite3.Connection, claim_id: int) -> List[Dict]:
+    """Sources a claim was posted from, most frequent first; empty if never reposted"""
+    return [dict(row) for row in conn.execute(SELECT_CLAIM_SOURCES, (claim_id,)).fetchall()]
+
+
+def write_update(conn: sqlite3.Connection, claim_id: int, changes: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Update columns of a claim, reading its old values in the same transaction
+
+    Args:
+        conn: Writer connection
+        claim_id: ID of the claim
+        changes: New column values
+
+    Returns:
+        (old claim, new claim); both None if the claim does not exist
+    """
+    with conn:
+        old = fetch_claim(conn, claim_id)
+        if old is None:
+            return None, None
+        new = {**old, **changes}
+        assignments = ", ".join(f"{name} = :{name}" for name in sorted(changes))
+        conn.execute(f"UPDATE claims SET {assignments} WHERE id = :id", new)
+        append_change(conn, "claim_updated", {"old": old, "new": new})
+    return old, new
+
+
+class ClaimStore:
+    """
+    Claim repository backed by the SQLite claims table
+    All lookups go through indexed, prepared statements run off the event
+    loop by Database, and every write keeps the in-memory ClaimStats
+    counters, TrendingIndex and SummaryCache in step with the table and
+    moves data_version. The in-memory structures are only ever touched on
+    the event loop, after the database call has returned. With a change
+    feed, writes made by other worker processes are applied as well.
+    """
+
+    def __init__(self, db: "Database", feed: Optional["ChangeFeed"] = None, near_duplicates: bool = False):
+        """
+        Args:
+            db: Database holding the claims table; the in-memory indexes
+                are loaded when it is opened, which may be deferred to
+                the first query
+            feed: Change feed delivering other workers' writes
+            near_duplicates: Merge new claims into stored ones with the
+                same content words, not only the same normalized text
+        """
+        self.db = db
+        self.feed = feed
+        self.near_duplicates = near_duplicates
+        self.merged = 0
+        self.epoch = ""
+        self._version = 0
+        self.seed_claims: Optional[List[Dict]] = None
+        self._stats: Optional[ClaimStats] = None
+        self._trending: Optional[TrendingIndex] = None
+        self.summaries = SummaryCache(db)
+        if feed is not None:
+            feed.subscribe("claims_inserted", self._apply_inserted)
+            feed.subscribe("claims_merged", self._apply_merged)
+            feed.subscribe("claim_updated", self._apply_updated)
+            feed.resync = self.resync
+        db.on_open(self._load)
+
+    def _load(self, conn: sqlite3.Connection):
+        # Seed only a database that never held claims, archived ones
+        # included; the check repeats under the write lock so concurrently
+        # starting workers seed once
+        if self.seed_claims is not None and conn.execute(MAX_CLAIM_ID).fetchone()[0] == 0:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute(MAX_CLAIM_ID).fetchone()[0] == 0:
+                    records = [{column: claim.get(column) for column in CLAIM_COLUMNS} for claim in self.seed_claims]
+                    conn.executemany(INSERT_CLAIM, [{**record, **claim_hashes(record)} for record in records])
+                    append_change(conn, "claims_inserted", {"claims": records})
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        self.epoch = conn.execute(SELECT_EPOCH).fetchone()[0]
+        self._install(*load_snapshot(conn))
+
+    def _install(self, stats: ClaimStats, trending: TrendingIndex, change_id: int):
+        self._stats = stats
+        self._trending = trending
+        if self.feed is not None:
+            self.feed.position = change_id
+        self._version += 1
+
+    async def resync(self):
+        """Reload the in-memory indexes after missing changes from other workers"""
+        self._install(*await self.db.write(load_snapshot))
+
+    def _apply_inserted(self, payload: Dict):
+        for record in payload["claims"]:
+            self.stats.add(record)
+            self.trending.add(record)
+
+    def _apply_merged(self, payload: Dict):
+        # Changes logged before reposts were counted carry one per claim
+        self.merged += payload.get("reposts", len(payload["claims"]))
+        for claim in payload["claims"]:
+            self.trending.add(claim)
+
+    def _apply_updated(self, payload: Dict):
+        self.stats.replace(payload["old"], payload["new"])
+        self.trending.add(payload["new"])
+
+    @property
+    def data_version(self) -> int:
+        """
+        Version of the claims data; opens the database on first use
+
+        With a change feed this is the change log position, so every
+        worker that has applied the same changes reports the same version.
+        """
+        if self._stats is None:
+            self.db.open()
+        return self.feed.position if self.feed is not None else self._version
+
+    async def changed(self):
+        """Move data_version past a write this worker just made"""
+        if self.feed is not None:
+            await self.feed.sync()
+        else:
+            self._version += 1
+
+    @property
+    def stats(self) -> ClaimStats:
+        """Running claim statistics; opens the database on first use"""
+        if self._stats is None:
+            self.db.open()
+        return self._stats
+
+    @property
+    def trending(self) -> TrendingIndex:
+        """Trending index; opens the database on first use"""
+        if self._trending is None:
+            self.db.open()
+        return self._trending
+
+    async def get(self, claim_id: int, session: Optional["ReadSession"] = None) -> Optional[Dict]:
+        """
+        Get a claim by ID
+
+        Args:
+            claim_id: ID of the claim
+            session: Request session to reuse; a pooled connection otherwise
+
+        Returns:
+            Claim dict, or None if it does not exist
+        """
+        return await self._read(session, fetch_claim, claim_id)
+
+    async def list(self, limit: int = 10, cursor: Optional[str] = None, skip: int = 0,
+                   since: Optional[str] = None, until: Optional[str] = None, since_id: Optional[int] = None,
+                   session: Optional["ReadSession"] = None, **filters: Optional[str]) -> List[Dict]:
+        """
+        List claims newest first using keyset pagination over (timestamp, id)
+
+        Args:
+            limit: Maximum number of claims to return
+            cursor: Cursor from a previous page; the page starts after it
+            skip: Legacy offset, applied after the cursor
+            since: Only claims with timestamp >= since (ISO format)
+            until: Only claims with timestamp < until (ISO format)
+            since_id: Only claims added after this ID, oldest first
+            session: Request session to reuse; a pooled connection otherwise
+            **filters: Exact-match filters on status, category or source
+
+        Returns:
+            List of claim dicts
+
+        Raises:
+            ValueError: If the cursor or a filter name is invalid
+        """
+        sql, params = build_page_query(", ".join(CLAIM_COLUMNS), limit, cursor, skip, since, until, filters, since_id)
+        return await self._read(session, fetch_page, sql, params)
+
+    async def list_json(self, limit: int = 10, cursor: Optional[str] = None, skip: int = 0,
+                        since: Optional[str] = None, until: Optional[str] = None, since_id: Optional[int] = None,
+                        session: Optional["ReadSession"] = None,
+                        **filters: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Like list(), but SQLite encodes each row as a ClaimResponse JSON object
+
+        Claims are validated before they are stored (ingest.validate_claim)
+        and migration 8 repaired rows stored before POST /claims was, so
+        rows are trusted to match the schema and not re-validated in Python.
+
+        Args:
+            Same as list()
+
+        Returns:
+            (JSON array bytes, cursor for the next page or None); with
+            since_id there is no cursor, the next page follows the last ID
+
+        Raises:
+            ValueError: If the cursor or a filter name is invalid
+        """
+        sql, params = build_page_query(f"id, timestamp, {CLAIM_JSON}", limit + 1, cursor, skip, since, until,
+                                       filters, since_id)
+        rows = await self._read(session, fetch_rows, sql, params)
+        next_cursor = None
+        if len(rows) > limit and since_id is not None:
+            rows = rows[:limit]
+        elif len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({"id": rows[-1][0], "timestamp": rows[-1][1]})
+        return ("[" + ",".join(row[2] for row in rows) + "]").encode(), next_cursor
+
+    async def search_json(self, query: str, limit: int = 10, cursor: Optional[str] = None,
+                          sort: str = "relevance", session: Optional["ReadSession"] = None) -> Tuple[bytes, Optional[str]]:
+        """
+        Full-text search over claim text, encoded like list_json()
+
+        The query uses FTS5 syntax: words, "exact phrases", prefix* terms
+        and AND/OR/NOT.
+
+        Args:
+            query: FTS5 match expression
+            limit: Maximum number of claims to return
+            cursor: Cursor from a previous page of the same search
+            sort: "relevance" (bm25 rank) or "recent" (newest first)
+            session: Request session to reuse; a pooled connection otherwise
+
+        Returns:
+            (JSON array bytes, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the query, sort or cursor is invalid
+        """
+        if sort == "relevance":
+            sql, params = SEARCH_BY_RANK, [query]
+            if cursor is not None:
+                tag, rank, claim_id = decode_token(cursor, str, (int, float), int)
+                if tag != "rank":
+                    raise ValueError("Invalid cursor")
+                sql, params = SEARCH_BY_RANK_AFTER, [query, rank, claim_id]
+        elif sort == "recent":
+            sql, params = SEARCH_BY_ID, [query]
+            if cursor is not None:
+                tag, claim_id = decode_token(cursor, str, int)
+                if tag != "recent":
+                    raise ValueError("Invalid cursor")
+                sql, params = SEARCH_BY_ID_BEFORE, [query, claim_id]
+        else:
+            raise ValueError(f"Unknown sort: {sort}")
+
+        try:
+            rows = await self._read(session, fetch_rows, sql, params + [limit + 1])
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {e}")
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            claim_id, rank = rows[-1][0], rows[-1][1]
+            next_cursor = encode_token(["rank", rank, claim_id] if sort == "relevance" else ["recent", claim_id])
+        return ("[" + ",".join(row[2] for row in rows) + "]").encode(), next_cursor
+
+    async def top_by_engagement(self, limit: int = 5, category: Optional[str] = None,
+                                session: Optional["ReadSession"] = None) -> List[Dict]:
+        """
+        Get the most engaged claims of all time by walking an engagement index
+
+        Args:
+            limit: Number of claims to return
+            category: Only claims in this category
+            session: Request session to reuse; a pooled connection otherwise
+
+        Returns:
+            Claims sorted by engagement, highest first
+        """
+        return await self._read(session, fetch_top_engagement, limit, category)
+
+    async def count(self) -> int:
+        """Total number of stored claims"""
+        return await self.db.read(count_claims)
+
+    async def check_stats(self) -> bool:
+        """
+        Verify the running counters against storage and repair any drift
+
+        The scan runs on the writer thread, so no write of this worker can
+        land between it and the comparison; other workers' writes up to the
+        scan are applied from the change feed first.
+
+        Returns:
+            True if the counters already matched the table
+        """
+        rebuilt, _, change_id = await self.db.write(load_snapshot, False)
+        if self.feed is not None:
+            await self.feed.sync(until_id=change_id)
+        consistent = rebuilt == self.stats
+        if not consistent:
+            self._stats = rebuilt
+            if self.feed is not None:
+                # The repair gets a change of its own, moving data_version
+                self.feed.relay("stats_repaired", {})
+            await self.changed()
+        return consistent
+
+    async def insert(self, claim: Dict) -> Tuple[Dict, bool]:
+        """
+        Insert a claim, or merge it into the claim it reposts
+
+        A claim given with an ID is always inserted under that ID.
+
+        Args:
+            claim: Claim data keyed by CLAIM_COLUMNS
+
+        Returns:
+            (stored claim, True if merged into an existing claim)
+        """
+        if claim.get("id") is None:
+            return (await self.insert_many([claim]))[0]
+        record = {column: claim.get(column) for column in CLAIM_COLUMNS}
+        await self.db.write(write_claim, record)
+        self.stats.add(record)
+        self.trending.add(record)
+        await self.changed()
+        return record, False
+
+    async def insert_many(self, claims: List[Dict]) -> List[Tuple[Dict, bool]]:
+        """
+        Insert a batch of claims in one transaction, merging reposts into
+        their canonical claims
+
+        Args:
+            claims: Claim dicts without IDs
+
+        Returns:
+            (stored claim, True if merged) per claim; a merged entry is the
+            canonical claim with the repost's engagement added
+        """
+        if not claims:
+            return []
+        results = await self.db.write(write_claims, claims, True, self.near_duplicates)
+        for record, merged in results:
+            if merged:
+                self.merged += 1
+            else:
+                self.stats.add(record)
+            self.trending.add(record)
+        await self.changed()
+        return results
+
+    async def sources(self, claim_id: int, session: Optional["ReadSession"] = None) -> List[Dict]:
+        """
+        Sources a claim was posted from, with per-source occurrences and
+        engagement
+
+        Args:
+            claim_id: ID of the claim
+            session: Request session to reuse; a pooled connection otherwise
+
+        Returns:
+            Source dicts, most frequent first; empty if never reposted
+        """
+        return await self._read(session, fetch_claim_sources, claim_id)
+
+    async def update(self, claim_id: int, **changes) -> Optional[Dict]:
+        """
+        Update the verdict or engagement of a stored claim
+
+        Args:
+            claim_id: ID of the claim
+            **changes: New values for trust_score, status or engagement
+
+        Returns:
+            Updated claim, or None if it does not exist
+
+        Raises:
+            ValueError: If a column cannot be updated
+        """
+        for name in changes:
+            if name not in MUTABLE_COLUMNS:
+                raise ValueError(f"Column cannot be updated: {name}")
+        if not changes:
+            return await self.get(claim_id)
+        old, new = await self.db.write(write_update, claim_id, changes)
+        if old is None:
+            return None
+        self.stats.replace(old, new)
+        self.trending.add(new)
+        if any(old[name] != new[name] for name in VERDICT_COLUMNS):
+            await self.summaries.invalidate(new)
+        await self.changed()
+        return new
+
+    def seed(self, claims: Iterable[Dict]):
+        """
+        Load initial claims into an empty database
+
+        The claims are inserted when the database is opened, or right away
+        if it already is.
+
+        Args:
+            claims: Claims to insert when the table has no rows
+        """
+        self.seed_claims = list(claims)
+        if self.db.opened:
+            self._load(self.db.writer)
+
+    async def _read(self, session: Optional["ReadSession"], fn, *args):
+        if session is not None:
+            return await session.run(fn, *args)
+        return await self.db.read(fn, *args)
@@ -0,0 +1,161 @@
+"""
+Claim summary generation and caching
+Summaries are cached per (claim, language, claim version) in an in-memory
+LRU backed by the summaries table, so each one is generated only once
+"""
+
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+SUMMARY_LANGUAGES = ("en", "es", "fr", "hi")
+LRU_CAPACITY = 4096
+
+SELECT_SUMMARY = "SELECT summary, created_at FROM summaries WHERE claim_id = ? AND language = ? AND claim_version = ?"
+INSERT_SUMMARY = "INSERT OR REPLACE INTO summaries (claim_id, summary, language, created_at, claim_version) VALUES (?, ?, ?, ?, ?)"
+DELETE_STALE_SUMMARIES = "DELETE FROM summaries WHERE claim_id = ? AND claim_version != ?"
+
+
+def claim_version(claim: Dict) -> str:
+    """
+    Fingerprint of the claim fields a summary depends on
+
+    Args:
+        claim: Claim dict
+
+    Returns:
+        Version string that changes whenever status or trust_score does
+    """
+    return f"{claim['status']}:{claim['trust_score']}"
+
+
+def fetch_summary(conn: sqlite3.Connection, claim_id: int, language: str, version: str) -> Optional[Tuple[str, str]]:
+    """Get a stored summary as (summary, created_at), or None"""
+    row = conn.execute(SELECT_SUMMARY, (claim_id, language, version)).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def write_summary(conn: sqlite3.Connection, claim_id: int, summary: str, language: str, created_at: str, version: str):
+    """Store a generated summary; summaries of archived claims are only kept in memory"""
+    try:
+        with conn:
+            conn.execute(INSERT_SUMMARY, (claim_id, summary, language, created_at, version))
+    except sqlite3.IntegrityError:
+        # The claim is no longer in the claims table
+        pass
+
+
+def delete_stale_summaries(conn: sqlite3.Connection, claim_id: int, version: str):
+    """Delete stored summaries of a claim made for other versions"""
+    with conn:
+        conn.execute(DELETE_STALE_SUMMARIES, (claim_id, version))
+
+
+def generate_summary(claim: Dict, language: str) -> str:
+    """
+    Generate a summary in one language (mock LLM)
+
+    Args:
+        claim: Claim dict
+        language: One of SUMMARY_LANGUAGES
+
+    Returns:
+        Summary text
+    """
+    if language == "es":
+        return f"Análisis de Reclamación: La declaración '{claim['claim']}' ha sido analizada usando múltiples fuentes de verificación. Estado: {claim['status']}."
+    if language == "fr":
+        return f"Analyse de Réclamation: L'énoncé '{claim['claim']}' a été analysé à l'aide de plusieurs sources de vérification. Statut: {claim['status']}."
+    if language == "hi":
+        return f"दावा विश्लेषण: कथन '{claim['claim']}' का विश्लेषण कई सत्यापन स्रोतों का उपयोग करके किया गया है। स्थिति: {claim['status']}।"
+    return f"Claim Analysis: The statement '{claim['claim']}' has been analyzed using multiple verification sources. Status: {claim['status']}. Trust Score: {claim['trust_score']}/100."
+
+
+class SummaryCache:
+    """
+    Two-level summary cache: in-memory LRU in front of the summaries table
+    """
+
+    def __init__(self, db, capacity: int = LRU_CAPACITY):
+        """
+        Args:
+            db: Database holding the summaries table
+            capacity: Maximum summaries kept in memory
+        """
+        self.db = db
+        self.capacity = capacity
+        self.lru: "OrderedDict[Tuple[int, str], Tuple[str, str, str]]" = OrderedDict()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, claim: Dict, language: str, session=None) -> Tuple[str, str]:
+        """
+        Get a claim summary, generating and storing it on a miss
+
+        Args:
+            claim: Claim dict
+            language: Requested language; unsupported ones fall back to English
+            session: Request ReadSession to reuse; a pooled connection otherwise
+
+        Returns:
+            (summary, created_at)
+        """
+        if language not in SUMMARY_LANGUAGES:
+            language = "en"
+        key = (claim["id"], language)
+        version = claim_version(claim)
+
+        cached = self.lru.get(key)
+        if cached is not None and cached[0] == version:
+            self.lru.move_to_end(key)
+            self.hits += 1
+            return cached[1], cached[2]
+
+        args = (fetch_summary, claim["id"], language, version)
+        stored = await (session.run(*args) if session is not None else self.db.read(*args))
+        if stored is not None:
+            self.db_hits += 1
+            summary, created_at = stored
+        else:
+            self.misses += 1
+            summary, created_at = generate_summary(claim, language), datetime.now().isoformat()
+            await self.db.write(write_summary, claim["id"], summary, language, created_at, version)
+
+        self.lru[key] = (version, summary, created_at)
+        self.lru.move_to_end(key)
+        if len(self.lru) > self.capacity:
+            self.lru.popitem(last=False)
+        return summary, created_at
+
+    async def invalidate(self, claim: Dict):
+        """
+        Drop cached summaries that no longer match a claim's verdict
+
+        Args:
+            claim: Claim after its status or trust_score changed
+        """
+        self.invalidations += 1
+        for language in SUMMARY_LANGUAGES:
+            self.lru.pop((claim["id"], language), None)
+        await self.db.write(delete_stale_summaries, claim["id"], claim_version(claim))
+
+    def stats(self) -> Dict:
+        """
+        Cache statistics
+
+        Returns:
+            Hit/miss counters and current LRU size
+        """
+        lookups = self.hits + self.db_hits + self.misses
+        return {
+            "memory_hits": self.hits,
+            "database_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "cached_in_memory": len(self.lru),
+            "capacity": self.capacity
+        }
@@ -0,0 +1,147 @@
+"""
+Top-K engagement index for time-windowed trending
+Recent claims are grouped into fixed time buckets, each keeping only its
+highest-engagement claims, so /trends reads a bounded number of candidates
+no matter how many claims are stored
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+WINDOWS = {
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+}
+
+BUCKET_SECONDS = 300
+BUCKET_CAPACITY = 50
+
+
+class TopK:
+    """
+    Bounded set of the highest-engagement claims
+    Uses a min-heap with lazy deletion so offers are O(log capacity).
+    Engagement is expected to only grow; a claim evicted earlier is not
+    recalled if a kept claim's engagement later drops below it.
+    """
+
+    def __init__(self, capacity: int = BUCKET_CAPACITY):
+        self.capacity = capacity
+        self.items: Dict[int, Dict] = {}
+        self.heap: List = []
+
+    def _prune(self):
+        # Drop heap entries whose claim was evicted or re-offered since
+        while self.heap:
+            engagement, claim_id = self.heap[0]
+            claim = self.items.get(claim_id)
+            if claim is not None and claim["engagement"] == engagement:
+                return
+            heapq.heappop(self.heap)
+
+    def offer(self, claim: Dict):
+        """
+        Add or refresh a claim, evicting the weakest one when full
+
+        Args:
+            claim: Claim dict with id and engagement
+        """
+        claim_id, engagement = claim["id"], claim["engagement"] or 0
+        if claim_id not in self.items and len(self.items) >= self.capacity:
+            self._prune()
+            if engagement <= self.heap[0][0]:
+                return
+            _, evicted = heapq.heappop(self.heap)
+            del self.items[evicted]
+        self.items[claim_id] = {**claim, "engagement": engagement}
+        heapq.heappush(self.heap, (engagement, claim_id))
+        if len(self.heap) > 2 * self.capacity:
+            self.heap = [(c["engagement"], i) for i, c in self.items.items()]
+            heapq.heapify(self.heap)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+
+class TrendingIndex:
+    """
+    Time-bucketed top-K index over claims from the last 24 hours
+    Each bucket keeps an overall TopK and one TopK per category
+    """
+
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, capacity: int = BUCKET_CAPACITY):
+        """
+        Args:
+            bucket_seconds: Width of each time bucket
+            capacity: Claims kept per bucket (and per category in a bucket)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.horizon = max(WINDOWS.values())
+        self.buckets: Dict[int, Dict[Optional[str], TopK]] = {}
+        self._expired_before = 0
+
+    def _bucket_key(self, moment: datetime) -> int:
+        return int(moment.timestamp()) // self.bucket_seconds
+
+    def _expire(self, now: datetime):
+        oldest = self._bucket_key(now - self.horizon)
+        if oldest <= self._expired_before:
+            return
+        for key in [k for k in self.buckets if k < oldest]:
+            del self.buckets[key]
+        self._expired_before = oldest
+
+    def add(self, claim: Dict):
+        """
+        Index a new claim or refresh one whose engagement or verdict changed
+
+        Args:
+            claim: Claim dict with id, timestamp, category and engagement
+        """
+        now = datetime.now()
+        self._expire(now)
+        key = self._bucket_key(datetime.fromisoformat(claim["timestamp"]))
+        if key < self._bucket_key(now - self.horizon):
+            return
+        bucket = self.buckets.setdefault(key, {})
+        for group in (None, claim.get("category")):
+            if group not in bucket:
+                bucket[group] = TopK(self.capacity)
+            bucket[group].offer(claim)
+
+    def load(self, claims: Iterable[Dict]):
+        """Index a batch of claims, e.g. the last 24 hours at startup"""
+        for claim in claims:
+            self.add(claim)
+
+    def top(self, window: str, limit: int = 5, category: Optional[str] = None) -> List[Dict]:
+        """
+        Highest-engagement claims posted within a window
+
+        Args:
+            window: One of WINDOWS
+            limit: Number of claims to return (at most the bucket capacity)
+            category: Only claims in this category
+
+        Returns:
+            Claims sorted by engagement, highest first
+        """
+        now = datetime.now()
+        self._expire(now)
+        cutoff = now - WINDOWS[window]
+        cutoff_iso = cutoff.isoformat()
+        first = self._bucket_key(cutoff)
+        candidates = []
+        for key, bucket in self.buckets.items():
+            if key < first or category not in bucket:
+                continue
+            top = bucket[category]
+            if key == first:
+                # Only the oldest bucket straddles the window edge
+                candidates.extend(c for c in top if c["timestamp"] >= cutoff_iso)
+            else:
+                candidates.extend(top)
+        return heapq.nlargest(limit, candidates, key=lambda c: (c["engagement"], c["id"]))
@@ -0,0 +1,179 @@
+"""
+Write-behind persistence of verification results
+Records are queued in memory and written to the verifications table in
+grouped transactions, flushed when a batch fills up or a timer expires
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+BATCH_SIZE = 200
+FLUSH_SECONDS = 0.5
+QUEUE_LIMIT = 10000
+
+INSERT_VERIFICATION = "INSERT INTO verifications (claim_id, verification_method, details, verified_at, status, trust_score, verified_sources) VALUES (:claim_id, :verification_method, :details, :verified_at, :status, :trust_score, :verified_sources)"
+
+logger = logging.getLogger("echosheild.verifications")
+
+
+def write_verifications(conn: sqlite3.Connection, records: List[Dict]):
+    """
+    Insert a batch of verification records in one transaction
+
+    Claims are checked when a record is submitted, but may be archived
+    before it is written; their history is kept, so the claims foreign key
+    is not enforced here.
+    """
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        with conn:
+            conn.executemany(INSERT_VERIFICATION, records)
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+
+
+class VerificationWriter:
+    """
+    In-process write-behind queue for verification records
+    """
+
+    def __init__(self, db, batch_size: int = BATCH_SIZE, flush_seconds: float = FLUSH_SECONDS,
+                 queue_limit: int = QUEUE_LIMIT, write_through: bool = False):
+        """
+        Args:
+            db: Database whose writer thread stores the batches
+            batch_size: Records per transaction; a full batch flushes at once
+            flush_seconds: Longest a queued record waits before being written
+            queue_limit: Queued records beyond which submit() waits for a flush
+            write_through: Write each record before submit() returns, for
+                hosts that freeze the process between requests
+        """
+        self.db = db
+        self.write_through = write_through
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue_limit = queue_limit
+        self.queue: Deque[Dict] = deque()
+        self.wakeup = asyncio.Event()
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.task: Optional[asyncio.Task] = None
+        self.closing = False
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+
+    @property
+    def depth(self) -> int:
+        """Records queued and not yet committed"""
+        return len(self.queue)
+
+    def start(self):
+        """Start the background flush loop on the running event loop"""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, claim_id: int, verification_method: str, details: str, verified_at: str,
+                     status: Optional[str] = None, trust_score: Optional[int] = None,
+                     verified_sources: Optional[List[str]] = None):
+        """
+        Queue a verification record for writing
+
+        Waits for a flush first when queue_limit records are already
+        pending, so a burst cannot grow the queue without bound.
+
+        Args:
+            claim_id: ID of the verified claim
+            verification_method: How the claim was verified
+            details: Verification details
+            verified_at: Verification time (ISO format)
+            status: Verdict reported by the verifier
+            trust_score: Trust score reported by the verifier
+            verified_sources: Sources consulted
+
+        Raises:
+            RuntimeError: If the writer is shutting down
+        """
+        while len(self.queue) >= self.queue_limit and not self.closing:
+            self.wakeup.set()
+            self.drained.clear()
+            await self.drained.wait()
+        if self.closing:
+            raise RuntimeError("Verification writer is shutting down")
+        self.queue.append({
+            "claim_id": claim_id,
+            "verification_method": verification_method,
+            "details": details,
+            "verified_at": verified_at,
+            "status": status,
+            "trust_score": trust_score,
+            "verified_sources": json.dumps(verified_sources or []),
+        })
+        if self.write_through:
+            await self.flush()
+        elif len(self.queue) >= self.batch_size:
+            self.wakeup.set()
+
+    async def flush(self):
+        """Write every queued record, one batch_size transaction at a time"""
+        while self.queue:
+            batch = [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+            try:
+                await self.db.write(write_verifications, batch)
+            except Exception:
+                # Keep the records for the next flush rather than drop them
+                self.failures += 1
+                self.queue.extendleft(reversed(batch))
+                raise
+            self.written += len(batch)
+            self.batches += 1
+            if len(self.queue) < self.queue_limit:
+                self.drained.set()
+
+    async def _run(self):
+        while not self.closing:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Verification flush failed; %d records kept for retry", len(self.queue))
+                await asyncio.sleep(self.flush_seconds)
+
+    async def close(self):
+        """
+        Stop the flush loop and write everything still queued
+
+        Called on application shutdown, which uvicorn runs on SIGTERM and
+        SIGINT, so accepted verifications are not lost.
+        """
+        self.closing = True
+        self.wakeup.set()
+        self.drained.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
+        await self.flush()
+
+    def stats(self) -> Dict:
+        """
+        Queue statistics
+
+        Returns:
+            Queue depth and write counters
+        """
+        return {
+            "queue_depth": self.depth,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "batch_size": self.batch_size,
+            "flush_seconds": self.flush_seconds
+        }